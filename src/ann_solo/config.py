@@ -196,6 +196,12 @@ class Config:
             '--batch_size', default=16384, type=int,
             help='number of query spectra to process simultaneously '
                  '(default: %(default)s)')
+        # Number of threads for query processing and ANN indexing.
+        self._parser.add_argument(
+            '--num_threads', default=None, type=int,
+            help='number of threads to use for query spectrum processing and '
+                 'matching, and ANN index building and querying (default: '
+                 'all available cores)')
 
         # Custom FAISS parameters.
         # Number of lists in the IVF.
@@ -209,6 +215,18 @@ class Config:
             help='number of partitions in the ANN index to inspect during '
                  'querying (default: %(default)s), maximum 1024 when using '
                  'GPU indexing')
+        # Use an HNSW graph to find the partitions to inspect.
+        self._parser.add_argument(
+            '--hnsw_quantizer', action='store_true',
+            help='use an HNSW graph instead of an exhaustive search to find '
+                 'the ANN index partitions to inspect (default: exhaustive '
+                 'search)')
+        # Size of the HNSW dynamic candidate list during querying.
+        self._parser.add_argument(
+            '--hnsw_ef_search', default=256, type=int,
+            help='number of HNSW graph nodes to explore when finding the ANN '
+                 'index partitions to inspect (default: %(default)s), at '
+                 'least num_probe')
         # Don't try to use the GPU.
         self._parser.add_argument(
             '--no_gpu', action='store_true',
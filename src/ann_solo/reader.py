@@ -1,4 +1,3 @@
-import collections
 import io
 import mmap
 import logging
@@ -6,7 +5,7 @@ import os
 import pickle
 import re
 from functools import lru_cache
-from typing import Dict, IO, Iterator, List, Tuple, Union
+from typing import Dict, IO, Iterable, Iterator, List, Tuple, Union
 
 import h5py
 import joblib
@@ -160,8 +159,9 @@ class SpectralLibraryReader:
         self.is_recreated = True
 
         # Read all the spectra in the spectral library.
-        temp_info = collections.defaultdict(
-            lambda: {'id': [], 'precursor_mz': []})
+        # The spectrum information is collected in flat lists and only
+        # grouped by precursor charge afterwards.
+        charges, ids, precursor_mzs = [], [], []
         with self as lib_reader:
             with SpectralLibraryStore(self._get_store_filename()) as \
                     spectra_store:
@@ -171,24 +171,25 @@ class SpectralLibraryReader:
                     if config.add_decoys:
                         # Store the decoy information for easy retrieval.
                         decoy_spectrum = shuffle_and_reposition(spectrum)
-                        info_charge = temp_info[decoy_spectrum.precursor_charge]
-                        info_charge['id'].append(decoy_spectrum.identifier)
-                        info_charge['precursor_mz'].append(
-                            decoy_spectrum.precursor_mz)
+                        charges.append(decoy_spectrum.precursor_charge)
+                        ids.append(decoy_spectrum.identifier)
+                        precursor_mzs.append(decoy_spectrum.precursor_mz)
                         spectra_store.write_spectrum_to_library(decoy_spectrum)
                     # Store the spectrum information for easy retrieval.
-                    info_charge = temp_info[spectrum.precursor_charge]
-                    info_charge['id'].append(spectrum.identifier)
-                    info_charge['precursor_mz'].append(spectrum.precursor_mz)
+                    charges.append(spectrum.precursor_charge)
+                    ids.append(spectrum.identifier)
+                    precursor_mzs.append(spectrum.precursor_mz)
                     spectra_store.write_spectrum_to_library(spectrum)
-        self.spec_info = {
-            'charge': {
-                charge: {
-                    'id': np.asarray(charge_info['id']),
-                    'precursor_mz': np.asarray(charge_info['precursor_mz'],
-                                               np.float32)
-                } for charge, charge_info in temp_info.items()}
-        }
+        charges_array = np.asarray(charges)
+        ids, precursor_mzs = (np.asarray(ids),
+                              np.asarray(precursor_mzs, np.float32))
+        self.spec_info = {'charge': {}}
+        for charge in dict.fromkeys(charges):
+            charge_mask = charges_array == charge
+            self.spec_info['charge'][charge] = {
+                'id': ids[charge_mask],
+                'precursor_mz': precursor_mzs[charge_mask]
+            }
 
         # Store the configuration.
         config_filename = self._get_config_filename()
@@ -205,6 +206,11 @@ class SpectralLibraryReader:
     def close(self) -> None:
         if self._parser is not None:
             del self._parser
+            self._parser = None
+        # The spectral library store is kept open for all reads until the
+        # reader is closed.
+        if self._spectral_library_store is not None:
+            self._spectral_library_store.close_store()
 
     def __enter__(self) -> 'SpectralLibraryReader':
         if self._filename_ext == '.splib':
@@ -245,6 +251,28 @@ class SpectralLibraryReader:
             spectrum._annotation = annotation
         return spectrum
 
+    def read_spectra(self, spec_ids: Iterable[str],
+                     process_peaks: bool = False) -> List[MsmsSpectrum]:
+        """
+        Read the spectra with the specified identifiers from the spectral
+        library store.
+
+        Parameters
+        ----------
+        spec_ids : Iterable[str]
+            The identifiers of the spectra in the spectral library file.
+        process_peaks : bool, optional
+            Flag whether to process the spectra's peaks or not
+            (the default is false to not process the spectra's peaks).
+
+        Returns
+        -------
+        List[MsmsSpectrum]
+            The spectra from the spectral library store with the specified
+            identifiers, in the same order as the identifiers.
+        """
+        return [self.read_spectrum(spec_id, process_peaks)
+                for spec_id in spec_ids]
 
     def read_all_spectra(self) -> Iterator[MsmsSpectrum]:
         """
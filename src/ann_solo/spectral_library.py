@@ -1,16 +1,17 @@
 import collections
-import copy
 import hashlib
+import itertools
 import json
 import logging
 import multiprocessing
+import multiprocessing.pool
 import os
 from typing import Dict
 from typing import Iterator
 from typing import List
+from typing import Tuple
 
 import faiss
-import numexpr as ne
 import numpy as np
 import tqdm
 from spectrum_utils.spectrum import MsmsSpectrum
@@ -20,8 +21,9 @@ from ann_solo import spectrum_match
 from ann_solo import utils
 from ann_solo.config import config
 from ann_solo.spectrum import process_spectrum
-from ann_solo.spectrum import spectrum_to_vector
+from ann_solo.spectrum import spectra_to_vectors
 from ann_solo.spectrum import SpectrumSpectrumMatch
+from ann_solo.spectrum import with_precursor_charge
 
 
 class SpectralLibrary:
@@ -68,6 +70,10 @@ class SpectralLibrary:
             logging.error(e)
             raise
 
+        # FAISS parallelizes ANN index training, adding, and batched searches
+        # internally.
+        if config.num_threads is not None:
+            faiss.omp_set_num_threads(config.num_threads)
         self._num_probe = config.num_probe
         self._num_candidates = config.num_candidates
         self._use_gpu = not config.no_gpu and faiss.get_num_gpus()
@@ -88,6 +94,24 @@ class SpectralLibrary:
 
         self._current_index = None, None
 
+        # Order of the library spectra by precursor m/z for each charge, to
+        # find the library candidates within a precursor mass window using
+        # binary search, and the rank of each library spectrum in this order.
+        # The library identifiers are included to look up all information
+        # for a charge at once, as well as which library spectra are known to
+        # be invalid after processing, to skip them as candidates.
+        self._precursor_mz_order = {}
+        for charge, charge_info in \
+                self._library_reader.spec_info['charge'].items():
+            precursor_mzs = np.ascontiguousarray(
+                charge_info['precursor_mz'], np.float32)
+            order = np.argsort(precursor_mzs, kind='stable')
+            ranks = np.empty_like(order)
+            ranks[order] = np.arange(len(order))
+            self._precursor_mz_order[charge] = (
+                order, precursor_mzs[order], ranks, charge_info['id'],
+                np.ones(len(order), np.bool_))
+
         if config.mode == 'ann':
             verify_file_existence = True
             if self._library_reader.is_recreated:
@@ -102,6 +126,9 @@ class SpectralLibrary:
             ann_charges = [charge for charge, charge_info in
                            self._library_reader.spec_info['charge'].items()
                            if len(charge_info['id']) >= config.num_list]
+            # ANN indexes with an HNSW quantizer are stored separately.
+            if config.hnsw_quantizer:
+                base_filename = f'{base_filename}_hnsw'
             for charge in sorted(ann_charges):
                 self._ann_filenames[charge] = (
                     f'{base_filename}_{charge}.idxann'
@@ -148,32 +175,51 @@ class SpectralLibrary:
                              np.float32)
             for charge in charges}
 
-        i = {charge: 0 for charge in charge_vectors.keys()}
+        # The processed spectra are converted to vectors in parallel, in
+        # batches per charge.
+        batch_size = 4096
+        charge_batches = {charge: [] for charge in charge_vectors.keys()}
+        charge_num_vectors = {charge: 0 for charge in charge_vectors.keys()}
+
+        def add_batch(charge: int) -> None:
+            batch, start = charge_batches[charge], charge_num_vectors[charge]
+            spectra_to_vectors(
+                batch, config.min_mz, config.max_mz, config.bin_size,
+                config.hash_len, True,
+                charge_vectors[charge][start:start + len(batch)])
+            charge_num_vectors[charge] += len(batch)
+            batch.clear()
+
         for lib_spectrum in tqdm.tqdm(
                 self._library_reader.read_all_spectra(),
                 desc='Library spectra added', leave=False, unit='spectra',
                 smoothing=0.1):
-            charge = lib_spectrum.precursor_charge
-            if charge in charge_vectors.keys():
-                spectrum_to_vector(process_spectrum(lib_spectrum, True),
-                                   config.min_mz, config.max_mz,
-                                   config.bin_size, config.hash_len, True,
-                                   charge_vectors[charge][i[charge]])
-                i[charge] += 1
+            charge_batch = charge_batches.get(lib_spectrum.precursor_charge)
+            if charge_batch is not None:
+                charge_batch.append(process_spectrum(lib_spectrum, True))
+                if len(charge_batch) == batch_size:
+                    add_batch(lib_spectrum.precursor_charge)
+        for charge in charge_batches.keys():
+            add_batch(charge)
         # Build an individual FAISS index per charge.
         logging.info('Build the spectral library ANN indexes')
         for charge, vectors in charge_vectors.items():
             logging.debug('Create a new ANN index for charge %d', charge)
-            quantizer = faiss.IndexFlatIP(config.hash_len)
-            # TODO: Use HNSW as quantizer?
-            #       https://github.com/facebookresearch/faiss/blob/master/benchs/bench_hnsw.py#L136
-            # quantizer = faiss.IndexHNSWFlat(config.hash_len, 32)
-            # quantizer.hnsw.efSearch = 64
-            # ann_index -> faiss.METRIC_L2
-            # ann_index.quantizer_trains_alone = 2
+            if config.hnsw_quantizer:
+                # Assign vectors to the partitions using an HNSW graph of the
+                # partition centroids instead of an exhaustive search.
+                # https://github.com/facebookresearch/faiss/blob/master/benchs/bench_hnsw.py#L136
+                quantizer = faiss.IndexHNSWFlat(config.hash_len, 32,
+                                                faiss.METRIC_INNER_PRODUCT)
+            else:
+                quantizer = faiss.IndexFlatIP(config.hash_len)
             ann_index = faiss.IndexIVFFlat(quantizer, config.hash_len,
                                            config.num_list,
                                            faiss.METRIC_INNER_PRODUCT)
+            if config.hnsw_quantizer:
+                # Train the centroids using k-means with an exhaustive search
+                # and only add the final centroids to the HNSW graph.
+                ann_index.quantizer_trains_alone = 2
             # noinspection PyArgumentList
             ann_index.train(vectors)
             # noinspection PyArgumentList
@@ -208,22 +254,17 @@ class SpectralLibrary:
         """
         logging.info('Process file %s', query_filename)
         # Read all spectra in the query file and
-        # split based on their precursor charge
+        # split based on their precursor charge.
+        # The spectra are read sequentially and processed in parallel.
         query_spectra = collections.defaultdict(list)
-        for query_spectrum in tqdm.tqdm(
-                reader.read_query_file(query_filename), desc='Query spectra '
-                    'read',leave=False, unit='spectra', smoothing=0.7):
-            # For queries with an unknown charge, try all possible charges.
-            if query_spectrum.precursor_charge is not None:
-                query_spectra_charge = [query_spectrum]
-            else:
-                query_spectra_charge = []
-                for charge in (2, 3):
-                    query_spectra_charge.append(copy.copy(query_spectrum))
-                    query_spectra_charge[-1].precursor_charge = charge
-            for query_spectrum_charge in query_spectra_charge:
-                # Discard low-quality spectra.
-                if process_spectrum(query_spectrum_charge, False).is_valid:
+        with multiprocessing.pool.ThreadPool(config.num_threads) as pool:
+            for query_spectra_charge in tqdm.tqdm(
+                    pool.imap(self._process_query_spectrum,
+                              reader.read_query_file(query_filename),
+                              chunksize=128),
+                    desc='Query spectra read', leave=False, unit='spectra',
+                    smoothing=0.7):
+                for query_spectrum_charge in query_spectra_charge:
                     (query_spectra[query_spectrum_charge.precursor_charge]
                      .append(query_spectrum_charge))
         # Identify all query spectra.
@@ -259,6 +300,43 @@ class SpectralLibrary:
 
         return list(identifications.values())
 
+    @staticmethod
+    def _process_query_spectrum(query_spectrum: MsmsSpectrum)\
+            -> List[MsmsSpectrum]:
+        """
+        Process a query spectrum for all of its possible precursor charges.
+
+        Parameters
+        ----------
+        query_spectrum : MsmsSpectrum
+            The query spectrum to be processed.
+
+        Returns
+        -------
+        List[MsmsSpectrum]
+            The processed query spectrum for each possible precursor charge,
+            excluding low-quality spectra.
+        """
+        # For queries with an unknown charge, try all possible charges.
+        if query_spectrum.precursor_charge is not None:
+            query_spectra_charge = [query_spectrum]
+        elif not config.remove_precursor:
+            # The peak processing is independent of the precursor charge, so
+            # the peaks are only processed once and shared by shallow copies
+            # for the other charges.
+            query_spectrum.precursor_charge = 2
+            if not process_spectrum(query_spectrum, False).is_valid:
+                return []
+            return [query_spectrum, with_precursor_charge(query_spectrum, 3)]
+        else:
+            query_spectra_charge = [
+                with_precursor_charge(query_spectrum, charge)
+                for charge in (2, 3)]
+        # Discard low-quality spectra.
+        return [query_spectrum_charge
+                for query_spectrum_charge in query_spectra_charge
+                if process_spectrum(query_spectrum_charge, False).is_valid]
+
     def _search_cascade(self, query_spectra: Dict[int, List[MsmsSpectrum]],
                         mode: str) -> Iterator[SpectrumSpectrumMatch]:
         """
@@ -351,23 +429,54 @@ class SpectralLibrary:
             that could be successfully matched to its most similar library
             spectrum.
         """
-        # Find all library candidates for each query spectrum.
-        for query_spectrum, library_candidates in zip(
-                query_spectra, self._get_library_candidates(
-                    query_spectra, charge, mode)):
-            # Find the best match candidate.
-            if library_candidates:
-                library_match, _, peak_matches = \
-                    spectrum_match.get_best_match(
-                        query_spectrum, library_candidates,
-                        config.fragment_mz_tolerance,
-                        config.allow_peak_shifts
-                    )
-                yield SpectrumSpectrumMatch(
-                    query_spectrum,
-                    library_match,
-                    peak_matches=np.asarray(peak_matches),
-                )
+        # Find all library candidates for each query spectrum sequentially in
+        # the calling thread, and find the best match candidates for chunks
+        # of query spectra in parallel. Candidate matching releases the GIL,
+        # so threads suffice and the (cached) library spectra are shared
+        # instead of pickled. Submitting bounded chunks limits the number of
+        # candidate lists that are kept in memory at once.
+        # Query spectra without library candidates are rejected before they
+        # are dispatched to the workers.
+        query_candidates = ((query_spectrum, library_candidates)
+                            for query_spectrum, library_candidates in zip(
+                                query_spectra, self._get_library_candidates(
+                                    query_spectra, charge, mode))
+                            if library_candidates)
+        with multiprocessing.pool.ThreadPool(config.num_threads) as pool:
+            while True:
+                chunk = list(itertools.islice(query_candidates, 256))
+                if not chunk:
+                    break
+                yield from pool.map(self._find_best_match, chunk)
+
+    @staticmethod
+    def _find_best_match(
+            query_candidates: Tuple[MsmsSpectrum, List[MsmsSpectrum]])\
+            -> SpectrumSpectrumMatch:
+        """
+        Find the best matching library candidate for a query spectrum.
+
+        Parameters
+        ----------
+        query_candidates : Tuple[MsmsSpectrum, List[MsmsSpectrum]]
+            A tuple of the query spectrum and its (non-empty) library
+            candidates.
+
+        Returns
+        -------
+        SpectrumSpectrumMatch
+            The spectrum-spectrum match between the query spectrum and its
+            most similar library candidate.
+        """
+        query_spectrum, library_candidates = query_candidates
+        library_match, _, peak_matches = spectrum_match.get_best_match(
+            query_spectrum, library_candidates, config.fragment_mz_tolerance,
+            config.allow_peak_shifts)
+        return SpectrumSpectrumMatch(
+            query_spectrum,
+            library_match,
+            peak_matches=np.asarray(peak_matches),
+        )
 
     def _get_library_candidates(self, query_spectra: List[MsmsSpectrum],
                                 charge: int, mode: str)\
@@ -408,51 +517,86 @@ class SpectralLibrary:
             raise ValueError('Unknown search mode')
 
         # No library matches possible.
-        if charge not in self._library_reader.spec_info['charge']:
+        if charge not in self._precursor_mz_order:
             return
 
-        library_candidates = self._library_reader.spec_info['charge'][charge]
+        order, sorted_mzs, ranks, library_ids, library_valid = \
+            self._precursor_mz_order[charge]
 
         # First filter: precursor m/z.
-        query_mzs = np.empty((len(query_spectra), 1), float)
-        for i, query_spectrum in enumerate(query_spectra):
-            query_mzs[i] = query_spectrum.precursor_mz
-        library_mzs = library_candidates['precursor_mz'].reshape((1, -1))
+        # The library candidates within the precursor mass window are a
+        # contiguous range of the library spectra sorted by precursor m/z.
+        query_mzs = np.asarray([query_spectrum.precursor_mz
+                                for query_spectrum in query_spectra], float)
         if tol_mode == 'Da':
-            candidate_filters = ne.evaluate(
-                'abs(query_mzs - library_mzs) * charge <= tol_val')
+            # abs(query_mz - library_mz) * charge <= tol_val
+            min_mzs = query_mzs - tol_val / charge
+            max_mzs = query_mzs + tol_val / charge
         elif tol_mode == 'ppm':
-            candidate_filters = ne.evaluate(
-                'abs(query_mzs - library_mzs) / library_mzs * 10**6'
-                '<= tol_val')
+            # abs(query_mz - library_mz) / library_mz * 10**6 <= tol_val
+            min_mzs = query_mzs / (1 + tol_val / 10**6)
+            max_mzs = query_mzs / (1 - tol_val / 10**6)
         else:
             raise ValueError('Unknown precursor tolerance mode')
+        # Match the single precision library precursor m/z to avoid casting
+        # the full library array for each search. The boundaries are rounded
+        # inwards to the tightest float32 values that select exactly the
+        # library precursor m/z inside the float64 window.
+        min_mzs_f32, max_mzs_f32 = (min_mzs.astype(np.float32),
+                                    max_mzs.astype(np.float32))
+        min_mzs_f32 = np.where(min_mzs_f32 < min_mzs,
+                               np.nextafter(min_mzs_f32, np.float32(np.inf)),
+                               min_mzs_f32)
+        max_mzs_f32 = np.where(max_mzs_f32 > max_mzs,
+                               np.nextafter(max_mzs_f32, np.float32(-np.inf)),
+                               max_mzs_f32)
+        starts = np.searchsorted(sorted_mzs, min_mzs_f32, 'left')
+        stops = np.searchsorted(sorted_mzs, max_mzs_f32, 'right')
+        # The candidates are only materialized if the ANN filter isn't used.
+        candidate_filters = [None] * len(query_spectra)
 
         # Second filter: ANN.
+        # Only the query spectra with precursor mass candidates are included
+        # in the batched ANN search.
+        ann_queries = np.flatnonzero(stops > starts)
         if (config.mode == 'ann' and mode == 'open' and
-                charge in self._ann_filenames):
+                charge in self._ann_filenames and len(ann_queries) > 0):
             ann_index = self._get_ann_index(charge)
-            query_vectors = np.zeros((len(query_spectra), config.hash_len),
-                                     np.float32)
-            for i, query_spectrum in enumerate(query_spectra):
-                spectrum_to_vector(
-                    query_spectrum, config.min_mz, config.max_mz,
-                    config.bin_size, config.hash_len, True, query_vectors[i])
-            mask = np.zeros_like(candidate_filters)
+            query_vectors = spectra_to_vectors(
+                [query_spectra[i] for i in ann_queries], config.min_mz,
+                config.max_mz, config.bin_size, config.hash_len, True)
             # noinspection PyArgumentList
-            for mask_i, ann_filter in zip(mask, ann_index.search(
+            for i, ann_filter in zip(ann_queries, ann_index.search(
                     query_vectors, self._num_candidates)[1]):
-                mask_i[ann_filter[ann_filter != -1]] = True
-            candidate_filters = np.logical_and(candidate_filters, mask)
+                # An ANN candidate is within the precursor mass window if its
+                # precursor m/z rank is, so the (potentially very large)
+                # precursor mass candidates don't need to be materialized.
+                ann_filter = np.sort(ann_filter[ann_filter != -1])
+                ann_ranks = ranks[ann_filter]
+                candidate_filters[i] = ann_filter[
+                    (ann_ranks >= starts[i]) & (ann_ranks < stops[i])]
 
         # Get the library candidates that pass the filter.
-        for candidate_filter in candidate_filters:
-            query_candidates = []
-            for idx in library_candidates['id'][candidate_filter]:
-                candidate = self._library_reader.read_spectrum(idx, True)
-                if candidate.is_valid:
-                    query_candidates.append(candidate)
-            yield query_candidates
+        read_spectra = self._library_reader.read_spectra
+        for start, stop, candidate_filter in zip(starts, stops,
+                                                 candidate_filters):
+            if stop <= start:
+                yield []
+                continue
+            if candidate_filter is None:
+                # Keep the candidates in their library order.
+                candidate_filter = np.sort(order[start:stop])
+            # Skip the candidates that were invalid for previous queries.
+            candidate_filter = candidate_filter[
+                library_valid[candidate_filter]]
+            candidates = read_spectra(library_ids[candidate_filter], True)
+            candidates_valid = [candidate.is_valid for candidate in candidates]
+            if not all(candidates_valid):
+                library_valid[candidate_filter[
+                    np.logical_not(candidates_valid)]] = False
+                candidates = [candidate for candidate, is_valid in zip(
+                                  candidates, candidates_valid) if is_valid]
+            yield candidates
 
     def _get_ann_index(self, charge: int) -> faiss.IndexIVF:
         """
@@ -487,7 +631,13 @@ class SpectralLibrary:
                     self._current_index[1].reset()
                 # Load the new index.
                 logging.debug('Load the ANN index for charge %d', charge)
-                index = faiss.read_index(self._ann_filenames[charge])
+                # The index is read into memory in full, so start reading the
+                # file in the background and don't retain it in the page
+                # cache afterwards.
+                ann_filename = self._ann_filenames[charge]
+                _advise_file(ann_filename, 'POSIX_FADV_WILLNEED')
+                index = faiss.read_index(ann_filename)
+                _advise_file(ann_filename, 'POSIX_FADV_DONTNEED')
                 if self._use_gpu:
                     co = faiss.GpuClonerOptions()
                     co.useFloat16 = True
@@ -495,6 +645,33 @@ class SpectralLibrary:
                     index.setNumProbes(self._num_probe)
                 else:
                     index.nprobe = self._num_probe
+                    quantizer = faiss.downcast_index(index.quantizer)
+                    if isinstance(quantizer, faiss.IndexHNSW):
+                        # Inspect at least as many nodes as partitions.
+                        quantizer.hnsw.efSearch = max(
+                            config.hnsw_ef_search, self._num_probe)
                 self._current_index = charge, index
 
             return self._current_index[1]
+
+
+def _advise_file(filename: str, advice: str) -> None:
+    """
+    Declare the access pattern for a file to the operating system.
+
+    This is a no-op on platforms that don't support `os.posix_fadvise`.
+
+    Parameters
+    ----------
+    filename : str
+        The file name.
+    advice : str
+        The name of the `os.POSIX_FADV_*` advice constant.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    fd = os.open(filename, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+    finally:
+        os.close(fd)
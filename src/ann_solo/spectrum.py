@@ -1,6 +1,6 @@
 import functools
 import math
-from typing import List, Optional
+from typing import Any, Callable, List, Optional
 
 import mmh3
 import numba as nb
@@ -10,7 +10,7 @@ from spectrum_utils.spectrum import MsmsSpectrum
 from ann_solo.config import config
 
 
-@nb.njit
+@nb.njit(cache=True, nogil=True)
 def _check_spectrum_valid(spectrum_mz: np.ndarray, min_peaks: int,
                           min_mz_range: float) -> bool:
     """
@@ -36,7 +36,7 @@ def _check_spectrum_valid(spectrum_mz: np.ndarray, min_peaks: int,
             spectrum_mz[-1] - spectrum_mz[0] >= min_mz_range)
 
 
-@nb.njit
+@nb.njit(cache=True, nogil=True)
 def _norm_intensity(spectrum_intensity: np.ndarray) -> np.ndarray:
     """
     Normalize spectrum peak intensities.
@@ -119,6 +119,87 @@ def process_spectrum(spectrum: MsmsSpectrum, is_library: bool) -> MsmsSpectrum:
     return spectrum
 
 
+def get_processed_cached(spectrum: MsmsSpectrum, attribute: str,
+                         compute: Callable[[MsmsSpectrum], Any]) -> Any:
+    """
+    Get a value derived from the peaks of a spectrum, cached if processed.
+
+    The peaks of processed spectra are no longer modified, so values derived
+    from them are cached on the spectrum to avoid recomputing them for every
+    SSM that the spectrum is part of.
+
+    Parameters
+    ----------
+    spectrum : MsmsSpectrum
+        The spectrum from which the value is derived.
+    attribute : str
+        The name of the spectrum attribute in which the value is cached.
+    compute : Callable[[MsmsSpectrum], Any]
+        Function to compute the value from the spectrum.
+
+    Returns
+    -------
+    Any
+        The (cached) value derived from the spectrum.
+    """
+    if not getattr(spectrum, 'is_processed', False):
+        return compute(spectrum)
+    try:
+        return getattr(spectrum, attribute)
+    except AttributeError:
+        value = compute(spectrum)
+        setattr(spectrum, attribute, value)
+        return value
+
+
+def get_intensity_sum(spectrum: MsmsSpectrum) -> float:
+    """
+    Get the total peak intensity of a spectrum.
+
+    The total intensity of processed spectra is cached on the spectrum.
+
+    Parameters
+    ----------
+    spectrum : MsmsSpectrum
+        The spectrum whose total peak intensity is computed.
+
+    Returns
+    -------
+    float
+        The sum of the spectrum peak intensities.
+    """
+    return get_processed_cached(
+        spectrum, 'intensity_sum',
+        lambda spec: spec.intensity.sum(dtype=np.float64))
+
+
+def with_precursor_charge(spectrum: MsmsSpectrum, precursor_charge: int)\
+        -> MsmsSpectrum:
+    """
+    Create a shallow copy of a spectrum with a different precursor charge.
+
+    This is considerably cheaper than `copy.copy`, which goes through the
+    generic pickling protocol, while it similarly shares the peak arrays
+    between the spectrum and its copy.
+
+    Parameters
+    ----------
+    spectrum : MsmsSpectrum
+        The spectrum to be copied.
+    precursor_charge : int
+        The precursor charge of the copy.
+
+    Returns
+    -------
+    MsmsSpectrum
+        The copy of the spectrum with the given precursor charge.
+    """
+    spectrum_copy = type(spectrum).__new__(type(spectrum))
+    spectrum_copy.__dict__.update(spectrum.__dict__)
+    spectrum_copy.precursor_charge = precursor_charge
+    return spectrum_copy
+
+
 @functools.lru_cache(maxsize=None)
 def get_dim(min_mz, max_mz, bin_size):
     """
@@ -163,6 +244,35 @@ def hash_idx(bin_idx: int, hash_len: int) -> int:
     return mmh3.hash(str(bin_idx), 42, signed=False) % hash_len
 
 
+@functools.lru_cache(maxsize=None)
+def get_hash_lookup(min_mz: float, max_mz: float, bin_size: float,
+                    hash_len: int) -> np.ndarray:
+    """
+    Get the hashed index of each mass bin over the given mass range.
+
+    Parameters
+    ----------
+    min_mz : float
+        The minimum m/z of the mass range.
+    max_mz : float
+        The maximum m/z of the mass range.
+    bin_size : float
+        The bin size in m/z used to divide the m/z range.
+    hash_len : int
+        The maximum index after hashing.
+
+    Returns
+    -------
+    np.ndarray
+        The hashed index for each mass bin index.
+    """
+    vec_len, _, _ = get_dim(min_mz, max_mz, bin_size)
+    hash_lookup = np.asarray([hash_idx(bin_idx, hash_len)
+                              for bin_idx in range(vec_len)], np.int64)
+    hash_lookup.flags.writeable = False
+    return hash_lookup
+
+
 def spectrum_to_vector(spectrum: MsmsSpectrum, min_mz: float, max_mz: float,
                        bin_size: float, hash_len: int, norm: bool = True,
                        vector: np.ndarray = None) -> np.ndarray:
@@ -176,7 +286,8 @@ def spectrum_to_vector(spectrum: MsmsSpectrum, min_mz: float, max_mz: float,
     Parameters
     ----------
     spectrum : Spectrum
-        The `Spectrum` to be converted to a vector.
+        The `Spectrum` to be converted to a vector. Peaks outside the m/z
+        range are ignored.
     min_mz : float
         The minimum m/z to include in the vector.
     max_mz : float
@@ -188,32 +299,133 @@ def spectrum_to_vector(spectrum: MsmsSpectrum, min_mz: float, max_mz: float,
     norm : bool
         Normalize the vector to unit length or not.
     vector : np.ndarray, optional
-        A pre-allocated vector.
+        A pre-allocated vector. Its previous values are overwritten, so a
+        single vector can be reused to convert multiple spectra.
 
     Returns
     -------
     np.ndarray
         The hashed spectrum vector with unit length.
     """
-    vec_len, min_bound, _ = get_dim(min_mz, max_mz, bin_size)
+    num_bins, min_bound, _ = get_dim(min_mz, max_mz, bin_size)
+    vec_len = hash_len if hash_len is not None else num_bins
     if vector is None:
-        if hash_len is not None:
-            vec_len = hash_len
-        vector = np.zeros((vec_len,), np.float32)
-        if vec_len != vector.shape[0]:
-            raise ValueError('Incorrect vector dimensionality')
-
-    for mz, intensity in zip(spectrum.mz, spectrum.intensity):
-        bin_idx = math.floor((mz - min_bound) // bin_size)
-        if hash_len is not None:
-            bin_idx = hash_idx(bin_idx, hash_len)
-        vector[bin_idx] += intensity
+        vector = np.empty((vec_len,), np.float32)
+    elif vec_len != vector.shape[0]:
+        raise ValueError('Incorrect vector dimensionality')
+
+    bin_idx = np.floor_divide(spectrum.mz - min_bound,
+                              bin_size).astype(np.int64)
+    intensity = spectrum.intensity
+    in_range = (bin_idx >= 0) & (bin_idx < num_bins)
+    if not in_range.all():
+        bin_idx, intensity = bin_idx[in_range], intensity[in_range]
+    if hash_len is not None:
+        bin_idx = get_hash_lookup(min_mz, max_mz, bin_size, hash_len)[bin_idx]
+    vector[:] = np.bincount(bin_idx, intensity, vec_len)
 
     if norm:
         vector /= np.linalg.norm(vector)
     return vector
 
 
+def spectra_to_vectors(spectra: List[MsmsSpectrum], min_mz: float,
+                       max_mz: float, bin_size: float, hash_len: int,
+                       norm: bool = True, vectors: np.ndarray = None)\
+        -> np.ndarray:
+    """
+    Convert multiple `Spectrum`s to dense NumPy vectors in parallel.
+
+    This is equivalent to converting each spectrum individually using
+    `spectrum_to_vector`.
+
+    Parameters
+    ----------
+    spectra : List[Spectrum]
+        The `Spectrum`s to be converted to vectors. Peaks outside the m/z
+        range are ignored.
+    min_mz : float
+        The minimum m/z to include in the vectors.
+    max_mz : float
+        The maximum m/z to include in the vectors.
+    bin_size : float
+        The bin size in m/z used to divide the m/z range.
+    hash_len : int
+        The length of the hashed vectors, None if no hashing is to be done.
+    norm : bool
+        Normalize the vectors to unit length or not.
+    vectors : np.ndarray, optional
+        A pre-allocated matrix with a row for each spectrum. Its previous
+        values are overwritten.
+
+    Returns
+    -------
+    np.ndarray
+        The hashed spectrum vectors with unit length, one per row.
+    """
+    vec_len, min_bound, _ = get_dim(min_mz, max_mz, bin_size)
+    if hash_len is not None:
+        bin_lookup = get_hash_lookup(min_mz, max_mz, bin_size, hash_len)
+        vec_len = hash_len
+    else:
+        bin_lookup = np.arange(vec_len)
+    if vectors is None:
+        vectors = np.empty((len(spectra), vec_len), np.float32)
+    elif vectors.shape != (len(spectra), vec_len):
+        raise ValueError('Incorrect vector dimensionality')
+
+    offsets = np.zeros(len(spectra) + 1, np.int64)
+    np.cumsum([len(spectrum.mz) for spectrum in spectra], out=offsets[1:])
+    if len(spectra) > 0:
+        mz = np.concatenate([spectrum.mz for spectrum in spectra])
+        intensity = np.concatenate([spectrum.intensity
+                                    for spectrum in spectra])
+    else:
+        mz, intensity = np.empty(0, np.float64), np.empty(0, np.float32)
+    _bin_spectra(mz.astype(np.float64, copy=False),
+                 intensity.astype(np.float32, copy=False), offsets,
+                 min_bound, bin_size, bin_lookup, norm, vectors)
+    return vectors
+
+
+@nb.njit(cache=True, nogil=True, parallel=True)
+def _bin_spectra(mz: np.ndarray, intensity: np.ndarray, offsets: np.ndarray,
+                 min_bound: float, bin_size: float, bin_lookup: np.ndarray,
+                 norm: bool, vectors: np.ndarray) -> None:
+    """
+    Bin the peaks of multiple spectra into dense vectors in parallel.
+
+    Parameters
+    ----------
+    mz : np.ndarray
+        The concatenated peak m/z of all spectra.
+    intensity : np.ndarray
+        The concatenated peak intensities of all spectra.
+    offsets : np.ndarray
+        The CSR-style offsets of the peaks of each spectrum.
+    min_bound : float
+        The lower boundary of the first mass bin.
+    bin_size : float
+        The bin size in m/z.
+    bin_lookup : np.ndarray
+        The vector index for each mass bin index.
+    norm : bool
+        Normalize the vectors to unit length or not.
+    vectors : np.ndarray
+        The matrix in which each row is filled with the vector of the
+        corresponding spectrum.
+    """
+    for i in nb.prange(len(offsets) - 1):
+        vector = vectors[i]
+        vector[:] = 0
+        for j in range(offsets[i], offsets[i + 1]):
+            bin_idx = int((mz[j] - min_bound) // bin_size)
+            if 0 <= bin_idx < len(bin_lookup):
+                vector[bin_lookup[bin_idx]] += intensity[j]
+        if norm:
+            vector /= np.linalg.norm(vector)
+
+
 class SpectrumSpectrumMatch:
 
     def __init__(
@@ -230,6 +442,58 @@ class SpectrumSpectrumMatch:
         self.search_engine_score = search_engine_score
         self.q = q
 
+    # The query and library peak indexes of the peak matches as separate
+    # contiguous arrays, to avoid strided access into the peak match pairs.
+    # Only valid if there are peak matches.
+    @functools.cached_property
+    def peak_matches_query(self):
+        return np.ascontiguousarray(self.peak_matches[:, 0], np.int32)
+
+    @functools.cached_property
+    def peak_matches_library(self):
+        return np.ascontiguousarray(self.peak_matches[:, 1], np.int32)
+
+    # The matched peaks are gathered once into contiguous arrays that are
+    # shared by all similarity computations on this SSM. Only valid if there
+    # are peak matches. Intensities are stored in single precision to reduce
+    # memory traffic, m/z values are kept in double precision because their
+    # differences are small relative to their magnitude.
+    @functools.cached_property
+    def query_matched_mz(self):
+        return np.ascontiguousarray(
+            self.query_spectrum.mz[self.peak_matches_query])
+
+    @functools.cached_property
+    def query_matched_intensity(self):
+        return np.ascontiguousarray(
+            self.query_spectrum.intensity[self.peak_matches_query],
+            np.float32)
+
+    @functools.cached_property
+    def library_matched_mz(self):
+        return np.ascontiguousarray(
+            self.library_spectrum.mz[self.peak_matches_library])
+
+    @functools.cached_property
+    def library_matched_intensity(self):
+        return np.ascontiguousarray(
+            self.library_spectrum.intensity[self.peak_matches_library],
+            np.float32)
+
+    # Boolean masks of the unmatched peaks in both spectra, shared by all
+    # similarity computations on this SSM. They should not be modified.
+    @functools.cached_property
+    def query_unmatched(self):
+        query_unmatched = np.ones(len(self.query_spectrum.mz), dtype=bool)
+        query_unmatched[self.peak_matches_query] = False
+        return query_unmatched
+
+    @functools.cached_property
+    def library_unmatched(self):
+        library_unmatched = np.ones(len(self.library_spectrum.mz), dtype=bool)
+        library_unmatched[self.peak_matches_library] = False
+        return library_unmatched
+
     @property
     def sequence(self):
         return (self.library_spectrum.peptide
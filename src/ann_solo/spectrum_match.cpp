@@ -1128,7 +1128,7 @@ typedef struct {
 } __Pyx_BufFmt_Context;
 
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":690
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":689
  * # in Cython to enable them only on the right systems.
  * 
  * ctypedef npy_int8       int8_t             # <<<<<<<<<<<<<<
@@ -1137,7 +1137,7 @@ typedef struct {
  */
 typedef npy_int8 __pyx_t_5numpy_int8_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":691
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":690
  * 
  * ctypedef npy_int8       int8_t
  * ctypedef npy_int16      int16_t             # <<<<<<<<<<<<<<
@@ -1146,7 +1146,7 @@ typedef npy_int8 __pyx_t_5numpy_int8_t;
  */
 typedef npy_int16 __pyx_t_5numpy_int16_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":692
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":691
  * ctypedef npy_int8       int8_t
  * ctypedef npy_int16      int16_t
  * ctypedef npy_int32      int32_t             # <<<<<<<<<<<<<<
@@ -1155,7 +1155,7 @@ typedef npy_int16 __pyx_t_5numpy_int16_t;
  */
 typedef npy_int32 __pyx_t_5numpy_int32_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":693
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":692
  * ctypedef npy_int16      int16_t
  * ctypedef npy_int32      int32_t
  * ctypedef npy_int64      int64_t             # <<<<<<<<<<<<<<
@@ -1164,7 +1164,7 @@ typedef npy_int32 __pyx_t_5numpy_int32_t;
  */
 typedef npy_int64 __pyx_t_5numpy_int64_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":697
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":696
  * #ctypedef npy_int128     int128_t
  * 
  * ctypedef npy_uint8      uint8_t             # <<<<<<<<<<<<<<
@@ -1173,7 +1173,7 @@ typedef npy_int64 __pyx_t_5numpy_int64_t;
  */
 typedef npy_uint8 __pyx_t_5numpy_uint8_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":698
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":697
  * 
  * ctypedef npy_uint8      uint8_t
  * ctypedef npy_uint16     uint16_t             # <<<<<<<<<<<<<<
@@ -1182,7 +1182,7 @@ typedef npy_uint8 __pyx_t_5numpy_uint8_t;
  */
 typedef npy_uint16 __pyx_t_5numpy_uint16_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":699
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":698
  * ctypedef npy_uint8      uint8_t
  * ctypedef npy_uint16     uint16_t
  * ctypedef npy_uint32     uint32_t             # <<<<<<<<<<<<<<
@@ -1191,7 +1191,7 @@ typedef npy_uint16 __pyx_t_5numpy_uint16_t;
  */
 typedef npy_uint32 __pyx_t_5numpy_uint32_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":700
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":699
  * ctypedef npy_uint16     uint16_t
  * ctypedef npy_uint32     uint32_t
  * ctypedef npy_uint64     uint64_t             # <<<<<<<<<<<<<<
@@ -1200,7 +1200,7 @@ typedef npy_uint32 __pyx_t_5numpy_uint32_t;
  */
 typedef npy_uint64 __pyx_t_5numpy_uint64_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":704
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":703
  * #ctypedef npy_uint128    uint128_t
  * 
  * ctypedef npy_float32    float32_t             # <<<<<<<<<<<<<<
@@ -1209,7 +1209,7 @@ typedef npy_uint64 __pyx_t_5numpy_uint64_t;
  */
 typedef npy_float32 __pyx_t_5numpy_float32_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":705
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":704
  * 
  * ctypedef npy_float32    float32_t
  * ctypedef npy_float64    float64_t             # <<<<<<<<<<<<<<
@@ -1218,7 +1218,7 @@ typedef npy_float32 __pyx_t_5numpy_float32_t;
  */
 typedef npy_float64 __pyx_t_5numpy_float64_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":714
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":713
  * # The int types are mapped a bit surprising --
  * # numpy.int corresponds to 'l' and numpy.long to 'q'
  * ctypedef npy_long       int_t             # <<<<<<<<<<<<<<
@@ -1227,7 +1227,7 @@ typedef npy_float64 __pyx_t_5numpy_float64_t;
  */
 typedef npy_long __pyx_t_5numpy_int_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":715
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":714
  * # numpy.int corresponds to 'l' and numpy.long to 'q'
  * ctypedef npy_long       int_t
  * ctypedef npy_longlong   long_t             # <<<<<<<<<<<<<<
@@ -1236,7 +1236,7 @@ typedef npy_long __pyx_t_5numpy_int_t;
  */
 typedef npy_longlong __pyx_t_5numpy_long_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":716
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":715
  * ctypedef npy_long       int_t
  * ctypedef npy_longlong   long_t
  * ctypedef npy_longlong   longlong_t             # <<<<<<<<<<<<<<
@@ -1245,7 +1245,7 @@ typedef npy_longlong __pyx_t_5numpy_long_t;
  */
 typedef npy_longlong __pyx_t_5numpy_longlong_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":718
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":717
  * ctypedef npy_longlong   longlong_t
  * 
  * ctypedef npy_ulong      uint_t             # <<<<<<<<<<<<<<
@@ -1254,7 +1254,7 @@ typedef npy_longlong __pyx_t_5numpy_longlong_t;
  */
 typedef npy_ulong __pyx_t_5numpy_uint_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":719
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":718
  * 
  * ctypedef npy_ulong      uint_t
  * ctypedef npy_ulonglong  ulong_t             # <<<<<<<<<<<<<<
@@ -1263,7 +1263,7 @@ typedef npy_ulong __pyx_t_5numpy_uint_t;
  */
 typedef npy_ulonglong __pyx_t_5numpy_ulong_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":720
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":719
  * ctypedef npy_ulong      uint_t
  * ctypedef npy_ulonglong  ulong_t
  * ctypedef npy_ulonglong  ulonglong_t             # <<<<<<<<<<<<<<
@@ -1272,7 +1272,7 @@ typedef npy_ulonglong __pyx_t_5numpy_ulong_t;
  */
 typedef npy_ulonglong __pyx_t_5numpy_ulonglong_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":722
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":721
  * ctypedef npy_ulonglong  ulonglong_t
  * 
  * ctypedef npy_intp       intp_t             # <<<<<<<<<<<<<<
@@ -1281,7 +1281,7 @@ typedef npy_ulonglong __pyx_t_5numpy_ulonglong_t;
  */
 typedef npy_intp __pyx_t_5numpy_intp_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":723
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":722
  * 
  * ctypedef npy_intp       intp_t
  * ctypedef npy_uintp      uintp_t             # <<<<<<<<<<<<<<
@@ -1290,7 +1290,7 @@ typedef npy_intp __pyx_t_5numpy_intp_t;
  */
 typedef npy_uintp __pyx_t_5numpy_uintp_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":725
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":724
  * ctypedef npy_uintp      uintp_t
  * 
  * ctypedef npy_double     float_t             # <<<<<<<<<<<<<<
@@ -1299,7 +1299,7 @@ typedef npy_uintp __pyx_t_5numpy_uintp_t;
  */
 typedef npy_double __pyx_t_5numpy_float_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":726
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":725
  * 
  * ctypedef npy_double     float_t
  * ctypedef npy_double     double_t             # <<<<<<<<<<<<<<
@@ -1308,7 +1308,7 @@ typedef npy_double __pyx_t_5numpy_float_t;
  */
 typedef npy_double __pyx_t_5numpy_double_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":727
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":726
  * ctypedef npy_double     float_t
  * ctypedef npy_double     double_t
  * ctypedef npy_longdouble longdouble_t             # <<<<<<<<<<<<<<
@@ -1347,7 +1347,7 @@ struct __pyx_MemviewEnum_obj;
 struct __pyx_memoryview_obj;
 struct __pyx_memoryviewslice_obj;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":729
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":728
  * ctypedef npy_longdouble longdouble_t
  * 
  * ctypedef npy_cfloat      cfloat_t             # <<<<<<<<<<<<<<
@@ -1356,7 +1356,7 @@ struct __pyx_memoryviewslice_obj;
  */
 typedef npy_cfloat __pyx_t_5numpy_cfloat_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":730
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":729
  * 
  * ctypedef npy_cfloat      cfloat_t
  * ctypedef npy_cdouble     cdouble_t             # <<<<<<<<<<<<<<
@@ -1365,7 +1365,7 @@ typedef npy_cfloat __pyx_t_5numpy_cfloat_t;
  */
 typedef npy_cdouble __pyx_t_5numpy_cdouble_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":731
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":730
  * ctypedef npy_cfloat      cfloat_t
  * ctypedef npy_cdouble     cdouble_t
  * ctypedef npy_clongdouble clongdouble_t             # <<<<<<<<<<<<<<
@@ -1374,7 +1374,7 @@ typedef npy_cdouble __pyx_t_5numpy_cdouble_t;
  */
 typedef npy_clongdouble __pyx_t_5numpy_clongdouble_t;
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":733
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":732
  * ctypedef npy_clongdouble clongdouble_t
  * 
  * ctypedef npy_cdouble     complex_t             # <<<<<<<<<<<<<<
@@ -1654,6 +1654,14 @@ static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg
 #define __Pyx_PyObject_Call(func, arg, kw) PyObject_Call(func, arg, kw)
 #endif
 
+/* PyIntBinop.proto */
+#if !CYTHON_COMPILING_IN_PYPY
+static PyObject* __Pyx_PyInt_AddObjC(PyObject *op1, PyObject *op2, long intval, int inplace, int zerodivision_check);
+#else
+#define __Pyx_PyInt_AddObjC(op1, op2, intval, inplace, zerodivision_check)\
+    (inplace ? PyNumber_InPlaceAdd(op1, op2) : PyNumber_Add(op1, op2))
+#endif
+
 /* PyObjectSetAttrStr.proto */
 #if CYTHON_USE_TYPE_SLOTS
 #define __Pyx_PyObject_DelAttrStr(o,n) __Pyx_PyObject_SetAttrStr(o, n, NULL)
@@ -1663,13 +1671,31 @@ static CYTHON_INLINE int __Pyx_PyObject_SetAttrStr(PyObject* obj, PyObject* attr
 #define __Pyx_PyObject_SetAttrStr(o,n,v) PyObject_SetAttr(o,n,v)
 #endif
 
-/* PyIntBinop.proto */
-#if !CYTHON_COMPILING_IN_PYPY
-static PyObject* __Pyx_PyInt_AddObjC(PyObject *op1, PyObject *op2, long intval, int inplace, int zerodivision_check);
-#else
-#define __Pyx_PyInt_AddObjC(op1, op2, intval, inplace, zerodivision_check)\
-    (inplace ? PyNumber_InPlaceAdd(op1, op2) : PyNumber_Add(op1, op2))
-#endif
+/* MemviewSliceInit.proto */
+#define __Pyx_BUF_MAX_NDIMS %(BUF_MAX_NDIMS)d
+#define __Pyx_MEMVIEW_DIRECT   1
+#define __Pyx_MEMVIEW_PTR      2
+#define __Pyx_MEMVIEW_FULL     4
+#define __Pyx_MEMVIEW_CONTIG   8
+#define __Pyx_MEMVIEW_STRIDED  16
+#define __Pyx_MEMVIEW_FOLLOW   32
+#define __Pyx_IS_C_CONTIG 1
+#define __Pyx_IS_F_CONTIG 2
+static int __Pyx_init_memviewslice(
+                struct __pyx_memoryview_obj *memview,
+                int ndim,
+                __Pyx_memviewslice *memviewslice,
+                int memview_is_new_reference);
+static CYTHON_INLINE int __pyx_add_acquisition_count_locked(
+    __pyx_atomic_int *acquisition_count, PyThread_type_lock lock);
+static CYTHON_INLINE int __pyx_sub_acquisition_count_locked(
+    __pyx_atomic_int *acquisition_count, PyThread_type_lock lock);
+#define __pyx_get_slice_count_pointer(memview) (memview->acquisition_count_aligned_p)
+#define __pyx_get_slice_count(memview) (*__pyx_get_slice_count_pointer(memview))
+#define __PYX_INC_MEMVIEW(slice, have_gil) __Pyx_INC_MEMVIEW(slice, have_gil, __LINE__)
+#define __PYX_XDEC_MEMVIEW(slice, have_gil) __Pyx_XDEC_MEMVIEW(slice, have_gil, __LINE__)
+static CYTHON_INLINE void __Pyx_INC_MEMVIEW(__Pyx_memviewslice *, int, int);
+static CYTHON_INLINE void __Pyx_XDEC_MEMVIEW(__Pyx_memviewslice *, int, int);
 
 /* PyCFunctionFastCall.proto */
 #if CYTHON_FAST_PYCCALL
@@ -1720,32 +1746,6 @@ static CYTHON_INLINE PyObject* __Pyx_PyObject_CallMethO(PyObject *func, PyObject
 /* PyObjectCallOneArg.proto */
 static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg);
 
-/* MemviewSliceInit.proto */
-#define __Pyx_BUF_MAX_NDIMS %(BUF_MAX_NDIMS)d
-#define __Pyx_MEMVIEW_DIRECT   1
-#define __Pyx_MEMVIEW_PTR      2
-#define __Pyx_MEMVIEW_FULL     4
-#define __Pyx_MEMVIEW_CONTIG   8
-#define __Pyx_MEMVIEW_STRIDED  16
-#define __Pyx_MEMVIEW_FOLLOW   32
-#define __Pyx_IS_C_CONTIG 1
-#define __Pyx_IS_F_CONTIG 2
-static int __Pyx_init_memviewslice(
-                struct __pyx_memoryview_obj *memview,
-                int ndim,
-                __Pyx_memviewslice *memviewslice,
-                int memview_is_new_reference);
-static CYTHON_INLINE int __pyx_add_acquisition_count_locked(
-    __pyx_atomic_int *acquisition_count, PyThread_type_lock lock);
-static CYTHON_INLINE int __pyx_sub_acquisition_count_locked(
-    __pyx_atomic_int *acquisition_count, PyThread_type_lock lock);
-#define __pyx_get_slice_count_pointer(memview) (memview->acquisition_count_aligned_p)
-#define __pyx_get_slice_count(memview) (*__pyx_get_slice_count_pointer(memview))
-#define __PYX_INC_MEMVIEW(slice, have_gil) __Pyx_INC_MEMVIEW(slice, have_gil, __LINE__)
-#define __PYX_XDEC_MEMVIEW(slice, have_gil) __Pyx_XDEC_MEMVIEW(slice, have_gil, __LINE__)
-static CYTHON_INLINE void __Pyx_INC_MEMVIEW(__Pyx_memviewslice *, int, int);
-static CYTHON_INLINE void __Pyx_XDEC_MEMVIEW(__Pyx_memviewslice *, int, int);
-
 /* GetItemInt.proto */
 #define __Pyx_GetItemInt(o, i, type, is_signed, to_py_func, is_list, wraparound, boundscheck)\
     (__Pyx_fits_Py_ssize_t(i, type, is_signed) ?\
@@ -2117,10 +2117,10 @@ static int __Pyx_ValidateAndInit_memviewslice(
                 PyObject *original_obj);
 
 /* ObjectToMemviewSlice.proto */
-static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_float32_t(PyObject *, int writable_flag);
+static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_uint8_t(PyObject *, int writable_flag);
 
 /* ObjectToMemviewSlice.proto */
-static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_uint8_t(PyObject *, int writable_flag);
+static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_float32_t(PyObject *, int writable_flag);
 
 /* GCCDiagnostics.proto */
 #if defined(__GNUC__) && (__GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 6))
@@ -2277,12 +2277,12 @@ __pyx_memoryview_copy_new_contig(const __Pyx_memviewslice *from_mvs,
 /* CIntFromPy.proto */
 static CYTHON_INLINE unsigned int __Pyx_PyInt_As_unsigned_int(PyObject *);
 
-/* CIntToPy.proto */
-static CYTHON_INLINE PyObject* __Pyx_PyInt_From_unsigned_int(unsigned int value);
-
 /* CIntFromPy.proto */
 static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *);
 
+/* CIntToPy.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_unsigned_int(unsigned int value);
+
 /* CIntFromPy.proto */
 static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *);
 
@@ -2405,8 +2405,8 @@ static void __pyx_memoryview_refcount_objects_in_slice(char *, Py_ssize_t *, Py_
 static void __pyx_memoryview_slice_assign_scalar(__Pyx_memviewslice *, int, size_t, void *, int); /*proto*/
 static void __pyx_memoryview__slice_assign_scalar(char *, Py_ssize_t *, Py_ssize_t *, int, size_t, void *); /*proto*/
 static PyObject *__pyx_unpickle_Enum__set_state(struct __pyx_MemviewEnum_obj *, PyObject *); /*proto*/
-static __Pyx_TypeInfo __Pyx_TypeInfo_nn___pyx_t_5numpy_float32_t = { "float32_t", NULL, sizeof(__pyx_t_5numpy_float32_t), { 0 }, 0, 'R', 0, 0 };
 static __Pyx_TypeInfo __Pyx_TypeInfo_nn___pyx_t_5numpy_uint8_t = { "uint8_t", NULL, sizeof(__pyx_t_5numpy_uint8_t), { 0 }, 0, IS_UNSIGNED(__pyx_t_5numpy_uint8_t) ? 'U' : 'I', IS_UNSIGNED(__pyx_t_5numpy_uint8_t), 0 };
+static __Pyx_TypeInfo __Pyx_TypeInfo_nn___pyx_t_5numpy_float32_t = { "float32_t", NULL, sizeof(__pyx_t_5numpy_float32_t), { 0 }, 0, 'R', 0, 0 };
 #define __Pyx_MODULE_NAME "ann_solo.spectrum_match"
 extern int __pyx_module_is_main_ann_solo__spectrum_match;
 int __pyx_module_is_main_ann_solo__spectrum_match = 0;
@@ -2430,6 +2430,7 @@ static const char __pyx_k_np[] = "np";
 static const char __pyx_k_new[] = "__new__";
 static const char __pyx_k_obj[] = "obj";
 static const char __pyx_k_base[] = "base";
+static const char __pyx_k_copy[] = "copy";
 static const char __pyx_k_dict[] = "__dict__";
 static const char __pyx_k_main[] = "__main__";
 static const char __pyx_k_mode[] = "mode";
@@ -2472,6 +2473,7 @@ static const char __pyx_k_Ellipsis[] = "Ellipsis";
 static const char __pyx_k_getstate[] = "__getstate__";
 static const char __pyx_k_itemsize[] = "itemsize";
 static const char __pyx_k_pyx_type[] = "__pyx_type";
+static const char __pyx_k_query_mz[] = "query_mz";
 static const char __pyx_k_setstate[] = "__setstate__";
 static const char __pyx_k_TypeError[] = "TypeError";
 static const char __pyx_k_candidate[] = "candidate";
@@ -2483,6 +2485,8 @@ static const char __pyx_k_IndexError[] = "IndexError";
 static const char __pyx_k_ValueError[] = "ValueError";
 static const char __pyx_k_annotation[] = "annotation";
 static const char __pyx_k_candidates[] = "candidates";
+static const char __pyx_k_charge_ptr[] = "charge_ptr";
+static const char __pyx_k_mz_float32[] = "mz_float32";
 static const char __pyx_k_pyx_result[] = "__pyx_result";
 static const char __pyx_k_pyx_vtable[] = "__pyx_vtable__";
 static const char __pyx_k_query_spec[] = "query_spec";
@@ -2506,8 +2510,11 @@ static const char __pyx_k_allocate_buffer[] = "allocate_buffer";
 static const char __pyx_k_candidate_index[] = "candidate_index";
 static const char __pyx_k_dtype_is_object[] = "dtype_is_object";
 static const char __pyx_k_pyx_PickleError[] = "__pyx_PickleError";
+static const char __pyx_k_query_intensity[] = "query_intensity";
 static const char __pyx_k_setstate_cython[] = "__setstate_cython__";
+static const char __pyx_k_candidate_charge[] = "candidate_charge";
 static const char __pyx_k_precursor_charge[] = "precursor_charge";
+static const char __pyx_k_intensity_float32[] = "intensity_float32";
 static const char __pyx_k_pyx_unpickle_Enum[] = "__pyx_unpickle_Enum";
 static const char __pyx_k_cline_in_traceback[] = "cline_in_traceback";
 static const char __pyx_k_strided_and_direct[] = "<strided and direct>";
@@ -2575,15 +2582,18 @@ static PyObject *__pyx_n_s_base;
 static PyObject *__pyx_n_s_c;
 static PyObject *__pyx_n_u_c;
 static PyObject *__pyx_n_s_candidate;
+static PyObject *__pyx_n_s_candidate_charge;
 static PyObject *__pyx_n_s_candidate_index;
 static PyObject *__pyx_n_s_candidates;
 static PyObject *__pyx_n_s_candidates_vec;
 static PyObject *__pyx_n_s_charge;
 static PyObject *__pyx_n_u_charge;
+static PyObject *__pyx_n_s_charge_ptr;
 static PyObject *__pyx_n_s_class;
 static PyObject *__pyx_n_s_cline_in_traceback;
 static PyObject *__pyx_kp_s_contiguous_and_direct;
 static PyObject *__pyx_kp_s_contiguous_and_indirect;
+static PyObject *__pyx_n_s_copy;
 static PyObject *__pyx_n_s_dict;
 static PyObject *__pyx_n_s_dtype;
 static PyObject *__pyx_n_s_dtype_is_object;
@@ -2605,12 +2615,15 @@ static PyObject *__pyx_n_s_id;
 static PyObject *__pyx_n_s_import;
 static PyObject *__pyx_n_s_index;
 static PyObject *__pyx_n_s_intensity;
+static PyObject *__pyx_n_s_intensity_float32;
 static PyObject *__pyx_n_s_itemsize;
 static PyObject *__pyx_kp_s_itemsize_0_for_cython_array;
 static PyObject *__pyx_n_s_main;
 static PyObject *__pyx_n_s_memview;
 static PyObject *__pyx_n_s_mode;
 static PyObject *__pyx_n_s_mz;
+static PyObject *__pyx_n_s_mz_float32;
+static PyObject *__pyx_n_u_mz_float32;
 static PyObject *__pyx_n_s_name;
 static PyObject *__pyx_n_s_name_2;
 static PyObject *__pyx_n_s_ndim;
@@ -2635,7 +2648,9 @@ static PyObject *__pyx_n_s_pyx_type;
 static PyObject *__pyx_n_s_pyx_unpickle_Enum;
 static PyObject *__pyx_n_s_pyx_vtable;
 static PyObject *__pyx_n_s_query;
+static PyObject *__pyx_n_s_query_intensity;
 static PyObject *__pyx_n_s_query_matcher;
+static PyObject *__pyx_n_s_query_mz;
 static PyObject *__pyx_n_s_query_spec;
 static PyObject *__pyx_n_s_range;
 static PyObject *__pyx_n_s_reduce;
@@ -2850,12 +2865,16 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
   __Pyx_memviewslice __pyx_v_mz = { 0, 0, { 0 }, { 0 }, { 0 } };
   __Pyx_memviewslice __pyx_v_intensity = { 0, 0, { 0 }, { 0 }, { 0 } };
   __Pyx_memviewslice __pyx_v_charge = { 0, 0, { 0 }, { 0 }, { 0 } };
+  __pyx_t_5numpy_uint8_t *__pyx_v_charge_ptr;
   unsigned int __pyx_v_candidate_index;
   double __pyx_v_score;
   std::vector<std::pair<unsigned int,unsigned int> >  __pyx_v_peak_matches;
   PyObject *__pyx_v_candidate = NULL;
+  PyObject *__pyx_v_candidate_charge = NULL;
   PyObject *__pyx_v_index = NULL;
   PyObject *__pyx_v_annotation = NULL;
+  PyObject *__pyx_v_query_mz = NULL;
+  PyObject *__pyx_v_query_intensity = NULL;
   ann_solo::Spectrum *__pyx_v_query_spec;
   ann_solo::SpectrumMatcher *__pyx_v_query_matcher;
   ann_solo::SpectrumSpectrumMatch *__pyx_v_result;
@@ -2878,28 +2897,27 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
   Py_ssize_t __pyx_t_13;
   PyObject *(*__pyx_t_14)(PyObject *);
   __Pyx_memviewslice __pyx_t_15 = { 0, 0, { 0 }, { 0 }, { 0 } };
-  __Pyx_memviewslice __pyx_t_16 = { 0, 0, { 0 }, { 0 }, { 0 } };
-  unsigned int __pyx_t_17;
-  Py_ssize_t __pyx_t_18;
+  Py_ssize_t __pyx_t_16;
+  __Pyx_memviewslice __pyx_t_17 = { 0, 0, { 0 }, { 0 }, { 0 } };
+  unsigned int __pyx_t_18;
   Py_ssize_t __pyx_t_19;
-  Py_ssize_t __pyx_t_20;
-  ann_solo::Spectrum *__pyx_t_21;
-  ann_solo::SpectrumMatcher *__pyx_t_22;
+  ann_solo::Spectrum *__pyx_t_20;
+  ann_solo::SpectrumMatcher *__pyx_t_21;
+  std::vector<std::pair<unsigned int,unsigned int> > ::size_type __pyx_t_22;
   std::vector<std::pair<unsigned int,unsigned int> > ::size_type __pyx_t_23;
   std::vector<std::pair<unsigned int,unsigned int> > ::size_type __pyx_t_24;
-  std::vector<std::pair<unsigned int,unsigned int> > ::size_type __pyx_t_25;
+  int __pyx_t_25;
   int __pyx_t_26;
-  int __pyx_t_27;
-  char const *__pyx_t_28;
+  char const *__pyx_t_27;
+  PyObject *__pyx_t_28 = NULL;
   PyObject *__pyx_t_29 = NULL;
   PyObject *__pyx_t_30 = NULL;
   PyObject *__pyx_t_31 = NULL;
   PyObject *__pyx_t_32 = NULL;
   PyObject *__pyx_t_33 = NULL;
-  PyObject *__pyx_t_34 = NULL;
+  std::vector<ann_solo::Spectrum *> ::size_type __pyx_t_34;
   std::vector<ann_solo::Spectrum *> ::size_type __pyx_t_35;
   std::vector<ann_solo::Spectrum *> ::size_type __pyx_t_36;
-  std::vector<ann_solo::Spectrum *> ::size_type __pyx_t_37;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
@@ -2925,7 +2943,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
   __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_allow_shift); if (unlikely((__pyx_t_2 == ((bool)-1)) && PyErr_Occurred())) __PYX_ERR(0, 62, __pyx_L1_error)
   __pyx_v_allow_shift_c = __pyx_t_2;
 
-  /* "ann_solo/spectrum_match.pyx":71
+  /* "ann_solo/spectrum_match.pyx":72
  *     cdef vector[pair[uint, uint]] peak_matches
  * 
  *     try:             # <<<<<<<<<<<<<<
@@ -2934,37 +2952,37 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
  */
   /*try:*/ {
 
-    /* "ann_solo/spectrum_match.pyx":73
+    /* "ann_solo/spectrum_match.pyx":74
  *     try:
  *         # Convert the candidates.
  *         for candidate in candidates:             # <<<<<<<<<<<<<<
- *             if not hasattr(candidate, 'charge'):
- *                 candidate.charge = np.zeros_like(
+ *             # Library spectra can be matched against multiple queries
+ *             # concurrently, so their cached attributes are only assigned when
  */
     if (likely(PyList_CheckExact(__pyx_v_candidates)) || PyTuple_CheckExact(__pyx_v_candidates)) {
       __pyx_t_3 = __pyx_v_candidates; __Pyx_INCREF(__pyx_t_3); __pyx_t_4 = 0;
       __pyx_t_5 = NULL;
     } else {
-      __pyx_t_4 = -1; __pyx_t_3 = PyObject_GetIter(__pyx_v_candidates); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 73, __pyx_L4_error)
+      __pyx_t_4 = -1; __pyx_t_3 = PyObject_GetIter(__pyx_v_candidates); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 74, __pyx_L4_error)
       __Pyx_GOTREF(__pyx_t_3);
-      __pyx_t_5 = Py_TYPE(__pyx_t_3)->tp_iternext; if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 73, __pyx_L4_error)
+      __pyx_t_5 = Py_TYPE(__pyx_t_3)->tp_iternext; if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 74, __pyx_L4_error)
     }
     for (;;) {
       if (likely(!__pyx_t_5)) {
         if (likely(PyList_CheckExact(__pyx_t_3))) {
           if (__pyx_t_4 >= PyList_GET_SIZE(__pyx_t_3)) break;
           #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-          __pyx_t_6 = PyList_GET_ITEM(__pyx_t_3, __pyx_t_4); __Pyx_INCREF(__pyx_t_6); __pyx_t_4++; if (unlikely(0 < 0)) __PYX_ERR(0, 73, __pyx_L4_error)
+          __pyx_t_6 = PyList_GET_ITEM(__pyx_t_3, __pyx_t_4); __Pyx_INCREF(__pyx_t_6); __pyx_t_4++; if (unlikely(0 < 0)) __PYX_ERR(0, 74, __pyx_L4_error)
           #else
-          __pyx_t_6 = PySequence_ITEM(__pyx_t_3, __pyx_t_4); __pyx_t_4++; if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 73, __pyx_L4_error)
+          __pyx_t_6 = PySequence_ITEM(__pyx_t_3, __pyx_t_4); __pyx_t_4++; if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 74, __pyx_L4_error)
           __Pyx_GOTREF(__pyx_t_6);
           #endif
         } else {
           if (__pyx_t_4 >= PyTuple_GET_SIZE(__pyx_t_3)) break;
           #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-          __pyx_t_6 = PyTuple_GET_ITEM(__pyx_t_3, __pyx_t_4); __Pyx_INCREF(__pyx_t_6); __pyx_t_4++; if (unlikely(0 < 0)) __PYX_ERR(0, 73, __pyx_L4_error)
+          __pyx_t_6 = PyTuple_GET_ITEM(__pyx_t_3, __pyx_t_4); __Pyx_INCREF(__pyx_t_6); __pyx_t_4++; if (unlikely(0 < 0)) __PYX_ERR(0, 74, __pyx_L4_error)
           #else
-          __pyx_t_6 = PySequence_ITEM(__pyx_t_3, __pyx_t_4); __pyx_t_4++; if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 73, __pyx_L4_error)
+          __pyx_t_6 = PySequence_ITEM(__pyx_t_3, __pyx_t_4); __pyx_t_4++; if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 74, __pyx_L4_error)
           __Pyx_GOTREF(__pyx_t_6);
           #endif
         }
@@ -2974,7 +2992,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
           PyObject* exc_type = PyErr_Occurred();
           if (exc_type) {
             if (likely(__Pyx_PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration))) PyErr_Clear();
-            else __PYX_ERR(0, 73, __pyx_L4_error)
+            else __PYX_ERR(0, 74, __pyx_L4_error)
           }
           break;
         }
@@ -2983,539 +3001,617 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
       __Pyx_XDECREF_SET(__pyx_v_candidate, __pyx_t_6);
       __pyx_t_6 = 0;
 
-      /* "ann_solo/spectrum_match.pyx":74
- *         # Convert the candidates.
- *         for candidate in candidates:
- *             if not hasattr(candidate, 'charge'):             # <<<<<<<<<<<<<<
- *                 candidate.charge = np.zeros_like(
- *                     candidate.annotation, dtype=np.uint8)
+      /* "ann_solo/spectrum_match.pyx":79
+ *             # they are complete.
+ *             # The peak charges are only used for shifted peak matching.
+ *             charge_ptr = NULL             # <<<<<<<<<<<<<<
+ *             if allow_shift_c:
+ *                 if not hasattr(candidate, 'charge'):
+ */
+      __pyx_v_charge_ptr = NULL;
+
+      /* "ann_solo/spectrum_match.pyx":80
+ *             # The peak charges are only used for shifted peak matching.
+ *             charge_ptr = NULL
+ *             if allow_shift_c:             # <<<<<<<<<<<<<<
+ *                 if not hasattr(candidate, 'charge'):
+ *                     candidate_charge = np.zeros_like(
+ */
+      __pyx_t_7 = (__pyx_v_allow_shift_c != 0);
+      if (__pyx_t_7) {
+
+        /* "ann_solo/spectrum_match.pyx":81
+ *             charge_ptr = NULL
+ *             if allow_shift_c:
+ *                 if not hasattr(candidate, 'charge'):             # <<<<<<<<<<<<<<
+ *                     candidate_charge = np.zeros_like(
+ *                         candidate.annotation, dtype=np.uint8)
+ */
+        __pyx_t_7 = __Pyx_HasAttr(__pyx_v_candidate, __pyx_n_u_charge); if (unlikely(__pyx_t_7 == ((int)-1))) __PYX_ERR(0, 81, __pyx_L4_error)
+        __pyx_t_8 = ((!(__pyx_t_7 != 0)) != 0);
+        if (__pyx_t_8) {
+
+          /* "ann_solo/spectrum_match.pyx":82
+ *             if allow_shift_c:
+ *                 if not hasattr(candidate, 'charge'):
+ *                     candidate_charge = np.zeros_like(             # <<<<<<<<<<<<<<
+ *                         candidate.annotation, dtype=np.uint8)
+ *                     for index, annotation in enumerate(candidate.annotation):
+ */
+          __Pyx_GetModuleGlobalName(__pyx_t_6, __pyx_n_s_np); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 82, __pyx_L4_error)
+          __Pyx_GOTREF(__pyx_t_6);
+          __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_t_6, __pyx_n_s_zeros_like); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 82, __pyx_L4_error)
+          __Pyx_GOTREF(__pyx_t_9);
+          __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+
+          /* "ann_solo/spectrum_match.pyx":83
+ *                 if not hasattr(candidate, 'charge'):
+ *                     candidate_charge = np.zeros_like(
+ *                         candidate.annotation, dtype=np.uint8)             # <<<<<<<<<<<<<<
+ *                     for index, annotation in enumerate(candidate.annotation):
+ *                         if annotation is not None:
+ */
+          __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_annotation); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 83, __pyx_L4_error)
+          __Pyx_GOTREF(__pyx_t_6);
+
+          /* "ann_solo/spectrum_match.pyx":82
+ *             if allow_shift_c:
+ *                 if not hasattr(candidate, 'charge'):
+ *                     candidate_charge = np.zeros_like(             # <<<<<<<<<<<<<<
+ *                         candidate.annotation, dtype=np.uint8)
+ *                     for index, annotation in enumerate(candidate.annotation):
+ */
+          __pyx_t_10 = PyTuple_New(1); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 82, __pyx_L4_error)
+          __Pyx_GOTREF(__pyx_t_10);
+          __Pyx_GIVEREF(__pyx_t_6);
+          PyTuple_SET_ITEM(__pyx_t_10, 0, __pyx_t_6);
+          __pyx_t_6 = 0;
+
+          /* "ann_solo/spectrum_match.pyx":83
+ *                 if not hasattr(candidate, 'charge'):
+ *                     candidate_charge = np.zeros_like(
+ *                         candidate.annotation, dtype=np.uint8)             # <<<<<<<<<<<<<<
+ *                     for index, annotation in enumerate(candidate.annotation):
+ *                         if annotation is not None:
+ */
+          __pyx_t_6 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 83, __pyx_L4_error)
+          __Pyx_GOTREF(__pyx_t_6);
+          __Pyx_GetModuleGlobalName(__pyx_t_11, __pyx_n_s_np); if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 83, __pyx_L4_error)
+          __Pyx_GOTREF(__pyx_t_11);
+          __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_t_11, __pyx_n_s_uint8); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 83, __pyx_L4_error)
+          __Pyx_GOTREF(__pyx_t_12);
+          __Pyx_DECREF(__pyx_t_11); __pyx_t_11 = 0;
+          if (PyDict_SetItem(__pyx_t_6, __pyx_n_s_dtype, __pyx_t_12) < 0) __PYX_ERR(0, 83, __pyx_L4_error)
+          __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
+
+          /* "ann_solo/spectrum_match.pyx":82
+ *             if allow_shift_c:
+ *                 if not hasattr(candidate, 'charge'):
+ *                     candidate_charge = np.zeros_like(             # <<<<<<<<<<<<<<
+ *                         candidate.annotation, dtype=np.uint8)
+ *                     for index, annotation in enumerate(candidate.annotation):
+ */
+          __pyx_t_12 = __Pyx_PyObject_Call(__pyx_t_9, __pyx_t_10, __pyx_t_6); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 82, __pyx_L4_error)
+          __Pyx_GOTREF(__pyx_t_12);
+          __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+          __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
+          __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+          __Pyx_XDECREF_SET(__pyx_v_candidate_charge, __pyx_t_12);
+          __pyx_t_12 = 0;
+
+          /* "ann_solo/spectrum_match.pyx":84
+ *                     candidate_charge = np.zeros_like(
+ *                         candidate.annotation, dtype=np.uint8)
+ *                     for index, annotation in enumerate(candidate.annotation):             # <<<<<<<<<<<<<<
+ *                         if annotation is not None:
+ *                             candidate_charge[index] = annotation.charge
+ */
+          __Pyx_INCREF(__pyx_int_0);
+          __pyx_t_12 = __pyx_int_0;
+          __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_annotation); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 84, __pyx_L4_error)
+          __Pyx_GOTREF(__pyx_t_6);
+          if (likely(PyList_CheckExact(__pyx_t_6)) || PyTuple_CheckExact(__pyx_t_6)) {
+            __pyx_t_10 = __pyx_t_6; __Pyx_INCREF(__pyx_t_10); __pyx_t_13 = 0;
+            __pyx_t_14 = NULL;
+          } else {
+            __pyx_t_13 = -1; __pyx_t_10 = PyObject_GetIter(__pyx_t_6); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 84, __pyx_L4_error)
+            __Pyx_GOTREF(__pyx_t_10);
+            __pyx_t_14 = Py_TYPE(__pyx_t_10)->tp_iternext; if (unlikely(!__pyx_t_14)) __PYX_ERR(0, 84, __pyx_L4_error)
+          }
+          __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+          for (;;) {
+            if (likely(!__pyx_t_14)) {
+              if (likely(PyList_CheckExact(__pyx_t_10))) {
+                if (__pyx_t_13 >= PyList_GET_SIZE(__pyx_t_10)) break;
+                #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+                __pyx_t_6 = PyList_GET_ITEM(__pyx_t_10, __pyx_t_13); __Pyx_INCREF(__pyx_t_6); __pyx_t_13++; if (unlikely(0 < 0)) __PYX_ERR(0, 84, __pyx_L4_error)
+                #else
+                __pyx_t_6 = PySequence_ITEM(__pyx_t_10, __pyx_t_13); __pyx_t_13++; if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 84, __pyx_L4_error)
+                __Pyx_GOTREF(__pyx_t_6);
+                #endif
+              } else {
+                if (__pyx_t_13 >= PyTuple_GET_SIZE(__pyx_t_10)) break;
+                #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+                __pyx_t_6 = PyTuple_GET_ITEM(__pyx_t_10, __pyx_t_13); __Pyx_INCREF(__pyx_t_6); __pyx_t_13++; if (unlikely(0 < 0)) __PYX_ERR(0, 84, __pyx_L4_error)
+                #else
+                __pyx_t_6 = PySequence_ITEM(__pyx_t_10, __pyx_t_13); __pyx_t_13++; if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 84, __pyx_L4_error)
+                __Pyx_GOTREF(__pyx_t_6);
+                #endif
+              }
+            } else {
+              __pyx_t_6 = __pyx_t_14(__pyx_t_10);
+              if (unlikely(!__pyx_t_6)) {
+                PyObject* exc_type = PyErr_Occurred();
+                if (exc_type) {
+                  if (likely(__Pyx_PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration))) PyErr_Clear();
+                  else __PYX_ERR(0, 84, __pyx_L4_error)
+                }
+                break;
+              }
+              __Pyx_GOTREF(__pyx_t_6);
+            }
+            __Pyx_XDECREF_SET(__pyx_v_annotation, __pyx_t_6);
+            __pyx_t_6 = 0;
+            __Pyx_INCREF(__pyx_t_12);
+            __Pyx_XDECREF_SET(__pyx_v_index, __pyx_t_12);
+            __pyx_t_6 = __Pyx_PyInt_AddObjC(__pyx_t_12, __pyx_int_1, 1, 0, 0); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 84, __pyx_L4_error)
+            __Pyx_GOTREF(__pyx_t_6);
+            __Pyx_DECREF(__pyx_t_12);
+            __pyx_t_12 = __pyx_t_6;
+            __pyx_t_6 = 0;
+
+            /* "ann_solo/spectrum_match.pyx":85
+ *                         candidate.annotation, dtype=np.uint8)
+ *                     for index, annotation in enumerate(candidate.annotation):
+ *                         if annotation is not None:             # <<<<<<<<<<<<<<
+ *                             candidate_charge[index] = annotation.charge
+ *                     candidate.charge = candidate_charge
+ */
+            __pyx_t_8 = (__pyx_v_annotation != Py_None);
+            __pyx_t_7 = (__pyx_t_8 != 0);
+            if (__pyx_t_7) {
+
+              /* "ann_solo/spectrum_match.pyx":86
+ *                     for index, annotation in enumerate(candidate.annotation):
+ *                         if annotation is not None:
+ *                             candidate_charge[index] = annotation.charge             # <<<<<<<<<<<<<<
+ *                     candidate.charge = candidate_charge
+ *                 charge = candidate.charge
+ */
+              __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_annotation, __pyx_n_s_charge); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 86, __pyx_L4_error)
+              __Pyx_GOTREF(__pyx_t_6);
+              if (unlikely(PyObject_SetItem(__pyx_v_candidate_charge, __pyx_v_index, __pyx_t_6) < 0)) __PYX_ERR(0, 86, __pyx_L4_error)
+              __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+
+              /* "ann_solo/spectrum_match.pyx":85
+ *                         candidate.annotation, dtype=np.uint8)
+ *                     for index, annotation in enumerate(candidate.annotation):
+ *                         if annotation is not None:             # <<<<<<<<<<<<<<
+ *                             candidate_charge[index] = annotation.charge
+ *                     candidate.charge = candidate_charge
+ */
+            }
+
+            /* "ann_solo/spectrum_match.pyx":84
+ *                     candidate_charge = np.zeros_like(
+ *                         candidate.annotation, dtype=np.uint8)
+ *                     for index, annotation in enumerate(candidate.annotation):             # <<<<<<<<<<<<<<
+ *                         if annotation is not None:
+ *                             candidate_charge[index] = annotation.charge
+ */
+          }
+          __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
+          __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
+
+          /* "ann_solo/spectrum_match.pyx":87
+ *                         if annotation is not None:
+ *                             candidate_charge[index] = annotation.charge
+ *                     candidate.charge = candidate_charge             # <<<<<<<<<<<<<<
+ *                 charge = candidate.charge
+ *                 charge_ptr = &charge[0]
  */
-      __pyx_t_7 = __Pyx_HasAttr(__pyx_v_candidate, __pyx_n_u_charge); if (unlikely(__pyx_t_7 == ((int)-1))) __PYX_ERR(0, 74, __pyx_L4_error)
+          if (__Pyx_PyObject_SetAttrStr(__pyx_v_candidate, __pyx_n_s_charge, __pyx_v_candidate_charge) < 0) __PYX_ERR(0, 87, __pyx_L4_error)
+
+          /* "ann_solo/spectrum_match.pyx":81
+ *             charge_ptr = NULL
+ *             if allow_shift_c:
+ *                 if not hasattr(candidate, 'charge'):             # <<<<<<<<<<<<<<
+ *                     candidate_charge = np.zeros_like(
+ *                         candidate.annotation, dtype=np.uint8)
+ */
+        }
+
+        /* "ann_solo/spectrum_match.pyx":88
+ *                             candidate_charge[index] = annotation.charge
+ *                     candidate.charge = candidate_charge
+ *                 charge = candidate.charge             # <<<<<<<<<<<<<<
+ *                 charge_ptr = &charge[0]
+ *             # Library spectra are matched against many queries, so their
+ */
+        __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_charge); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 88, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_12);
+        __pyx_t_15 = __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_uint8_t(__pyx_t_12, PyBUF_WRITABLE); if (unlikely(!__pyx_t_15.memview)) __PYX_ERR(0, 88, __pyx_L4_error)
+        __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
+        __PYX_XDEC_MEMVIEW(&__pyx_v_charge, 1);
+        __pyx_v_charge = __pyx_t_15;
+        __pyx_t_15.memview = NULL;
+        __pyx_t_15.data = NULL;
+
+        /* "ann_solo/spectrum_match.pyx":89
+ *                     candidate.charge = candidate_charge
+ *                 charge = candidate.charge
+ *                 charge_ptr = &charge[0]             # <<<<<<<<<<<<<<
+ *             # Library spectra are matched against many queries, so their
+ *             # single-precision peaks are converted only once. This also keeps
+ */
+        __pyx_t_16 = 0;
+        __pyx_v_charge_ptr = (&(*((__pyx_t_5numpy_uint8_t *) ( /* dim=0 */ (__pyx_v_charge.data + __pyx_t_16 * __pyx_v_charge.strides[0]) ))));
+
+        /* "ann_solo/spectrum_match.pyx":80
+ *             # The peak charges are only used for shifted peak matching.
+ *             charge_ptr = NULL
+ *             if allow_shift_c:             # <<<<<<<<<<<<<<
+ *                 if not hasattr(candidate, 'charge'):
+ *                     candidate_charge = np.zeros_like(
+ */
+      }
+
+      /* "ann_solo/spectrum_match.pyx":94
+ *             # the peak arrays alive while they are referenced by the C++
+ *             # spectra.
+ *             if not hasattr(candidate, 'mz_float32'):             # <<<<<<<<<<<<<<
+ *                 candidate.intensity_float32 = candidate.intensity.astype(
+ *                     np.float32, copy=False)
+ */
+      __pyx_t_7 = __Pyx_HasAttr(__pyx_v_candidate, __pyx_n_u_mz_float32); if (unlikely(__pyx_t_7 == ((int)-1))) __PYX_ERR(0, 94, __pyx_L4_error)
       __pyx_t_8 = ((!(__pyx_t_7 != 0)) != 0);
       if (__pyx_t_8) {
 
-        /* "ann_solo/spectrum_match.pyx":75
- *         for candidate in candidates:
- *             if not hasattr(candidate, 'charge'):
- *                 candidate.charge = np.zeros_like(             # <<<<<<<<<<<<<<
- *                     candidate.annotation, dtype=np.uint8)
- *                 for index, annotation in enumerate(candidate.annotation):
+        /* "ann_solo/spectrum_match.pyx":95
+ *             # spectra.
+ *             if not hasattr(candidate, 'mz_float32'):
+ *                 candidate.intensity_float32 = candidate.intensity.astype(             # <<<<<<<<<<<<<<
+ *                     np.float32, copy=False)
+ *                 candidate.mz_float32 = candidate.mz.astype(np.float32)
  */
-        __Pyx_GetModuleGlobalName(__pyx_t_6, __pyx_n_s_np); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 75, __pyx_L4_error)
-        __Pyx_GOTREF(__pyx_t_6);
-        __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_t_6, __pyx_n_s_zeros_like); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 75, __pyx_L4_error)
-        __Pyx_GOTREF(__pyx_t_9);
-        __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+        __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_intensity); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 95, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_12);
+        __pyx_t_10 = __Pyx_PyObject_GetAttrStr(__pyx_t_12, __pyx_n_s_astype); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 95, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_10);
+        __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
 
-        /* "ann_solo/spectrum_match.pyx":76
- *             if not hasattr(candidate, 'charge'):
- *                 candidate.charge = np.zeros_like(
- *                     candidate.annotation, dtype=np.uint8)             # <<<<<<<<<<<<<<
- *                 for index, annotation in enumerate(candidate.annotation):
- *                     if annotation is not None:
+        /* "ann_solo/spectrum_match.pyx":96
+ *             if not hasattr(candidate, 'mz_float32'):
+ *                 candidate.intensity_float32 = candidate.intensity.astype(
+ *                     np.float32, copy=False)             # <<<<<<<<<<<<<<
+ *                 candidate.mz_float32 = candidate.mz.astype(np.float32)
+ *             mz = candidate.mz_float32
  */
-        __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_annotation); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 76, __pyx_L4_error)
+        __Pyx_GetModuleGlobalName(__pyx_t_12, __pyx_n_s_np); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 96, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_12);
+        __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_12, __pyx_n_s_float32); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 96, __pyx_L4_error)
         __Pyx_GOTREF(__pyx_t_6);
+        __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
 
-        /* "ann_solo/spectrum_match.pyx":75
- *         for candidate in candidates:
- *             if not hasattr(candidate, 'charge'):
- *                 candidate.charge = np.zeros_like(             # <<<<<<<<<<<<<<
- *                     candidate.annotation, dtype=np.uint8)
- *                 for index, annotation in enumerate(candidate.annotation):
+        /* "ann_solo/spectrum_match.pyx":95
+ *             # spectra.
+ *             if not hasattr(candidate, 'mz_float32'):
+ *                 candidate.intensity_float32 = candidate.intensity.astype(             # <<<<<<<<<<<<<<
+ *                     np.float32, copy=False)
+ *                 candidate.mz_float32 = candidate.mz.astype(np.float32)
  */
-        __pyx_t_10 = PyTuple_New(1); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 75, __pyx_L4_error)
-        __Pyx_GOTREF(__pyx_t_10);
+        __pyx_t_12 = PyTuple_New(1); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 95, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_12);
         __Pyx_GIVEREF(__pyx_t_6);
-        PyTuple_SET_ITEM(__pyx_t_10, 0, __pyx_t_6);
+        PyTuple_SET_ITEM(__pyx_t_12, 0, __pyx_t_6);
         __pyx_t_6 = 0;
 
-        /* "ann_solo/spectrum_match.pyx":76
- *             if not hasattr(candidate, 'charge'):
- *                 candidate.charge = np.zeros_like(
- *                     candidate.annotation, dtype=np.uint8)             # <<<<<<<<<<<<<<
- *                 for index, annotation in enumerate(candidate.annotation):
- *                     if annotation is not None:
+        /* "ann_solo/spectrum_match.pyx":96
+ *             if not hasattr(candidate, 'mz_float32'):
+ *                 candidate.intensity_float32 = candidate.intensity.astype(
+ *                     np.float32, copy=False)             # <<<<<<<<<<<<<<
+ *                 candidate.mz_float32 = candidate.mz.astype(np.float32)
+ *             mz = candidate.mz_float32
  */
-        __pyx_t_6 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 76, __pyx_L4_error)
+        __pyx_t_6 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 96, __pyx_L4_error)
         __Pyx_GOTREF(__pyx_t_6);
-        __Pyx_GetModuleGlobalName(__pyx_t_11, __pyx_n_s_np); if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 76, __pyx_L4_error)
-        __Pyx_GOTREF(__pyx_t_11);
-        __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_t_11, __pyx_n_s_uint8); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 76, __pyx_L4_error)
-        __Pyx_GOTREF(__pyx_t_12);
-        __Pyx_DECREF(__pyx_t_11); __pyx_t_11 = 0;
-        if (PyDict_SetItem(__pyx_t_6, __pyx_n_s_dtype, __pyx_t_12) < 0) __PYX_ERR(0, 76, __pyx_L4_error)
-        __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
+        if (PyDict_SetItem(__pyx_t_6, __pyx_n_s_copy, Py_False) < 0) __PYX_ERR(0, 96, __pyx_L4_error)
 
-        /* "ann_solo/spectrum_match.pyx":75
- *         for candidate in candidates:
- *             if not hasattr(candidate, 'charge'):
- *                 candidate.charge = np.zeros_like(             # <<<<<<<<<<<<<<
- *                     candidate.annotation, dtype=np.uint8)
- *                 for index, annotation in enumerate(candidate.annotation):
+        /* "ann_solo/spectrum_match.pyx":95
+ *             # spectra.
+ *             if not hasattr(candidate, 'mz_float32'):
+ *                 candidate.intensity_float32 = candidate.intensity.astype(             # <<<<<<<<<<<<<<
+ *                     np.float32, copy=False)
+ *                 candidate.mz_float32 = candidate.mz.astype(np.float32)
  */
-        __pyx_t_12 = __Pyx_PyObject_Call(__pyx_t_9, __pyx_t_10, __pyx_t_6); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 75, __pyx_L4_error)
-        __Pyx_GOTREF(__pyx_t_12);
-        __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+        __pyx_t_9 = __Pyx_PyObject_Call(__pyx_t_10, __pyx_t_12, __pyx_t_6); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 95, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_9);
         __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-        __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-        if (__Pyx_PyObject_SetAttrStr(__pyx_v_candidate, __pyx_n_s_charge, __pyx_t_12) < 0) __PYX_ERR(0, 75, __pyx_L4_error)
         __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
+        __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+        if (__Pyx_PyObject_SetAttrStr(__pyx_v_candidate, __pyx_n_s_intensity_float32, __pyx_t_9) < 0) __PYX_ERR(0, 95, __pyx_L4_error)
+        __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
 
-        /* "ann_solo/spectrum_match.pyx":77
- *                 candidate.charge = np.zeros_like(
- *                     candidate.annotation, dtype=np.uint8)
- *                 for index, annotation in enumerate(candidate.annotation):             # <<<<<<<<<<<<<<
- *                     if annotation is not None:
- *                         candidate.charge[index] = annotation.charge
+        /* "ann_solo/spectrum_match.pyx":97
+ *                 candidate.intensity_float32 = candidate.intensity.astype(
+ *                     np.float32, copy=False)
+ *                 candidate.mz_float32 = candidate.mz.astype(np.float32)             # <<<<<<<<<<<<<<
+ *             mz = candidate.mz_float32
+ *             intensity = candidate.intensity_float32
  */
-        __Pyx_INCREF(__pyx_int_0);
-        __pyx_t_12 = __pyx_int_0;
-        __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_annotation); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 77, __pyx_L4_error)
+        __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_mz); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 97, __pyx_L4_error)
         __Pyx_GOTREF(__pyx_t_6);
-        if (likely(PyList_CheckExact(__pyx_t_6)) || PyTuple_CheckExact(__pyx_t_6)) {
-          __pyx_t_10 = __pyx_t_6; __Pyx_INCREF(__pyx_t_10); __pyx_t_13 = 0;
-          __pyx_t_14 = NULL;
-        } else {
-          __pyx_t_13 = -1; __pyx_t_10 = PyObject_GetIter(__pyx_t_6); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 77, __pyx_L4_error)
-          __Pyx_GOTREF(__pyx_t_10);
-          __pyx_t_14 = Py_TYPE(__pyx_t_10)->tp_iternext; if (unlikely(!__pyx_t_14)) __PYX_ERR(0, 77, __pyx_L4_error)
-        }
+        __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_t_6, __pyx_n_s_astype); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 97, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_12);
         __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-        for (;;) {
-          if (likely(!__pyx_t_14)) {
-            if (likely(PyList_CheckExact(__pyx_t_10))) {
-              if (__pyx_t_13 >= PyList_GET_SIZE(__pyx_t_10)) break;
-              #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-              __pyx_t_6 = PyList_GET_ITEM(__pyx_t_10, __pyx_t_13); __Pyx_INCREF(__pyx_t_6); __pyx_t_13++; if (unlikely(0 < 0)) __PYX_ERR(0, 77, __pyx_L4_error)
-              #else
-              __pyx_t_6 = PySequence_ITEM(__pyx_t_10, __pyx_t_13); __pyx_t_13++; if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 77, __pyx_L4_error)
-              __Pyx_GOTREF(__pyx_t_6);
-              #endif
-            } else {
-              if (__pyx_t_13 >= PyTuple_GET_SIZE(__pyx_t_10)) break;
-              #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
-              __pyx_t_6 = PyTuple_GET_ITEM(__pyx_t_10, __pyx_t_13); __Pyx_INCREF(__pyx_t_6); __pyx_t_13++; if (unlikely(0 < 0)) __PYX_ERR(0, 77, __pyx_L4_error)
-              #else
-              __pyx_t_6 = PySequence_ITEM(__pyx_t_10, __pyx_t_13); __pyx_t_13++; if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 77, __pyx_L4_error)
-              __Pyx_GOTREF(__pyx_t_6);
-              #endif
-            }
-          } else {
-            __pyx_t_6 = __pyx_t_14(__pyx_t_10);
-            if (unlikely(!__pyx_t_6)) {
-              PyObject* exc_type = PyErr_Occurred();
-              if (exc_type) {
-                if (likely(__Pyx_PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration))) PyErr_Clear();
-                else __PYX_ERR(0, 77, __pyx_L4_error)
-              }
-              break;
-            }
-            __Pyx_GOTREF(__pyx_t_6);
-          }
-          __Pyx_XDECREF_SET(__pyx_v_annotation, __pyx_t_6);
-          __pyx_t_6 = 0;
-          __Pyx_INCREF(__pyx_t_12);
-          __Pyx_XDECREF_SET(__pyx_v_index, __pyx_t_12);
-          __pyx_t_6 = __Pyx_PyInt_AddObjC(__pyx_t_12, __pyx_int_1, 1, 0, 0); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 77, __pyx_L4_error)
-          __Pyx_GOTREF(__pyx_t_6);
-          __Pyx_DECREF(__pyx_t_12);
-          __pyx_t_12 = __pyx_t_6;
-          __pyx_t_6 = 0;
-
-          /* "ann_solo/spectrum_match.pyx":78
- *                     candidate.annotation, dtype=np.uint8)
- *                 for index, annotation in enumerate(candidate.annotation):
- *                     if annotation is not None:             # <<<<<<<<<<<<<<
- *                         candidate.charge[index] = annotation.charge
- *             mz = candidate.mz.astype(np.float32)
- */
-          __pyx_t_8 = (__pyx_v_annotation != Py_None);
-          __pyx_t_7 = (__pyx_t_8 != 0);
-          if (__pyx_t_7) {
-
-            /* "ann_solo/spectrum_match.pyx":79
- *                 for index, annotation in enumerate(candidate.annotation):
- *                     if annotation is not None:
- *                         candidate.charge[index] = annotation.charge             # <<<<<<<<<<<<<<
- *             mz = candidate.mz.astype(np.float32)
- *             intensity = candidate.intensity.astype(np.float32)
- */
-            __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_annotation, __pyx_n_s_charge); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 79, __pyx_L4_error)
-            __Pyx_GOTREF(__pyx_t_6);
-            __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_charge); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 79, __pyx_L4_error)
-            __Pyx_GOTREF(__pyx_t_9);
-            if (unlikely(PyObject_SetItem(__pyx_t_9, __pyx_v_index, __pyx_t_6) < 0)) __PYX_ERR(0, 79, __pyx_L4_error)
-            __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
-            __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-
-            /* "ann_solo/spectrum_match.pyx":78
- *                     candidate.annotation, dtype=np.uint8)
- *                 for index, annotation in enumerate(candidate.annotation):
- *                     if annotation is not None:             # <<<<<<<<<<<<<<
- *                         candidate.charge[index] = annotation.charge
- *             mz = candidate.mz.astype(np.float32)
- */
+        __Pyx_GetModuleGlobalName(__pyx_t_6, __pyx_n_s_np); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 97, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_6);
+        __pyx_t_10 = __Pyx_PyObject_GetAttrStr(__pyx_t_6, __pyx_n_s_float32); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 97, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_10);
+        __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+        __pyx_t_6 = NULL;
+        if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_12))) {
+          __pyx_t_6 = PyMethod_GET_SELF(__pyx_t_12);
+          if (likely(__pyx_t_6)) {
+            PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_12);
+            __Pyx_INCREF(__pyx_t_6);
+            __Pyx_INCREF(function);
+            __Pyx_DECREF_SET(__pyx_t_12, function);
           }
-
-          /* "ann_solo/spectrum_match.pyx":77
- *                 candidate.charge = np.zeros_like(
- *                     candidate.annotation, dtype=np.uint8)
- *                 for index, annotation in enumerate(candidate.annotation):             # <<<<<<<<<<<<<<
- *                     if annotation is not None:
- *                         candidate.charge[index] = annotation.charge
- */
         }
+        __pyx_t_9 = (__pyx_t_6) ? __Pyx_PyObject_Call2Args(__pyx_t_12, __pyx_t_6, __pyx_t_10) : __Pyx_PyObject_CallOneArg(__pyx_t_12, __pyx_t_10);
+        __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
         __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
+        if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 97, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_9);
         __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
+        if (__Pyx_PyObject_SetAttrStr(__pyx_v_candidate, __pyx_n_s_mz_float32, __pyx_t_9) < 0) __PYX_ERR(0, 97, __pyx_L4_error)
+        __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
 
-        /* "ann_solo/spectrum_match.pyx":74
- *         # Convert the candidates.
- *         for candidate in candidates:
- *             if not hasattr(candidate, 'charge'):             # <<<<<<<<<<<<<<
- *                 candidate.charge = np.zeros_like(
- *                     candidate.annotation, dtype=np.uint8)
+        /* "ann_solo/spectrum_match.pyx":94
+ *             # the peak arrays alive while they are referenced by the C++
+ *             # spectra.
+ *             if not hasattr(candidate, 'mz_float32'):             # <<<<<<<<<<<<<<
+ *                 candidate.intensity_float32 = candidate.intensity.astype(
+ *                     np.float32, copy=False)
  */
       }
 
-      /* "ann_solo/spectrum_match.pyx":80
- *                     if annotation is not None:
- *                         candidate.charge[index] = annotation.charge
- *             mz = candidate.mz.astype(np.float32)             # <<<<<<<<<<<<<<
- *             intensity = candidate.intensity.astype(np.float32)
- *             charge = candidate.charge
+      /* "ann_solo/spectrum_match.pyx":98
+ *                     np.float32, copy=False)
+ *                 candidate.mz_float32 = candidate.mz.astype(np.float32)
+ *             mz = candidate.mz_float32             # <<<<<<<<<<<<<<
+ *             intensity = candidate.intensity_float32
+ *             candidates_vec.push_back(new Spectrum(
  */
-      __pyx_t_10 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_mz); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 80, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_10);
-      __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_10, __pyx_n_s_astype); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 80, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_6);
-      __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-      __Pyx_GetModuleGlobalName(__pyx_t_10, __pyx_n_s_np); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 80, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_10);
-      __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_t_10, __pyx_n_s_float32); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 80, __pyx_L4_error)
+      __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_mz_float32); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 98, __pyx_L4_error)
       __Pyx_GOTREF(__pyx_t_9);
-      __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-      __pyx_t_10 = NULL;
-      if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_6))) {
-        __pyx_t_10 = PyMethod_GET_SELF(__pyx_t_6);
-        if (likely(__pyx_t_10)) {
-          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_6);
-          __Pyx_INCREF(__pyx_t_10);
-          __Pyx_INCREF(function);
-          __Pyx_DECREF_SET(__pyx_t_6, function);
-        }
-      }
-      __pyx_t_12 = (__pyx_t_10) ? __Pyx_PyObject_Call2Args(__pyx_t_6, __pyx_t_10, __pyx_t_9) : __Pyx_PyObject_CallOneArg(__pyx_t_6, __pyx_t_9);
-      __Pyx_XDECREF(__pyx_t_10); __pyx_t_10 = 0;
+      __pyx_t_17 = __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_float32_t(__pyx_t_9, PyBUF_WRITABLE); if (unlikely(!__pyx_t_17.memview)) __PYX_ERR(0, 98, __pyx_L4_error)
       __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
-      if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 80, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_12);
-      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-      __pyx_t_15 = __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_float32_t(__pyx_t_12, PyBUF_WRITABLE); if (unlikely(!__pyx_t_15.memview)) __PYX_ERR(0, 80, __pyx_L4_error)
-      __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
       __PYX_XDEC_MEMVIEW(&__pyx_v_mz, 1);
-      __pyx_v_mz = __pyx_t_15;
-      __pyx_t_15.memview = NULL;
-      __pyx_t_15.data = NULL;
-
-      /* "ann_solo/spectrum_match.pyx":81
- *                         candidate.charge[index] = annotation.charge
- *             mz = candidate.mz.astype(np.float32)
- *             intensity = candidate.intensity.astype(np.float32)             # <<<<<<<<<<<<<<
- *             charge = candidate.charge
+      __pyx_v_mz = __pyx_t_17;
+      __pyx_t_17.memview = NULL;
+      __pyx_t_17.data = NULL;
+
+      /* "ann_solo/spectrum_match.pyx":99
+ *                 candidate.mz_float32 = candidate.mz.astype(np.float32)
+ *             mz = candidate.mz_float32
+ *             intensity = candidate.intensity_float32             # <<<<<<<<<<<<<<
  *             candidates_vec.push_back(new Spectrum(
+ *                 candidate.precursor_mz, candidate.precursor_charge,
  */
-      __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_intensity); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 81, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_6);
-      __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_t_6, __pyx_n_s_astype); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 81, __pyx_L4_error)
+      __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_intensity_float32); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 99, __pyx_L4_error)
       __Pyx_GOTREF(__pyx_t_9);
-      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-      __Pyx_GetModuleGlobalName(__pyx_t_6, __pyx_n_s_np); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 81, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_6);
-      __pyx_t_10 = __Pyx_PyObject_GetAttrStr(__pyx_t_6, __pyx_n_s_float32); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 81, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_10);
-      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-      __pyx_t_6 = NULL;
-      if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_9))) {
-        __pyx_t_6 = PyMethod_GET_SELF(__pyx_t_9);
-        if (likely(__pyx_t_6)) {
-          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_9);
-          __Pyx_INCREF(__pyx_t_6);
-          __Pyx_INCREF(function);
-          __Pyx_DECREF_SET(__pyx_t_9, function);
-        }
-      }
-      __pyx_t_12 = (__pyx_t_6) ? __Pyx_PyObject_Call2Args(__pyx_t_9, __pyx_t_6, __pyx_t_10) : __Pyx_PyObject_CallOneArg(__pyx_t_9, __pyx_t_10);
-      __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
-      __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-      if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 81, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_12);
+      __pyx_t_17 = __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_float32_t(__pyx_t_9, PyBUF_WRITABLE); if (unlikely(!__pyx_t_17.memview)) __PYX_ERR(0, 99, __pyx_L4_error)
       __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
-      __pyx_t_15 = __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_float32_t(__pyx_t_12, PyBUF_WRITABLE); if (unlikely(!__pyx_t_15.memview)) __PYX_ERR(0, 81, __pyx_L4_error)
-      __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
       __PYX_XDEC_MEMVIEW(&__pyx_v_intensity, 1);
-      __pyx_v_intensity = __pyx_t_15;
-      __pyx_t_15.memview = NULL;
-      __pyx_t_15.data = NULL;
-
-      /* "ann_solo/spectrum_match.pyx":82
- *             mz = candidate.mz.astype(np.float32)
- *             intensity = candidate.intensity.astype(np.float32)
- *             charge = candidate.charge             # <<<<<<<<<<<<<<
- *             candidates_vec.push_back(new Spectrum(
- *                 candidate.precursor_mz, candidate.precursor_charge,
- */
-      __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_charge); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 82, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_12);
-      __pyx_t_16 = __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_uint8_t(__pyx_t_12, PyBUF_WRITABLE); if (unlikely(!__pyx_t_16.memview)) __PYX_ERR(0, 82, __pyx_L4_error)
-      __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
-      __PYX_XDEC_MEMVIEW(&__pyx_v_charge, 1);
-      __pyx_v_charge = __pyx_t_16;
-      __pyx_t_16.memview = NULL;
-      __pyx_t_16.data = NULL;
-
-      /* "ann_solo/spectrum_match.pyx":84
- *             charge = candidate.charge
+      __pyx_v_intensity = __pyx_t_17;
+      __pyx_t_17.memview = NULL;
+      __pyx_t_17.data = NULL;
+
+      /* "ann_solo/spectrum_match.pyx":101
+ *             intensity = candidate.intensity_float32
  *             candidates_vec.push_back(new Spectrum(
  *                 candidate.precursor_mz, candidate.precursor_charge,             # <<<<<<<<<<<<<<
- *                 len(candidate.mz), &mz[0], &intensity[0], &charge[0]))
- *         mz = query.mz.astype(np.float32)
- */
-      __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_precursor_mz); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 84, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_12);
-      __pyx_t_1 = __pyx_PyFloat_AsDouble(__pyx_t_12); if (unlikely((__pyx_t_1 == (double)-1) && PyErr_Occurred())) __PYX_ERR(0, 84, __pyx_L4_error)
-      __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
-      __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_precursor_charge); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 84, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_12);
-      __pyx_t_17 = __Pyx_PyInt_As_unsigned_int(__pyx_t_12); if (unlikely((__pyx_t_17 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 84, __pyx_L4_error)
-      __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
-
-      /* "ann_solo/spectrum_match.pyx":85
+ *                 len(candidate.mz), &mz[0], &intensity[0], charge_ptr))
+ *         query_mz = query.mz.astype(np.float32)
+ */
+      __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_precursor_mz); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 101, __pyx_L4_error)
+      __Pyx_GOTREF(__pyx_t_9);
+      __pyx_t_1 = __pyx_PyFloat_AsDouble(__pyx_t_9); if (unlikely((__pyx_t_1 == (double)-1) && PyErr_Occurred())) __PYX_ERR(0, 101, __pyx_L4_error)
+      __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+      __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_precursor_charge); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 101, __pyx_L4_error)
+      __Pyx_GOTREF(__pyx_t_9);
+      __pyx_t_18 = __Pyx_PyInt_As_unsigned_int(__pyx_t_9); if (unlikely((__pyx_t_18 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 101, __pyx_L4_error)
+      __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+
+      /* "ann_solo/spectrum_match.pyx":102
  *             candidates_vec.push_back(new Spectrum(
  *                 candidate.precursor_mz, candidate.precursor_charge,
- *                 len(candidate.mz), &mz[0], &intensity[0], &charge[0]))             # <<<<<<<<<<<<<<
- *         mz = query.mz.astype(np.float32)
- *         intensity = query.intensity.astype(np.float32)
- */
-      __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_mz); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 85, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_12);
-      __pyx_t_13 = PyObject_Length(__pyx_t_12); if (unlikely(__pyx_t_13 == ((Py_ssize_t)-1))) __PYX_ERR(0, 85, __pyx_L4_error)
-      __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
-      __pyx_t_18 = 0;
+ *                 len(candidate.mz), &mz[0], &intensity[0], charge_ptr))             # <<<<<<<<<<<<<<
+ *         query_mz = query.mz.astype(np.float32)
+ *         query_intensity = query.intensity.astype(np.float32, copy=False)
+ */
+      __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_v_candidate, __pyx_n_s_mz); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 102, __pyx_L4_error)
+      __Pyx_GOTREF(__pyx_t_9);
+      __pyx_t_13 = PyObject_Length(__pyx_t_9); if (unlikely(__pyx_t_13 == ((Py_ssize_t)-1))) __PYX_ERR(0, 102, __pyx_L4_error)
+      __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+      __pyx_t_16 = 0;
       __pyx_t_19 = 0;
-      __pyx_t_20 = 0;
 
-      /* "ann_solo/spectrum_match.pyx":83
- *             intensity = candidate.intensity.astype(np.float32)
- *             charge = candidate.charge
+      /* "ann_solo/spectrum_match.pyx":100
+ *             mz = candidate.mz_float32
+ *             intensity = candidate.intensity_float32
  *             candidates_vec.push_back(new Spectrum(             # <<<<<<<<<<<<<<
  *                 candidate.precursor_mz, candidate.precursor_charge,
- *                 len(candidate.mz), &mz[0], &intensity[0], &charge[0]))
+ *                 len(candidate.mz), &mz[0], &intensity[0], charge_ptr))
  */
       try {
-        __pyx_t_21 = new ann_solo::Spectrum(__pyx_t_1, __pyx_t_17, __pyx_t_13, (&(*((__pyx_t_5numpy_float32_t *) ( /* dim=0 */ (__pyx_v_mz.data + __pyx_t_18 * __pyx_v_mz.strides[0]) )))), (&(*((__pyx_t_5numpy_float32_t *) ( /* dim=0 */ (__pyx_v_intensity.data + __pyx_t_19 * __pyx_v_intensity.strides[0]) )))), (&(*((__pyx_t_5numpy_uint8_t *) ( /* dim=0 */ (__pyx_v_charge.data + __pyx_t_20 * __pyx_v_charge.strides[0]) )))));
+        __pyx_t_20 = new ann_solo::Spectrum(__pyx_t_1, __pyx_t_18, __pyx_t_13, (&(*((__pyx_t_5numpy_float32_t *) ( /* dim=0 */ (__pyx_v_mz.data + __pyx_t_16 * __pyx_v_mz.strides[0]) )))), (&(*((__pyx_t_5numpy_float32_t *) ( /* dim=0 */ (__pyx_v_intensity.data + __pyx_t_19 * __pyx_v_intensity.strides[0]) )))), __pyx_v_charge_ptr);
       } catch(...) {
         __Pyx_CppExn2PyErr();
-        __PYX_ERR(0, 83, __pyx_L4_error)
+        __PYX_ERR(0, 100, __pyx_L4_error)
       }
       try {
-        __pyx_v_candidates_vec.push_back(__pyx_t_21);
+        __pyx_v_candidates_vec.push_back(__pyx_t_20);
       } catch(...) {
         __Pyx_CppExn2PyErr();
-        __PYX_ERR(0, 83, __pyx_L4_error)
+        __PYX_ERR(0, 100, __pyx_L4_error)
       }
 
-      /* "ann_solo/spectrum_match.pyx":73
+      /* "ann_solo/spectrum_match.pyx":74
  *     try:
  *         # Convert the candidates.
  *         for candidate in candidates:             # <<<<<<<<<<<<<<
- *             if not hasattr(candidate, 'charge'):
- *                 candidate.charge = np.zeros_like(
+ *             # Library spectra can be matched against multiple queries
+ *             # concurrently, so their cached attributes are only assigned when
  */
     }
     __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
 
-    /* "ann_solo/spectrum_match.pyx":86
+    /* "ann_solo/spectrum_match.pyx":103
  *                 candidate.precursor_mz, candidate.precursor_charge,
- *                 len(candidate.mz), &mz[0], &intensity[0], &charge[0]))
- *         mz = query.mz.astype(np.float32)             # <<<<<<<<<<<<<<
- *         intensity = query.intensity.astype(np.float32)
- *         query.charge = np.zeros_like(query.mz, dtype=np.uint8)
+ *                 len(candidate.mz), &mz[0], &intensity[0], charge_ptr))
+ *         query_mz = query.mz.astype(np.float32)             # <<<<<<<<<<<<<<
+ *         query_intensity = query.intensity.astype(np.float32, copy=False)
+ *         mz = query_mz
  */
-    __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_v_query, __pyx_n_s_mz); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 86, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_12);
-    __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_t_12, __pyx_n_s_astype); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 86, __pyx_L4_error)
+    __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_v_query, __pyx_n_s_mz); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 103, __pyx_L4_error)
     __Pyx_GOTREF(__pyx_t_9);
-    __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
-    __Pyx_GetModuleGlobalName(__pyx_t_12, __pyx_n_s_np); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 86, __pyx_L4_error)
+    __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_t_9, __pyx_n_s_astype); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 103, __pyx_L4_error)
     __Pyx_GOTREF(__pyx_t_12);
-    __pyx_t_10 = __Pyx_PyObject_GetAttrStr(__pyx_t_12, __pyx_n_s_float32); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 86, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_10);
-    __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
-    __pyx_t_12 = NULL;
-    if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_9))) {
-      __pyx_t_12 = PyMethod_GET_SELF(__pyx_t_9);
-      if (likely(__pyx_t_12)) {
-        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_9);
-        __Pyx_INCREF(__pyx_t_12);
-        __Pyx_INCREF(function);
-        __Pyx_DECREF_SET(__pyx_t_9, function);
-      }
-    }
-    __pyx_t_3 = (__pyx_t_12) ? __Pyx_PyObject_Call2Args(__pyx_t_9, __pyx_t_12, __pyx_t_10) : __Pyx_PyObject_CallOneArg(__pyx_t_9, __pyx_t_10);
-    __Pyx_XDECREF(__pyx_t_12); __pyx_t_12 = 0;
-    __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-    if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 86, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_3);
     __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
-    __pyx_t_15 = __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_float32_t(__pyx_t_3, PyBUF_WRITABLE); if (unlikely(!__pyx_t_15.memview)) __PYX_ERR(0, 86, __pyx_L4_error)
-    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-    __PYX_XDEC_MEMVIEW(&__pyx_v_mz, 1);
-    __pyx_v_mz = __pyx_t_15;
-    __pyx_t_15.memview = NULL;
-    __pyx_t_15.data = NULL;
-
-    /* "ann_solo/spectrum_match.pyx":87
- *                 len(candidate.mz), &mz[0], &intensity[0], &charge[0]))
- *         mz = query.mz.astype(np.float32)
- *         intensity = query.intensity.astype(np.float32)             # <<<<<<<<<<<<<<
- *         query.charge = np.zeros_like(query.mz, dtype=np.uint8)
- *         charge = query.charge
- */
-    __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_v_query, __pyx_n_s_intensity); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 87, __pyx_L4_error)
+    __Pyx_GetModuleGlobalName(__pyx_t_9, __pyx_n_s_np); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 103, __pyx_L4_error)
     __Pyx_GOTREF(__pyx_t_9);
-    __pyx_t_10 = __Pyx_PyObject_GetAttrStr(__pyx_t_9, __pyx_n_s_astype); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 87, __pyx_L4_error)
+    __pyx_t_10 = __Pyx_PyObject_GetAttrStr(__pyx_t_9, __pyx_n_s_float32); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 103, __pyx_L4_error)
     __Pyx_GOTREF(__pyx_t_10);
     __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
-    __Pyx_GetModuleGlobalName(__pyx_t_9, __pyx_n_s_np); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 87, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_9);
-    __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_t_9, __pyx_n_s_float32); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 87, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_12);
-    __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
     __pyx_t_9 = NULL;
-    if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_10))) {
-      __pyx_t_9 = PyMethod_GET_SELF(__pyx_t_10);
+    if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_12))) {
+      __pyx_t_9 = PyMethod_GET_SELF(__pyx_t_12);
       if (likely(__pyx_t_9)) {
-        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_10);
+        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_12);
         __Pyx_INCREF(__pyx_t_9);
         __Pyx_INCREF(function);
-        __Pyx_DECREF_SET(__pyx_t_10, function);
+        __Pyx_DECREF_SET(__pyx_t_12, function);
       }
     }
-    __pyx_t_3 = (__pyx_t_9) ? __Pyx_PyObject_Call2Args(__pyx_t_10, __pyx_t_9, __pyx_t_12) : __Pyx_PyObject_CallOneArg(__pyx_t_10, __pyx_t_12);
+    __pyx_t_3 = (__pyx_t_9) ? __Pyx_PyObject_Call2Args(__pyx_t_12, __pyx_t_9, __pyx_t_10) : __Pyx_PyObject_CallOneArg(__pyx_t_12, __pyx_t_10);
     __Pyx_XDECREF(__pyx_t_9); __pyx_t_9 = 0;
+    __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
+    if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 103, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_3);
     __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
-    if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 87, __pyx_L4_error)
+    __pyx_v_query_mz = __pyx_t_3;
+    __pyx_t_3 = 0;
+
+    /* "ann_solo/spectrum_match.pyx":104
+ *                 len(candidate.mz), &mz[0], &intensity[0], charge_ptr))
+ *         query_mz = query.mz.astype(np.float32)
+ *         query_intensity = query.intensity.astype(np.float32, copy=False)             # <<<<<<<<<<<<<<
+ *         mz = query_mz
+ *         intensity = query_intensity
+ */
+    __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_v_query, __pyx_n_s_intensity); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 104, __pyx_L4_error)
     __Pyx_GOTREF(__pyx_t_3);
-    __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-    __pyx_t_15 = __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_float32_t(__pyx_t_3, PyBUF_WRITABLE); if (unlikely(!__pyx_t_15.memview)) __PYX_ERR(0, 87, __pyx_L4_error)
+    __pyx_t_12 = __Pyx_PyObject_GetAttrStr(__pyx_t_3, __pyx_n_s_astype); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 104, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_12);
     __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-    __PYX_XDEC_MEMVIEW(&__pyx_v_intensity, 1);
-    __pyx_v_intensity = __pyx_t_15;
-    __pyx_t_15.memview = NULL;
-    __pyx_t_15.data = NULL;
-
-    /* "ann_solo/spectrum_match.pyx":88
- *         mz = query.mz.astype(np.float32)
- *         intensity = query.intensity.astype(np.float32)
- *         query.charge = np.zeros_like(query.mz, dtype=np.uint8)             # <<<<<<<<<<<<<<
- *         charge = query.charge
- *         query_spec = new Spectrum(
- */
-    __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_np); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 88, __pyx_L4_error)
+    __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_np); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 104, __pyx_L4_error)
     __Pyx_GOTREF(__pyx_t_3);
-    __pyx_t_10 = __Pyx_PyObject_GetAttrStr(__pyx_t_3, __pyx_n_s_zeros_like); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 88, __pyx_L4_error)
+    __pyx_t_10 = __Pyx_PyObject_GetAttrStr(__pyx_t_3, __pyx_n_s_float32); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 104, __pyx_L4_error)
     __Pyx_GOTREF(__pyx_t_10);
     __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-    __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_v_query, __pyx_n_s_mz); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 88, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_3);
-    __pyx_t_12 = PyTuple_New(1); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 88, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_12);
-    __Pyx_GIVEREF(__pyx_t_3);
-    PyTuple_SET_ITEM(__pyx_t_12, 0, __pyx_t_3);
-    __pyx_t_3 = 0;
-    __pyx_t_3 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 88, __pyx_L4_error)
+    __pyx_t_3 = PyTuple_New(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 104, __pyx_L4_error)
     __Pyx_GOTREF(__pyx_t_3);
-    __Pyx_GetModuleGlobalName(__pyx_t_9, __pyx_n_s_np); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 88, __pyx_L4_error)
+    __Pyx_GIVEREF(__pyx_t_10);
+    PyTuple_SET_ITEM(__pyx_t_3, 0, __pyx_t_10);
+    __pyx_t_10 = 0;
+    __pyx_t_10 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 104, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_10);
+    if (PyDict_SetItem(__pyx_t_10, __pyx_n_s_copy, Py_False) < 0) __PYX_ERR(0, 104, __pyx_L4_error)
+    __pyx_t_9 = __Pyx_PyObject_Call(__pyx_t_12, __pyx_t_3, __pyx_t_10); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 104, __pyx_L4_error)
     __Pyx_GOTREF(__pyx_t_9);
-    __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_9, __pyx_n_s_uint8); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 88, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_6);
-    __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
-    if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_dtype, __pyx_t_6) < 0) __PYX_ERR(0, 88, __pyx_L4_error)
-    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-    __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_10, __pyx_t_12, __pyx_t_3); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 88, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_6);
-    __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
     __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
     __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-    if (__Pyx_PyObject_SetAttrStr(__pyx_v_query, __pyx_n_s_charge, __pyx_t_6) < 0) __PYX_ERR(0, 88, __pyx_L4_error)
-    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+    __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
+    __pyx_v_query_intensity = __pyx_t_9;
+    __pyx_t_9 = 0;
 
-    /* "ann_solo/spectrum_match.pyx":89
- *         intensity = query.intensity.astype(np.float32)
- *         query.charge = np.zeros_like(query.mz, dtype=np.uint8)
- *         charge = query.charge             # <<<<<<<<<<<<<<
- *         query_spec = new Spectrum(
- *             query.precursor_mz, query.precursor_charge, len(query.mz),
+    /* "ann_solo/spectrum_match.pyx":105
+ *         query_mz = query.mz.astype(np.float32)
+ *         query_intensity = query.intensity.astype(np.float32, copy=False)
+ *         mz = query_mz             # <<<<<<<<<<<<<<
+ *         intensity = query_intensity
+ *         # Only the candidate peaks are shifted, so the query peak charges are
  */
-    __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_query, __pyx_n_s_charge); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 89, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_6);
-    __pyx_t_16 = __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_uint8_t(__pyx_t_6, PyBUF_WRITABLE); if (unlikely(!__pyx_t_16.memview)) __PYX_ERR(0, 89, __pyx_L4_error)
-    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-    __PYX_XDEC_MEMVIEW(&__pyx_v_charge, 1);
-    __pyx_v_charge = __pyx_t_16;
-    __pyx_t_16.memview = NULL;
-    __pyx_t_16.data = NULL;
+    __pyx_t_17 = __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_float32_t(__pyx_v_query_mz, PyBUF_WRITABLE); if (unlikely(!__pyx_t_17.memview)) __PYX_ERR(0, 105, __pyx_L4_error)
+    __PYX_XDEC_MEMVIEW(&__pyx_v_mz, 1);
+    __pyx_v_mz = __pyx_t_17;
+    __pyx_t_17.memview = NULL;
+    __pyx_t_17.data = NULL;
+
+    /* "ann_solo/spectrum_match.pyx":106
+ *         query_intensity = query.intensity.astype(np.float32, copy=False)
+ *         mz = query_mz
+ *         intensity = query_intensity             # <<<<<<<<<<<<<<
+ *         # Only the candidate peaks are shifted, so the query peak charges are
+ *         # never used.
+ */
+    __pyx_t_17 = __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_float32_t(__pyx_v_query_intensity, PyBUF_WRITABLE); if (unlikely(!__pyx_t_17.memview)) __PYX_ERR(0, 106, __pyx_L4_error)
+    __PYX_XDEC_MEMVIEW(&__pyx_v_intensity, 1);
+    __pyx_v_intensity = __pyx_t_17;
+    __pyx_t_17.memview = NULL;
+    __pyx_t_17.data = NULL;
 
-    /* "ann_solo/spectrum_match.pyx":91
- *         charge = query.charge
+    /* "ann_solo/spectrum_match.pyx":110
+ *         # never used.
  *         query_spec = new Spectrum(
  *             query.precursor_mz, query.precursor_charge, len(query.mz),             # <<<<<<<<<<<<<<
- *             &mz[0], &intensity[0], &charge[0])
+ *             &mz[0], &intensity[0], NULL)
  *         with nogil:
  */
-    __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_query, __pyx_n_s_precursor_mz); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 91, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_6);
-    __pyx_t_1 = __pyx_PyFloat_AsDouble(__pyx_t_6); if (unlikely((__pyx_t_1 == (double)-1) && PyErr_Occurred())) __PYX_ERR(0, 91, __pyx_L4_error)
-    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-    __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_query, __pyx_n_s_precursor_charge); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 91, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_6);
-    __pyx_t_17 = __Pyx_PyInt_As_unsigned_int(__pyx_t_6); if (unlikely((__pyx_t_17 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 91, __pyx_L4_error)
-    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-    __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_query, __pyx_n_s_mz); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 91, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_6);
-    __pyx_t_4 = PyObject_Length(__pyx_t_6); if (unlikely(__pyx_t_4 == ((Py_ssize_t)-1))) __PYX_ERR(0, 91, __pyx_L4_error)
-    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+    __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_v_query, __pyx_n_s_precursor_mz); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 110, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_9);
+    __pyx_t_1 = __pyx_PyFloat_AsDouble(__pyx_t_9); if (unlikely((__pyx_t_1 == (double)-1) && PyErr_Occurred())) __PYX_ERR(0, 110, __pyx_L4_error)
+    __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+    __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_v_query, __pyx_n_s_precursor_charge); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 110, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_9);
+    __pyx_t_18 = __Pyx_PyInt_As_unsigned_int(__pyx_t_9); if (unlikely((__pyx_t_18 == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 110, __pyx_L4_error)
+    __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+    __pyx_t_9 = __Pyx_PyObject_GetAttrStr(__pyx_v_query, __pyx_n_s_mz); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 110, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_9);
+    __pyx_t_4 = PyObject_Length(__pyx_t_9); if (unlikely(__pyx_t_4 == ((Py_ssize_t)-1))) __PYX_ERR(0, 110, __pyx_L4_error)
+    __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
 
-    /* "ann_solo/spectrum_match.pyx":92
+    /* "ann_solo/spectrum_match.pyx":111
  *         query_spec = new Spectrum(
  *             query.precursor_mz, query.precursor_charge, len(query.mz),
- *             &mz[0], &intensity[0], &charge[0])             # <<<<<<<<<<<<<<
+ *             &mz[0], &intensity[0], NULL)             # <<<<<<<<<<<<<<
  *         with nogil:
  *             query_matcher = new SpectrumMatcher()
  */
-    __pyx_t_20 = 0;
     __pyx_t_19 = 0;
-    __pyx_t_18 = 0;
+    __pyx_t_16 = 0;
 
-    /* "ann_solo/spectrum_match.pyx":90
- *         query.charge = np.zeros_like(query.mz, dtype=np.uint8)
- *         charge = query.charge
+    /* "ann_solo/spectrum_match.pyx":109
+ *         # Only the candidate peaks are shifted, so the query peak charges are
+ *         # never used.
  *         query_spec = new Spectrum(             # <<<<<<<<<<<<<<
  *             query.precursor_mz, query.precursor_charge, len(query.mz),
- *             &mz[0], &intensity[0], &charge[0])
+ *             &mz[0], &intensity[0], NULL)
  */
     try {
-      __pyx_t_21 = new ann_solo::Spectrum(__pyx_t_1, __pyx_t_17, __pyx_t_4, (&(*((__pyx_t_5numpy_float32_t *) ( /* dim=0 */ (__pyx_v_mz.data + __pyx_t_20 * __pyx_v_mz.strides[0]) )))), (&(*((__pyx_t_5numpy_float32_t *) ( /* dim=0 */ (__pyx_v_intensity.data + __pyx_t_19 * __pyx_v_intensity.strides[0]) )))), (&(*((__pyx_t_5numpy_uint8_t *) ( /* dim=0 */ (__pyx_v_charge.data + __pyx_t_18 * __pyx_v_charge.strides[0]) )))));
+      __pyx_t_20 = new ann_solo::Spectrum(__pyx_t_1, __pyx_t_18, __pyx_t_4, (&(*((__pyx_t_5numpy_float32_t *) ( /* dim=0 */ (__pyx_v_mz.data + __pyx_t_19 * __pyx_v_mz.strides[0]) )))), (&(*((__pyx_t_5numpy_float32_t *) ( /* dim=0 */ (__pyx_v_intensity.data + __pyx_t_16 * __pyx_v_intensity.strides[0]) )))), NULL);
     } catch(...) {
       __Pyx_CppExn2PyErr();
-      __PYX_ERR(0, 90, __pyx_L4_error)
+      __PYX_ERR(0, 109, __pyx_L4_error)
     }
-    __pyx_v_query_spec = __pyx_t_21;
+    __pyx_v_query_spec = __pyx_t_20;
 
-    /* "ann_solo/spectrum_match.pyx":93
+    /* "ann_solo/spectrum_match.pyx":112
  *             query.precursor_mz, query.precursor_charge, len(query.mz),
- *             &mz[0], &intensity[0], &charge[0])
+ *             &mz[0], &intensity[0], NULL)
  *         with nogil:             # <<<<<<<<<<<<<<
  *             query_matcher = new SpectrumMatcher()
  *             result = query_matcher.dot(query_spec, candidates_vec,
@@ -3528,15 +3624,15 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
         #endif
         /*try:*/ {
 
-          /* "ann_solo/spectrum_match.pyx":94
- *             &mz[0], &intensity[0], &charge[0])
+          /* "ann_solo/spectrum_match.pyx":113
+ *             &mz[0], &intensity[0], NULL)
  *         with nogil:
  *             query_matcher = new SpectrumMatcher()             # <<<<<<<<<<<<<<
  *             result = query_matcher.dot(query_spec, candidates_vec,
  *                                        fragment_mz_tolerance_c, allow_shift_c)
  */
           try {
-            __pyx_t_22 = new ann_solo::SpectrumMatcher();
+            __pyx_t_21 = new ann_solo::SpectrumMatcher();
           } catch(...) {
             #ifdef WITH_THREAD
             PyGILState_STATE __pyx_gilstate_save = __Pyx_PyGILState_Ensure();
@@ -3545,11 +3641,11 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
             #ifdef WITH_THREAD
             __Pyx_PyGILState_Release(__pyx_gilstate_save);
             #endif
-            __PYX_ERR(0, 94, __pyx_L13_error)
+            __PYX_ERR(0, 113, __pyx_L15_error)
           }
-          __pyx_v_query_matcher = __pyx_t_22;
+          __pyx_v_query_matcher = __pyx_t_21;
 
-          /* "ann_solo/spectrum_match.pyx":95
+          /* "ann_solo/spectrum_match.pyx":114
  *         with nogil:
  *             query_matcher = new SpectrumMatcher()
  *             result = query_matcher.dot(query_spec, candidates_vec,             # <<<<<<<<<<<<<<
@@ -3558,7 +3654,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
  */
           __pyx_v_result = __pyx_v_query_matcher->dot(__pyx_v_query_spec, __pyx_v_candidates_vec, __pyx_v_fragment_mz_tolerance_c, __pyx_v_allow_shift_c);
 
-          /* "ann_solo/spectrum_match.pyx":97
+          /* "ann_solo/spectrum_match.pyx":116
  *             result = query_matcher.dot(query_spec, candidates_vec,
  *                                        fragment_mz_tolerance_c, allow_shift_c)
  *             candidate_index = result.getCandidateIndex()             # <<<<<<<<<<<<<<
@@ -3567,7 +3663,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
  */
           __pyx_v_candidate_index = __pyx_v_result->getCandidateIndex();
 
-          /* "ann_solo/spectrum_match.pyx":98
+          /* "ann_solo/spectrum_match.pyx":117
  *                                        fragment_mz_tolerance_c, allow_shift_c)
  *             candidate_index = result.getCandidateIndex()
  *             score = result.getScore()             # <<<<<<<<<<<<<<
@@ -3576,7 +3672,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
  */
           __pyx_v_score = __pyx_v_result->getScore();
 
-          /* "ann_solo/spectrum_match.pyx":99
+          /* "ann_solo/spectrum_match.pyx":118
  *             candidate_index = result.getCandidateIndex()
  *             score = result.getScore()
  *             peak_matches = result.getPeakMatches()[0]             # <<<<<<<<<<<<<<
@@ -3586,9 +3682,9 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
           __pyx_v_peak_matches = (__pyx_v_result->getPeakMatches()[0]);
         }
 
-        /* "ann_solo/spectrum_match.pyx":93
+        /* "ann_solo/spectrum_match.pyx":112
  *             query.precursor_mz, query.precursor_charge, len(query.mz),
- *             &mz[0], &intensity[0], &charge[0])
+ *             &mz[0], &intensity[0], NULL)
  *         with nogil:             # <<<<<<<<<<<<<<
  *             query_matcher = new SpectrumMatcher()
  *             result = query_matcher.dot(query_spec, candidates_vec,
@@ -3599,20 +3695,20 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
             __Pyx_FastGIL_Forget();
             Py_BLOCK_THREADS
             #endif
-            goto __pyx_L14;
+            goto __pyx_L16;
           }
-          __pyx_L13_error: {
+          __pyx_L15_error: {
             #ifdef WITH_THREAD
             __Pyx_FastGIL_Forget();
             Py_BLOCK_THREADS
             #endif
             goto __pyx_L4_error;
           }
-          __pyx_L14:;
+          __pyx_L16:;
         }
     }
 
-    /* "ann_solo/spectrum_match.pyx":100
+    /* "ann_solo/spectrum_match.pyx":119
  *             score = result.getScore()
  *             peak_matches = result.getPeakMatches()[0]
  *         return (candidates[candidate_index], score,             # <<<<<<<<<<<<<<
@@ -3620,56 +3716,56 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
  *     finally:
  */
     __Pyx_XDECREF(__pyx_r);
-    __pyx_t_6 = __Pyx_GetItemInt(__pyx_v_candidates, __pyx_v_candidate_index, unsigned int, 0, __Pyx_PyInt_From_unsigned_int, 0, 0, 0); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 100, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_6);
-    __pyx_t_3 = PyFloat_FromDouble(__pyx_v_score); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 100, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_3);
+    __pyx_t_9 = __Pyx_GetItemInt(__pyx_v_candidates, __pyx_v_candidate_index, unsigned int, 0, __Pyx_PyInt_From_unsigned_int, 0, 0, 0); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 119, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_9);
+    __pyx_t_10 = PyFloat_FromDouble(__pyx_v_score); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 119, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_10);
     { /* enter inner scope */
 
-      /* "ann_solo/spectrum_match.pyx":101
+      /* "ann_solo/spectrum_match.pyx":120
  *             peak_matches = result.getPeakMatches()[0]
  *         return (candidates[candidate_index], score,
  *                 [peak_matches[i] for i in range(peak_matches.size())])             # <<<<<<<<<<<<<<
  *     finally:
  *         for i in range(candidates_vec.size()):
  */
-      __pyx_t_12 = PyList_New(0); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 101, __pyx_L4_error)
-      __Pyx_GOTREF(__pyx_t_12);
-      __pyx_t_23 = __pyx_v_peak_matches.size();
-      __pyx_t_24 = __pyx_t_23;
-      for (__pyx_t_25 = 0; __pyx_t_25 < __pyx_t_24; __pyx_t_25+=1) {
-        __pyx_7genexpr__pyx_v_i = __pyx_t_25;
-        __pyx_t_10 = __pyx_convert_pair_to_py_unsigned_int____unsigned_int((__pyx_v_peak_matches[__pyx_7genexpr__pyx_v_i])); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 101, __pyx_L4_error)
-        __Pyx_GOTREF(__pyx_t_10);
-        if (unlikely(__Pyx_ListComp_Append(__pyx_t_12, (PyObject*)__pyx_t_10))) __PYX_ERR(0, 101, __pyx_L4_error)
-        __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
+      __pyx_t_3 = PyList_New(0); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 120, __pyx_L4_error)
+      __Pyx_GOTREF(__pyx_t_3);
+      __pyx_t_22 = __pyx_v_peak_matches.size();
+      __pyx_t_23 = __pyx_t_22;
+      for (__pyx_t_24 = 0; __pyx_t_24 < __pyx_t_23; __pyx_t_24+=1) {
+        __pyx_7genexpr__pyx_v_i = __pyx_t_24;
+        __pyx_t_12 = __pyx_convert_pair_to_py_unsigned_int____unsigned_int((__pyx_v_peak_matches[__pyx_7genexpr__pyx_v_i])); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 120, __pyx_L4_error)
+        __Pyx_GOTREF(__pyx_t_12);
+        if (unlikely(__Pyx_ListComp_Append(__pyx_t_3, (PyObject*)__pyx_t_12))) __PYX_ERR(0, 120, __pyx_L4_error)
+        __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
       }
     } /* exit inner scope */
 
-    /* "ann_solo/spectrum_match.pyx":100
+    /* "ann_solo/spectrum_match.pyx":119
  *             score = result.getScore()
  *             peak_matches = result.getPeakMatches()[0]
  *         return (candidates[candidate_index], score,             # <<<<<<<<<<<<<<
  *                 [peak_matches[i] for i in range(peak_matches.size())])
  *     finally:
  */
-    __pyx_t_10 = PyTuple_New(3); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 100, __pyx_L4_error)
-    __Pyx_GOTREF(__pyx_t_10);
-    __Pyx_GIVEREF(__pyx_t_6);
-    PyTuple_SET_ITEM(__pyx_t_10, 0, __pyx_t_6);
+    __pyx_t_12 = PyTuple_New(3); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 119, __pyx_L4_error)
+    __Pyx_GOTREF(__pyx_t_12);
+    __Pyx_GIVEREF(__pyx_t_9);
+    PyTuple_SET_ITEM(__pyx_t_12, 0, __pyx_t_9);
+    __Pyx_GIVEREF(__pyx_t_10);
+    PyTuple_SET_ITEM(__pyx_t_12, 1, __pyx_t_10);
     __Pyx_GIVEREF(__pyx_t_3);
-    PyTuple_SET_ITEM(__pyx_t_10, 1, __pyx_t_3);
-    __Pyx_GIVEREF(__pyx_t_12);
-    PyTuple_SET_ITEM(__pyx_t_10, 2, __pyx_t_12);
-    __pyx_t_6 = 0;
+    PyTuple_SET_ITEM(__pyx_t_12, 2, __pyx_t_3);
+    __pyx_t_9 = 0;
+    __pyx_t_10 = 0;
     __pyx_t_3 = 0;
+    __pyx_r = __pyx_t_12;
     __pyx_t_12 = 0;
-    __pyx_r = __pyx_t_10;
-    __pyx_t_10 = 0;
     goto __pyx_L3_return;
   }
 
-  /* "ann_solo/spectrum_match.pyx":103
+  /* "ann_solo/spectrum_match.pyx":122
  *                 [peak_matches[i] for i in range(peak_matches.size())])
  *     finally:
  *         for i in range(candidates_vec.size()):             # <<<<<<<<<<<<<<
@@ -3681,31 +3777,31 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
     /*exception exit:*/{
       __Pyx_PyThreadState_declare
       __Pyx_PyThreadState_assign
-      __pyx_t_29 = 0; __pyx_t_30 = 0; __pyx_t_31 = 0; __pyx_t_32 = 0; __pyx_t_33 = 0; __pyx_t_34 = 0;
+      __pyx_t_28 = 0; __pyx_t_29 = 0; __pyx_t_30 = 0; __pyx_t_31 = 0; __pyx_t_32 = 0; __pyx_t_33 = 0;
       __Pyx_XDECREF(__pyx_t_10); __pyx_t_10 = 0;
       __Pyx_XDECREF(__pyx_t_11); __pyx_t_11 = 0;
       __Pyx_XDECREF(__pyx_t_12); __pyx_t_12 = 0;
       __PYX_XDEC_MEMVIEW(&__pyx_t_15, 1);
-      __PYX_XDEC_MEMVIEW(&__pyx_t_16, 1);
+      __PYX_XDEC_MEMVIEW(&__pyx_t_17, 1);
       __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
       __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
       __Pyx_XDECREF(__pyx_t_9); __pyx_t_9 = 0;
-      if (PY_MAJOR_VERSION >= 3) __Pyx_ExceptionSwap(&__pyx_t_32, &__pyx_t_33, &__pyx_t_34);
-      if ((PY_MAJOR_VERSION < 3) || unlikely(__Pyx_GetException(&__pyx_t_29, &__pyx_t_30, &__pyx_t_31) < 0)) __Pyx_ErrFetch(&__pyx_t_29, &__pyx_t_30, &__pyx_t_31);
+      if (PY_MAJOR_VERSION >= 3) __Pyx_ExceptionSwap(&__pyx_t_31, &__pyx_t_32, &__pyx_t_33);
+      if ((PY_MAJOR_VERSION < 3) || unlikely(__Pyx_GetException(&__pyx_t_28, &__pyx_t_29, &__pyx_t_30) < 0)) __Pyx_ErrFetch(&__pyx_t_28, &__pyx_t_29, &__pyx_t_30);
+      __Pyx_XGOTREF(__pyx_t_28);
       __Pyx_XGOTREF(__pyx_t_29);
       __Pyx_XGOTREF(__pyx_t_30);
       __Pyx_XGOTREF(__pyx_t_31);
       __Pyx_XGOTREF(__pyx_t_32);
       __Pyx_XGOTREF(__pyx_t_33);
-      __Pyx_XGOTREF(__pyx_t_34);
-      __pyx_t_26 = __pyx_lineno; __pyx_t_27 = __pyx_clineno; __pyx_t_28 = __pyx_filename;
+      __pyx_t_25 = __pyx_lineno; __pyx_t_26 = __pyx_clineno; __pyx_t_27 = __pyx_filename;
       {
-        __pyx_t_35 = __pyx_v_candidates_vec.size();
-        __pyx_t_36 = __pyx_t_35;
-        for (__pyx_t_37 = 0; __pyx_t_37 < __pyx_t_36; __pyx_t_37+=1) {
-          __pyx_v_i = __pyx_t_37;
+        __pyx_t_34 = __pyx_v_candidates_vec.size();
+        __pyx_t_35 = __pyx_t_34;
+        for (__pyx_t_36 = 0; __pyx_t_36 < __pyx_t_35; __pyx_t_36+=1) {
+          __pyx_v_i = __pyx_t_36;
 
-          /* "ann_solo/spectrum_match.pyx":104
+          /* "ann_solo/spectrum_match.pyx":123
  *     finally:
  *         for i in range(candidates_vec.size()):
  *             del candidates_vec[i]             # <<<<<<<<<<<<<<
@@ -3715,7 +3811,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
           delete (__pyx_v_candidates_vec[__pyx_v_i]);
         }
 
-        /* "ann_solo/spectrum_match.pyx":105
+        /* "ann_solo/spectrum_match.pyx":124
  *         for i in range(candidates_vec.size()):
  *             del candidates_vec[i]
  *         candidates_vec.clear()             # <<<<<<<<<<<<<<
@@ -3724,7 +3820,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
  */
         __pyx_v_candidates_vec.clear();
 
-        /* "ann_solo/spectrum_match.pyx":106
+        /* "ann_solo/spectrum_match.pyx":125
  *             del candidates_vec[i]
  *         candidates_vec.clear()
  *         del query_spec             # <<<<<<<<<<<<<<
@@ -3733,7 +3829,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
  */
         delete __pyx_v_query_spec;
 
-        /* "ann_solo/spectrum_match.pyx":107
+        /* "ann_solo/spectrum_match.pyx":126
  *         candidates_vec.clear()
  *         del query_spec
  *         del query_matcher             # <<<<<<<<<<<<<<
@@ -3741,7 +3837,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
  */
         delete __pyx_v_query_matcher;
 
-        /* "ann_solo/spectrum_match.pyx":108
+        /* "ann_solo/spectrum_match.pyx":127
  *         del query_spec
  *         del query_matcher
  *         del result             # <<<<<<<<<<<<<<
@@ -3749,36 +3845,36 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
         delete __pyx_v_result;
       }
       if (PY_MAJOR_VERSION >= 3) {
+        __Pyx_XGIVEREF(__pyx_t_31);
         __Pyx_XGIVEREF(__pyx_t_32);
         __Pyx_XGIVEREF(__pyx_t_33);
-        __Pyx_XGIVEREF(__pyx_t_34);
-        __Pyx_ExceptionReset(__pyx_t_32, __pyx_t_33, __pyx_t_34);
+        __Pyx_ExceptionReset(__pyx_t_31, __pyx_t_32, __pyx_t_33);
       }
+      __Pyx_XGIVEREF(__pyx_t_28);
       __Pyx_XGIVEREF(__pyx_t_29);
       __Pyx_XGIVEREF(__pyx_t_30);
-      __Pyx_XGIVEREF(__pyx_t_31);
-      __Pyx_ErrRestore(__pyx_t_29, __pyx_t_30, __pyx_t_31);
-      __pyx_t_29 = 0; __pyx_t_30 = 0; __pyx_t_31 = 0; __pyx_t_32 = 0; __pyx_t_33 = 0; __pyx_t_34 = 0;
-      __pyx_lineno = __pyx_t_26; __pyx_clineno = __pyx_t_27; __pyx_filename = __pyx_t_28;
+      __Pyx_ErrRestore(__pyx_t_28, __pyx_t_29, __pyx_t_30);
+      __pyx_t_28 = 0; __pyx_t_29 = 0; __pyx_t_30 = 0; __pyx_t_31 = 0; __pyx_t_32 = 0; __pyx_t_33 = 0;
+      __pyx_lineno = __pyx_t_25; __pyx_clineno = __pyx_t_26; __pyx_filename = __pyx_t_27;
       goto __pyx_L1_error;
     }
     __pyx_L3_return: {
-      __pyx_t_34 = __pyx_r;
+      __pyx_t_33 = __pyx_r;
       __pyx_r = 0;
 
-      /* "ann_solo/spectrum_match.pyx":103
+      /* "ann_solo/spectrum_match.pyx":122
  *                 [peak_matches[i] for i in range(peak_matches.size())])
  *     finally:
  *         for i in range(candidates_vec.size()):             # <<<<<<<<<<<<<<
  *             del candidates_vec[i]
  *         candidates_vec.clear()
  */
-      __pyx_t_35 = __pyx_v_candidates_vec.size();
-      __pyx_t_36 = __pyx_t_35;
-      for (__pyx_t_37 = 0; __pyx_t_37 < __pyx_t_36; __pyx_t_37+=1) {
-        __pyx_v_i = __pyx_t_37;
+      __pyx_t_34 = __pyx_v_candidates_vec.size();
+      __pyx_t_35 = __pyx_t_34;
+      for (__pyx_t_36 = 0; __pyx_t_36 < __pyx_t_35; __pyx_t_36+=1) {
+        __pyx_v_i = __pyx_t_36;
 
-        /* "ann_solo/spectrum_match.pyx":104
+        /* "ann_solo/spectrum_match.pyx":123
  *     finally:
  *         for i in range(candidates_vec.size()):
  *             del candidates_vec[i]             # <<<<<<<<<<<<<<
@@ -3788,7 +3884,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
         delete (__pyx_v_candidates_vec[__pyx_v_i]);
       }
 
-      /* "ann_solo/spectrum_match.pyx":105
+      /* "ann_solo/spectrum_match.pyx":124
  *         for i in range(candidates_vec.size()):
  *             del candidates_vec[i]
  *         candidates_vec.clear()             # <<<<<<<<<<<<<<
@@ -3797,7 +3893,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
  */
       __pyx_v_candidates_vec.clear();
 
-      /* "ann_solo/spectrum_match.pyx":106
+      /* "ann_solo/spectrum_match.pyx":125
  *             del candidates_vec[i]
  *         candidates_vec.clear()
  *         del query_spec             # <<<<<<<<<<<<<<
@@ -3806,7 +3902,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
  */
       delete __pyx_v_query_spec;
 
-      /* "ann_solo/spectrum_match.pyx":107
+      /* "ann_solo/spectrum_match.pyx":126
  *         candidates_vec.clear()
  *         del query_spec
  *         del query_matcher             # <<<<<<<<<<<<<<
@@ -3814,14 +3910,14 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
  */
       delete __pyx_v_query_matcher;
 
-      /* "ann_solo/spectrum_match.pyx":108
+      /* "ann_solo/spectrum_match.pyx":127
  *         del query_spec
  *         del query_matcher
  *         del result             # <<<<<<<<<<<<<<
  */
       delete __pyx_v_result;
-      __pyx_r = __pyx_t_34;
-      __pyx_t_34 = 0;
+      __pyx_r = __pyx_t_33;
+      __pyx_t_33 = 0;
       goto __pyx_L0;
     }
   }
@@ -3843,7 +3939,7 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
   __Pyx_XDECREF(__pyx_t_11);
   __Pyx_XDECREF(__pyx_t_12);
   __PYX_XDEC_MEMVIEW(&__pyx_t_15, 1);
-  __PYX_XDEC_MEMVIEW(&__pyx_t_16, 1);
+  __PYX_XDEC_MEMVIEW(&__pyx_t_17, 1);
   __Pyx_AddTraceback("ann_solo.spectrum_match.get_best_match", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __pyx_r = NULL;
   __pyx_L0:;
@@ -3851,14 +3947,17 @@ static PyObject *__pyx_pf_8ann_solo_14spectrum_match_get_best_match(CYTHON_UNUSE
   __PYX_XDEC_MEMVIEW(&__pyx_v_intensity, 1);
   __PYX_XDEC_MEMVIEW(&__pyx_v_charge, 1);
   __Pyx_XDECREF(__pyx_v_candidate);
+  __Pyx_XDECREF(__pyx_v_candidate_charge);
   __Pyx_XDECREF(__pyx_v_index);
   __Pyx_XDECREF(__pyx_v_annotation);
+  __Pyx_XDECREF(__pyx_v_query_mz);
+  __Pyx_XDECREF(__pyx_v_query_intensity);
   __Pyx_XGIVEREF(__pyx_r);
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":735
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":734
  * ctypedef npy_cdouble     complex_t
  * 
  * cdef inline object PyArray_MultiIterNew1(a):             # <<<<<<<<<<<<<<
@@ -3875,7 +3974,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew1(PyObject *__
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("PyArray_MultiIterNew1", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":736
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":735
  * 
  * cdef inline object PyArray_MultiIterNew1(a):
  *     return PyArray_MultiIterNew(1, <void*>a)             # <<<<<<<<<<<<<<
@@ -3883,13 +3982,13 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew1(PyObject *__
  * cdef inline object PyArray_MultiIterNew2(a, b):
  */
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = PyArray_MultiIterNew(1, ((void *)__pyx_v_a)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 736, __pyx_L1_error)
+  __pyx_t_1 = PyArray_MultiIterNew(1, ((void *)__pyx_v_a)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 735, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
   goto __pyx_L0;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":735
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":734
  * ctypedef npy_cdouble     complex_t
  * 
  * cdef inline object PyArray_MultiIterNew1(a):             # <<<<<<<<<<<<<<
@@ -3908,7 +4007,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew1(PyObject *__
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":738
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":737
  *     return PyArray_MultiIterNew(1, <void*>a)
  * 
  * cdef inline object PyArray_MultiIterNew2(a, b):             # <<<<<<<<<<<<<<
@@ -3925,7 +4024,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew2(PyObject *__
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("PyArray_MultiIterNew2", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":739
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":738
  * 
  * cdef inline object PyArray_MultiIterNew2(a, b):
  *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)             # <<<<<<<<<<<<<<
@@ -3933,13 +4032,13 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew2(PyObject *__
  * cdef inline object PyArray_MultiIterNew3(a, b, c):
  */
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = PyArray_MultiIterNew(2, ((void *)__pyx_v_a), ((void *)__pyx_v_b)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 739, __pyx_L1_error)
+  __pyx_t_1 = PyArray_MultiIterNew(2, ((void *)__pyx_v_a), ((void *)__pyx_v_b)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 738, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
   goto __pyx_L0;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":738
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":737
  *     return PyArray_MultiIterNew(1, <void*>a)
  * 
  * cdef inline object PyArray_MultiIterNew2(a, b):             # <<<<<<<<<<<<<<
@@ -3958,7 +4057,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew2(PyObject *__
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":741
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":740
  *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
  * 
  * cdef inline object PyArray_MultiIterNew3(a, b, c):             # <<<<<<<<<<<<<<
@@ -3975,7 +4074,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew3(PyObject *__
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("PyArray_MultiIterNew3", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":742
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":741
  * 
  * cdef inline object PyArray_MultiIterNew3(a, b, c):
  *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)             # <<<<<<<<<<<<<<
@@ -3983,13 +4082,13 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew3(PyObject *__
  * cdef inline object PyArray_MultiIterNew4(a, b, c, d):
  */
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = PyArray_MultiIterNew(3, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 742, __pyx_L1_error)
+  __pyx_t_1 = PyArray_MultiIterNew(3, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 741, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
   goto __pyx_L0;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":741
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":740
  *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
  * 
  * cdef inline object PyArray_MultiIterNew3(a, b, c):             # <<<<<<<<<<<<<<
@@ -4008,7 +4107,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew3(PyObject *__
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":744
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":743
  *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)
  * 
  * cdef inline object PyArray_MultiIterNew4(a, b, c, d):             # <<<<<<<<<<<<<<
@@ -4025,7 +4124,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew4(PyObject *__
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("PyArray_MultiIterNew4", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":745
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":744
  * 
  * cdef inline object PyArray_MultiIterNew4(a, b, c, d):
  *     return PyArray_MultiIterNew(4, <void*>a, <void*>b, <void*>c, <void*> d)             # <<<<<<<<<<<<<<
@@ -4033,13 +4132,13 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew4(PyObject *__
  * cdef inline object PyArray_MultiIterNew5(a, b, c, d, e):
  */
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = PyArray_MultiIterNew(4, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c), ((void *)__pyx_v_d)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 745, __pyx_L1_error)
+  __pyx_t_1 = PyArray_MultiIterNew(4, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c), ((void *)__pyx_v_d)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 744, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
   goto __pyx_L0;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":744
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":743
  *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)
  * 
  * cdef inline object PyArray_MultiIterNew4(a, b, c, d):             # <<<<<<<<<<<<<<
@@ -4058,7 +4157,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew4(PyObject *__
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":747
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":746
  *     return PyArray_MultiIterNew(4, <void*>a, <void*>b, <void*>c, <void*> d)
  * 
  * cdef inline object PyArray_MultiIterNew5(a, b, c, d, e):             # <<<<<<<<<<<<<<
@@ -4075,7 +4174,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew5(PyObject *__
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("PyArray_MultiIterNew5", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":748
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":747
  * 
  * cdef inline object PyArray_MultiIterNew5(a, b, c, d, e):
  *     return PyArray_MultiIterNew(5, <void*>a, <void*>b, <void*>c, <void*> d, <void*> e)             # <<<<<<<<<<<<<<
@@ -4083,13 +4182,13 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew5(PyObject *__
  * cdef inline tuple PyDataType_SHAPE(dtype d):
  */
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = PyArray_MultiIterNew(5, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c), ((void *)__pyx_v_d), ((void *)__pyx_v_e)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 748, __pyx_L1_error)
+  __pyx_t_1 = PyArray_MultiIterNew(5, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c), ((void *)__pyx_v_d), ((void *)__pyx_v_e)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 747, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
   goto __pyx_L0;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":747
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":746
  *     return PyArray_MultiIterNew(4, <void*>a, <void*>b, <void*>c, <void*> d)
  * 
  * cdef inline object PyArray_MultiIterNew5(a, b, c, d, e):             # <<<<<<<<<<<<<<
@@ -4108,7 +4207,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew5(PyObject *__
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":750
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":749
  *     return PyArray_MultiIterNew(5, <void*>a, <void*>b, <void*>c, <void*> d, <void*> e)
  * 
  * cdef inline tuple PyDataType_SHAPE(dtype d):             # <<<<<<<<<<<<<<
@@ -4122,7 +4221,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
   int __pyx_t_1;
   __Pyx_RefNannySetupContext("PyDataType_SHAPE", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":751
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":750
  * 
  * cdef inline tuple PyDataType_SHAPE(dtype d):
  *     if PyDataType_HASSUBARRAY(d):             # <<<<<<<<<<<<<<
@@ -4132,7 +4231,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
   __pyx_t_1 = (PyDataType_HASSUBARRAY(__pyx_v_d) != 0);
   if (__pyx_t_1) {
 
-    /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":752
+    /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":751
  * cdef inline tuple PyDataType_SHAPE(dtype d):
  *     if PyDataType_HASSUBARRAY(d):
  *         return <tuple>d.subarray.shape             # <<<<<<<<<<<<<<
@@ -4144,7 +4243,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
     __pyx_r = ((PyObject*)__pyx_v_d->subarray->shape);
     goto __pyx_L0;
 
-    /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":751
+    /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":750
  * 
  * cdef inline tuple PyDataType_SHAPE(dtype d):
  *     if PyDataType_HASSUBARRAY(d):             # <<<<<<<<<<<<<<
@@ -4153,7 +4252,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
  */
   }
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":754
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":753
  *         return <tuple>d.subarray.shape
  *     else:
  *         return ()             # <<<<<<<<<<<<<<
@@ -4167,7 +4266,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
     goto __pyx_L0;
   }
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":750
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":749
  *     return PyArray_MultiIterNew(5, <void*>a, <void*>b, <void*>c, <void*> d, <void*> e)
  * 
  * cdef inline tuple PyDataType_SHAPE(dtype d):             # <<<<<<<<<<<<<<
@@ -4182,7 +4281,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":929
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":928
  *     int _import_umath() except -1
  * 
  * cdef inline void set_array_base(ndarray arr, object base):             # <<<<<<<<<<<<<<
@@ -4194,7 +4293,7 @@ static CYTHON_INLINE void __pyx_f_5numpy_set_array_base(PyArrayObject *__pyx_v_a
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("set_array_base", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":930
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":929
  * 
  * cdef inline void set_array_base(ndarray arr, object base):
  *     Py_INCREF(base) # important to do this before stealing the reference below!             # <<<<<<<<<<<<<<
@@ -4203,7 +4302,7 @@ static CYTHON_INLINE void __pyx_f_5numpy_set_array_base(PyArrayObject *__pyx_v_a
  */
   Py_INCREF(__pyx_v_base);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":931
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":930
  * cdef inline void set_array_base(ndarray arr, object base):
  *     Py_INCREF(base) # important to do this before stealing the reference below!
  *     PyArray_SetBaseObject(arr, base)             # <<<<<<<<<<<<<<
@@ -4212,7 +4311,7 @@ static CYTHON_INLINE void __pyx_f_5numpy_set_array_base(PyArrayObject *__pyx_v_a
  */
   (void)(PyArray_SetBaseObject(__pyx_v_arr, __pyx_v_base));
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":929
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":928
  *     int _import_umath() except -1
  * 
  * cdef inline void set_array_base(ndarray arr, object base):             # <<<<<<<<<<<<<<
@@ -4224,7 +4323,7 @@ static CYTHON_INLINE void __pyx_f_5numpy_set_array_base(PyArrayObject *__pyx_v_a
   __Pyx_RefNannyFinishContext();
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":933
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":932
  *     PyArray_SetBaseObject(arr, base)
  * 
  * cdef inline object get_array_base(ndarray arr):             # <<<<<<<<<<<<<<
@@ -4239,7 +4338,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
   int __pyx_t_1;
   __Pyx_RefNannySetupContext("get_array_base", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":934
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":933
  * 
  * cdef inline object get_array_base(ndarray arr):
  *     base = PyArray_BASE(arr)             # <<<<<<<<<<<<<<
@@ -4248,7 +4347,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
  */
   __pyx_v_base = PyArray_BASE(__pyx_v_arr);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":935
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":934
  * cdef inline object get_array_base(ndarray arr):
  *     base = PyArray_BASE(arr)
  *     if base is NULL:             # <<<<<<<<<<<<<<
@@ -4258,7 +4357,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
   __pyx_t_1 = ((__pyx_v_base == NULL) != 0);
   if (__pyx_t_1) {
 
-    /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":936
+    /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":935
  *     base = PyArray_BASE(arr)
  *     if base is NULL:
  *         return None             # <<<<<<<<<<<<<<
@@ -4269,7 +4368,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
     __pyx_r = Py_None; __Pyx_INCREF(Py_None);
     goto __pyx_L0;
 
-    /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":935
+    /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":934
  * cdef inline object get_array_base(ndarray arr):
  *     base = PyArray_BASE(arr)
  *     if base is NULL:             # <<<<<<<<<<<<<<
@@ -4278,7 +4377,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
  */
   }
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":937
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":936
  *     if base is NULL:
  *         return None
  *     return <object>base             # <<<<<<<<<<<<<<
@@ -4290,7 +4389,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
   __pyx_r = ((PyObject *)__pyx_v_base);
   goto __pyx_L0;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":933
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":932
  *     PyArray_SetBaseObject(arr, base)
  * 
  * cdef inline object get_array_base(ndarray arr):             # <<<<<<<<<<<<<<
@@ -4305,7 +4404,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":941
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":940
  * # Versions of the import_* functions which are more suitable for
  * # Cython code.
  * cdef inline int import_array() except -1:             # <<<<<<<<<<<<<<
@@ -4329,7 +4428,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_array(void) {
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("import_array", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":942
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":941
  * # Cython code.
  * cdef inline int import_array() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -4345,16 +4444,16 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_array(void) {
     __Pyx_XGOTREF(__pyx_t_3);
     /*try:*/ {
 
-      /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":943
+      /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":942
  * cdef inline int import_array() except -1:
  *     try:
  *         __pyx_import_array()             # <<<<<<<<<<<<<<
  *     except Exception:
  *         raise ImportError("numpy.core.multiarray failed to import")
  */
-      __pyx_t_4 = _import_array(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 943, __pyx_L3_error)
+      __pyx_t_4 = _import_array(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 942, __pyx_L3_error)
 
-      /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":942
+      /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":941
  * # Cython code.
  * cdef inline int import_array() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -4368,7 +4467,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_array(void) {
     goto __pyx_L8_try_end;
     __pyx_L3_error:;
 
-    /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":944
+    /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":943
  *     try:
  *         __pyx_import_array()
  *     except Exception:             # <<<<<<<<<<<<<<
@@ -4378,28 +4477,28 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_array(void) {
     __pyx_t_4 = __Pyx_PyErr_ExceptionMatches(((PyObject *)(&((PyTypeObject*)PyExc_Exception)[0])));
     if (__pyx_t_4) {
       __Pyx_AddTraceback("numpy.import_array", __pyx_clineno, __pyx_lineno, __pyx_filename);
-      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 944, __pyx_L5_except_error)
+      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 943, __pyx_L5_except_error)
       __Pyx_GOTREF(__pyx_t_5);
       __Pyx_GOTREF(__pyx_t_6);
       __Pyx_GOTREF(__pyx_t_7);
 
-      /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":945
+      /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":944
  *         __pyx_import_array()
  *     except Exception:
  *         raise ImportError("numpy.core.multiarray failed to import")             # <<<<<<<<<<<<<<
  * 
  * cdef inline int import_umath() except -1:
  */
-      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple_, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 945, __pyx_L5_except_error)
+      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple_, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 944, __pyx_L5_except_error)
       __Pyx_GOTREF(__pyx_t_8);
       __Pyx_Raise(__pyx_t_8, 0, 0, 0);
       __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
-      __PYX_ERR(1, 945, __pyx_L5_except_error)
+      __PYX_ERR(1, 944, __pyx_L5_except_error)
     }
     goto __pyx_L5_except_error;
     __pyx_L5_except_error:;
 
-    /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":942
+    /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":941
  * # Cython code.
  * cdef inline int import_array() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -4414,7 +4513,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_array(void) {
     __pyx_L8_try_end:;
   }
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":941
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":940
  * # Versions of the import_* functions which are more suitable for
  * # Cython code.
  * cdef inline int import_array() except -1:             # <<<<<<<<<<<<<<
@@ -4437,7 +4536,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_array(void) {
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":947
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":946
  *         raise ImportError("numpy.core.multiarray failed to import")
  * 
  * cdef inline int import_umath() except -1:             # <<<<<<<<<<<<<<
@@ -4461,7 +4560,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_umath(void) {
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("import_umath", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":948
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":947
  * 
  * cdef inline int import_umath() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -4477,16 +4576,16 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_umath(void) {
     __Pyx_XGOTREF(__pyx_t_3);
     /*try:*/ {
 
-      /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":949
+      /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":948
  * cdef inline int import_umath() except -1:
  *     try:
  *         _import_umath()             # <<<<<<<<<<<<<<
  *     except Exception:
  *         raise ImportError("numpy.core.umath failed to import")
  */
-      __pyx_t_4 = _import_umath(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 949, __pyx_L3_error)
+      __pyx_t_4 = _import_umath(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 948, __pyx_L3_error)
 
-      /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":948
+      /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":947
  * 
  * cdef inline int import_umath() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -4500,7 +4599,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_umath(void) {
     goto __pyx_L8_try_end;
     __pyx_L3_error:;
 
-    /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":950
+    /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":949
  *     try:
  *         _import_umath()
  *     except Exception:             # <<<<<<<<<<<<<<
@@ -4510,28 +4609,28 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_umath(void) {
     __pyx_t_4 = __Pyx_PyErr_ExceptionMatches(((PyObject *)(&((PyTypeObject*)PyExc_Exception)[0])));
     if (__pyx_t_4) {
       __Pyx_AddTraceback("numpy.import_umath", __pyx_clineno, __pyx_lineno, __pyx_filename);
-      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 950, __pyx_L5_except_error)
+      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 949, __pyx_L5_except_error)
       __Pyx_GOTREF(__pyx_t_5);
       __Pyx_GOTREF(__pyx_t_6);
       __Pyx_GOTREF(__pyx_t_7);
 
-      /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":951
+      /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":950
  *         _import_umath()
  *     except Exception:
  *         raise ImportError("numpy.core.umath failed to import")             # <<<<<<<<<<<<<<
  * 
  * cdef inline int import_ufunc() except -1:
  */
-      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple__2, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 951, __pyx_L5_except_error)
+      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple__2, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 950, __pyx_L5_except_error)
       __Pyx_GOTREF(__pyx_t_8);
       __Pyx_Raise(__pyx_t_8, 0, 0, 0);
       __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
-      __PYX_ERR(1, 951, __pyx_L5_except_error)
+      __PYX_ERR(1, 950, __pyx_L5_except_error)
     }
     goto __pyx_L5_except_error;
     __pyx_L5_except_error:;
 
-    /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":948
+    /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":947
  * 
  * cdef inline int import_umath() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -4546,7 +4645,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_umath(void) {
     __pyx_L8_try_end:;
   }
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":947
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":946
  *         raise ImportError("numpy.core.multiarray failed to import")
  * 
  * cdef inline int import_umath() except -1:             # <<<<<<<<<<<<<<
@@ -4569,7 +4668,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_umath(void) {
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":953
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":952
  *         raise ImportError("numpy.core.umath failed to import")
  * 
  * cdef inline int import_ufunc() except -1:             # <<<<<<<<<<<<<<
@@ -4593,7 +4692,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_ufunc(void) {
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("import_ufunc", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":954
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":953
  * 
  * cdef inline int import_ufunc() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -4609,16 +4708,16 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_ufunc(void) {
     __Pyx_XGOTREF(__pyx_t_3);
     /*try:*/ {
 
-      /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":955
+      /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":954
  * cdef inline int import_ufunc() except -1:
  *     try:
  *         _import_umath()             # <<<<<<<<<<<<<<
  *     except Exception:
  *         raise ImportError("numpy.core.umath failed to import")
  */
-      __pyx_t_4 = _import_umath(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 955, __pyx_L3_error)
+      __pyx_t_4 = _import_umath(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 954, __pyx_L3_error)
 
-      /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":954
+      /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":953
  * 
  * cdef inline int import_ufunc() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -4632,7 +4731,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_ufunc(void) {
     goto __pyx_L8_try_end;
     __pyx_L3_error:;
 
-    /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":956
+    /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":955
  *     try:
  *         _import_umath()
  *     except Exception:             # <<<<<<<<<<<<<<
@@ -4642,28 +4741,28 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_ufunc(void) {
     __pyx_t_4 = __Pyx_PyErr_ExceptionMatches(((PyObject *)(&((PyTypeObject*)PyExc_Exception)[0])));
     if (__pyx_t_4) {
       __Pyx_AddTraceback("numpy.import_ufunc", __pyx_clineno, __pyx_lineno, __pyx_filename);
-      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 956, __pyx_L5_except_error)
+      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 955, __pyx_L5_except_error)
       __Pyx_GOTREF(__pyx_t_5);
       __Pyx_GOTREF(__pyx_t_6);
       __Pyx_GOTREF(__pyx_t_7);
 
-      /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":957
+      /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":956
  *         _import_umath()
  *     except Exception:
  *         raise ImportError("numpy.core.umath failed to import")             # <<<<<<<<<<<<<<
  * 
  * cdef extern from *:
  */
-      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple__2, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 957, __pyx_L5_except_error)
+      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple__2, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 956, __pyx_L5_except_error)
       __Pyx_GOTREF(__pyx_t_8);
       __Pyx_Raise(__pyx_t_8, 0, 0, 0);
       __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
-      __PYX_ERR(1, 957, __pyx_L5_except_error)
+      __PYX_ERR(1, 956, __pyx_L5_except_error)
     }
     goto __pyx_L5_except_error;
     __pyx_L5_except_error:;
 
-    /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":954
+    /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":953
  * 
  * cdef inline int import_ufunc() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -4678,7 +4777,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_ufunc(void) {
     __pyx_L8_try_end:;
   }
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":953
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":952
  *         raise ImportError("numpy.core.umath failed to import")
  * 
  * cdef inline int import_ufunc() except -1:             # <<<<<<<<<<<<<<
@@ -4701,7 +4800,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_ufunc(void) {
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":967
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":966
  * 
  * 
  * cdef inline bint is_timedelta64_object(object obj):             # <<<<<<<<<<<<<<
@@ -4714,7 +4813,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_timedelta64_object(PyObject *__pyx_v_
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("is_timedelta64_object", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":979
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":978
  *     bool
  *     """
  *     return PyObject_TypeCheck(obj, &PyTimedeltaArrType_Type)             # <<<<<<<<<<<<<<
@@ -4724,7 +4823,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_timedelta64_object(PyObject *__pyx_v_
   __pyx_r = PyObject_TypeCheck(__pyx_v_obj, (&PyTimedeltaArrType_Type));
   goto __pyx_L0;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":967
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":966
  * 
  * 
  * cdef inline bint is_timedelta64_object(object obj):             # <<<<<<<<<<<<<<
@@ -4738,7 +4837,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_timedelta64_object(PyObject *__pyx_v_
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":982
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":981
  * 
  * 
  * cdef inline bint is_datetime64_object(object obj):             # <<<<<<<<<<<<<<
@@ -4751,7 +4850,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_datetime64_object(PyObject *__pyx_v_o
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("is_datetime64_object", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":994
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":993
  *     bool
  *     """
  *     return PyObject_TypeCheck(obj, &PyDatetimeArrType_Type)             # <<<<<<<<<<<<<<
@@ -4761,7 +4860,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_datetime64_object(PyObject *__pyx_v_o
   __pyx_r = PyObject_TypeCheck(__pyx_v_obj, (&PyDatetimeArrType_Type));
   goto __pyx_L0;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":982
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":981
  * 
  * 
  * cdef inline bint is_datetime64_object(object obj):             # <<<<<<<<<<<<<<
@@ -4775,7 +4874,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_datetime64_object(PyObject *__pyx_v_o
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":997
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":996
  * 
  * 
  * cdef inline npy_datetime get_datetime64_value(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -4786,7 +4885,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_datetime64_object(PyObject *__pyx_v_o
 static CYTHON_INLINE npy_datetime __pyx_f_5numpy_get_datetime64_value(PyObject *__pyx_v_obj) {
   npy_datetime __pyx_r;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":1004
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":1003
  *     also needed.  That can be found using `get_datetime64_unit`.
  *     """
  *     return (<PyDatetimeScalarObject*>obj).obval             # <<<<<<<<<<<<<<
@@ -4796,7 +4895,7 @@ static CYTHON_INLINE npy_datetime __pyx_f_5numpy_get_datetime64_value(PyObject *
   __pyx_r = ((PyDatetimeScalarObject *)__pyx_v_obj)->obval;
   goto __pyx_L0;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":997
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":996
  * 
  * 
  * cdef inline npy_datetime get_datetime64_value(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -4809,7 +4908,7 @@ static CYTHON_INLINE npy_datetime __pyx_f_5numpy_get_datetime64_value(PyObject *
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":1007
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":1006
  * 
  * 
  * cdef inline npy_timedelta get_timedelta64_value(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -4820,7 +4919,7 @@ static CYTHON_INLINE npy_datetime __pyx_f_5numpy_get_datetime64_value(PyObject *
 static CYTHON_INLINE npy_timedelta __pyx_f_5numpy_get_timedelta64_value(PyObject *__pyx_v_obj) {
   npy_timedelta __pyx_r;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":1011
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":1010
  *     returns the int64 value underlying scalar numpy timedelta64 object
  *     """
  *     return (<PyTimedeltaScalarObject*>obj).obval             # <<<<<<<<<<<<<<
@@ -4830,7 +4929,7 @@ static CYTHON_INLINE npy_timedelta __pyx_f_5numpy_get_timedelta64_value(PyObject
   __pyx_r = ((PyTimedeltaScalarObject *)__pyx_v_obj)->obval;
   goto __pyx_L0;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":1007
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":1006
  * 
  * 
  * cdef inline npy_timedelta get_timedelta64_value(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -4843,7 +4942,7 @@ static CYTHON_INLINE npy_timedelta __pyx_f_5numpy_get_timedelta64_value(PyObject
   return __pyx_r;
 }
 
-/* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":1014
+/* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":1013
  * 
  * 
  * cdef inline NPY_DATETIMEUNIT get_datetime64_unit(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -4854,7 +4953,7 @@ static CYTHON_INLINE npy_timedelta __pyx_f_5numpy_get_timedelta64_value(PyObject
 static CYTHON_INLINE NPY_DATETIMEUNIT __pyx_f_5numpy_get_datetime64_unit(PyObject *__pyx_v_obj) {
   NPY_DATETIMEUNIT __pyx_r;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":1018
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":1017
  *     returns the unit part of the dtype for a numpy datetime64 object.
  *     """
  *     return <NPY_DATETIMEUNIT>(<PyDatetimeScalarObject*>obj).obmeta.base             # <<<<<<<<<<<<<<
@@ -4862,7 +4961,7 @@ static CYTHON_INLINE NPY_DATETIMEUNIT __pyx_f_5numpy_get_datetime64_unit(PyObjec
   __pyx_r = ((NPY_DATETIMEUNIT)((PyDatetimeScalarObject *)__pyx_v_obj)->obmeta.base);
   goto __pyx_L0;
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":1014
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":1013
  * 
  * 
  * cdef inline NPY_DATETIMEUNIT get_datetime64_unit(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -18788,15 +18887,18 @@ static __Pyx_StringTabEntry __pyx_string_tab[] = {
   {&__pyx_n_s_c, __pyx_k_c, sizeof(__pyx_k_c), 0, 0, 1, 1},
   {&__pyx_n_u_c, __pyx_k_c, sizeof(__pyx_k_c), 0, 1, 0, 1},
   {&__pyx_n_s_candidate, __pyx_k_candidate, sizeof(__pyx_k_candidate), 0, 0, 1, 1},
+  {&__pyx_n_s_candidate_charge, __pyx_k_candidate_charge, sizeof(__pyx_k_candidate_charge), 0, 0, 1, 1},
   {&__pyx_n_s_candidate_index, __pyx_k_candidate_index, sizeof(__pyx_k_candidate_index), 0, 0, 1, 1},
   {&__pyx_n_s_candidates, __pyx_k_candidates, sizeof(__pyx_k_candidates), 0, 0, 1, 1},
   {&__pyx_n_s_candidates_vec, __pyx_k_candidates_vec, sizeof(__pyx_k_candidates_vec), 0, 0, 1, 1},
   {&__pyx_n_s_charge, __pyx_k_charge, sizeof(__pyx_k_charge), 0, 0, 1, 1},
   {&__pyx_n_u_charge, __pyx_k_charge, sizeof(__pyx_k_charge), 0, 1, 0, 1},
+  {&__pyx_n_s_charge_ptr, __pyx_k_charge_ptr, sizeof(__pyx_k_charge_ptr), 0, 0, 1, 1},
   {&__pyx_n_s_class, __pyx_k_class, sizeof(__pyx_k_class), 0, 0, 1, 1},
   {&__pyx_n_s_cline_in_traceback, __pyx_k_cline_in_traceback, sizeof(__pyx_k_cline_in_traceback), 0, 0, 1, 1},
   {&__pyx_kp_s_contiguous_and_direct, __pyx_k_contiguous_and_direct, sizeof(__pyx_k_contiguous_and_direct), 0, 0, 1, 0},
   {&__pyx_kp_s_contiguous_and_indirect, __pyx_k_contiguous_and_indirect, sizeof(__pyx_k_contiguous_and_indirect), 0, 0, 1, 0},
+  {&__pyx_n_s_copy, __pyx_k_copy, sizeof(__pyx_k_copy), 0, 0, 1, 1},
   {&__pyx_n_s_dict, __pyx_k_dict, sizeof(__pyx_k_dict), 0, 0, 1, 1},
   {&__pyx_n_s_dtype, __pyx_k_dtype, sizeof(__pyx_k_dtype), 0, 0, 1, 1},
   {&__pyx_n_s_dtype_is_object, __pyx_k_dtype_is_object, sizeof(__pyx_k_dtype_is_object), 0, 0, 1, 1},
@@ -18818,12 +18920,15 @@ static __Pyx_StringTabEntry __pyx_string_tab[] = {
   {&__pyx_n_s_import, __pyx_k_import, sizeof(__pyx_k_import), 0, 0, 1, 1},
   {&__pyx_n_s_index, __pyx_k_index, sizeof(__pyx_k_index), 0, 0, 1, 1},
   {&__pyx_n_s_intensity, __pyx_k_intensity, sizeof(__pyx_k_intensity), 0, 0, 1, 1},
+  {&__pyx_n_s_intensity_float32, __pyx_k_intensity_float32, sizeof(__pyx_k_intensity_float32), 0, 0, 1, 1},
   {&__pyx_n_s_itemsize, __pyx_k_itemsize, sizeof(__pyx_k_itemsize), 0, 0, 1, 1},
   {&__pyx_kp_s_itemsize_0_for_cython_array, __pyx_k_itemsize_0_for_cython_array, sizeof(__pyx_k_itemsize_0_for_cython_array), 0, 0, 1, 0},
   {&__pyx_n_s_main, __pyx_k_main, sizeof(__pyx_k_main), 0, 0, 1, 1},
   {&__pyx_n_s_memview, __pyx_k_memview, sizeof(__pyx_k_memview), 0, 0, 1, 1},
   {&__pyx_n_s_mode, __pyx_k_mode, sizeof(__pyx_k_mode), 0, 0, 1, 1},
   {&__pyx_n_s_mz, __pyx_k_mz, sizeof(__pyx_k_mz), 0, 0, 1, 1},
+  {&__pyx_n_s_mz_float32, __pyx_k_mz_float32, sizeof(__pyx_k_mz_float32), 0, 0, 1, 1},
+  {&__pyx_n_u_mz_float32, __pyx_k_mz_float32, sizeof(__pyx_k_mz_float32), 0, 1, 0, 1},
   {&__pyx_n_s_name, __pyx_k_name, sizeof(__pyx_k_name), 0, 0, 1, 1},
   {&__pyx_n_s_name_2, __pyx_k_name_2, sizeof(__pyx_k_name_2), 0, 0, 1, 1},
   {&__pyx_n_s_ndim, __pyx_k_ndim, sizeof(__pyx_k_ndim), 0, 0, 1, 1},
@@ -18848,7 +18953,9 @@ static __Pyx_StringTabEntry __pyx_string_tab[] = {
   {&__pyx_n_s_pyx_unpickle_Enum, __pyx_k_pyx_unpickle_Enum, sizeof(__pyx_k_pyx_unpickle_Enum), 0, 0, 1, 1},
   {&__pyx_n_s_pyx_vtable, __pyx_k_pyx_vtable, sizeof(__pyx_k_pyx_vtable), 0, 0, 1, 1},
   {&__pyx_n_s_query, __pyx_k_query, sizeof(__pyx_k_query), 0, 0, 1, 1},
+  {&__pyx_n_s_query_intensity, __pyx_k_query_intensity, sizeof(__pyx_k_query_intensity), 0, 0, 1, 1},
   {&__pyx_n_s_query_matcher, __pyx_k_query_matcher, sizeof(__pyx_k_query_matcher), 0, 0, 1, 1},
+  {&__pyx_n_s_query_mz, __pyx_k_query_mz, sizeof(__pyx_k_query_mz), 0, 0, 1, 1},
   {&__pyx_n_s_query_spec, __pyx_k_query_spec, sizeof(__pyx_k_query_spec), 0, 0, 1, 1},
   {&__pyx_n_s_range, __pyx_k_range, sizeof(__pyx_k_range), 0, 0, 1, 1},
   {&__pyx_n_s_reduce, __pyx_k_reduce, sizeof(__pyx_k_reduce), 0, 0, 1, 1},
@@ -18878,9 +18985,9 @@ static __Pyx_StringTabEntry __pyx_string_tab[] = {
   {0, 0, 0, 0, 0, 0, 0}
 };
 static CYTHON_SMALL_CODE int __Pyx_InitCachedBuiltins(void) {
-  __pyx_builtin_enumerate = __Pyx_GetBuiltinName(__pyx_n_s_enumerate); if (!__pyx_builtin_enumerate) __PYX_ERR(0, 77, __pyx_L1_error)
-  __pyx_builtin_range = __Pyx_GetBuiltinName(__pyx_n_s_range); if (!__pyx_builtin_range) __PYX_ERR(0, 103, __pyx_L1_error)
-  __pyx_builtin_ImportError = __Pyx_GetBuiltinName(__pyx_n_s_ImportError); if (!__pyx_builtin_ImportError) __PYX_ERR(1, 945, __pyx_L1_error)
+  __pyx_builtin_enumerate = __Pyx_GetBuiltinName(__pyx_n_s_enumerate); if (!__pyx_builtin_enumerate) __PYX_ERR(0, 84, __pyx_L1_error)
+  __pyx_builtin_range = __Pyx_GetBuiltinName(__pyx_n_s_range); if (!__pyx_builtin_range) __PYX_ERR(0, 122, __pyx_L1_error)
+  __pyx_builtin_ImportError = __Pyx_GetBuiltinName(__pyx_n_s_ImportError); if (!__pyx_builtin_ImportError) __PYX_ERR(1, 944, __pyx_L1_error)
   __pyx_builtin_ValueError = __Pyx_GetBuiltinName(__pyx_n_s_ValueError); if (!__pyx_builtin_ValueError) __PYX_ERR(2, 134, __pyx_L1_error)
   __pyx_builtin_MemoryError = __Pyx_GetBuiltinName(__pyx_n_s_MemoryError); if (!__pyx_builtin_MemoryError) __PYX_ERR(2, 149, __pyx_L1_error)
   __pyx_builtin_TypeError = __Pyx_GetBuiltinName(__pyx_n_s_TypeError); if (!__pyx_builtin_TypeError) __PYX_ERR(2, 2, __pyx_L1_error)
@@ -18896,25 +19003,25 @@ static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("__Pyx_InitCachedConstants", 0);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":945
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":944
  *         __pyx_import_array()
  *     except Exception:
  *         raise ImportError("numpy.core.multiarray failed to import")             # <<<<<<<<<<<<<<
  * 
  * cdef inline int import_umath() except -1:
  */
-  __pyx_tuple_ = PyTuple_Pack(1, __pyx_kp_u_numpy_core_multiarray_failed_to); if (unlikely(!__pyx_tuple_)) __PYX_ERR(1, 945, __pyx_L1_error)
+  __pyx_tuple_ = PyTuple_Pack(1, __pyx_kp_u_numpy_core_multiarray_failed_to); if (unlikely(!__pyx_tuple_)) __PYX_ERR(1, 944, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_tuple_);
   __Pyx_GIVEREF(__pyx_tuple_);
 
-  /* "../../../../../../../../../../../root/anaconda3/envs/ann_solo/lib/python3.9/site-packages/numpy/__init__.pxd":951
+  /* "../../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":950
  *         _import_umath()
  *     except Exception:
  *         raise ImportError("numpy.core.umath failed to import")             # <<<<<<<<<<<<<<
  * 
  * cdef inline int import_ufunc() except -1:
  */
-  __pyx_tuple__2 = PyTuple_Pack(1, __pyx_kp_u_numpy_core_umath_failed_to_impor); if (unlikely(!__pyx_tuple__2)) __PYX_ERR(1, 951, __pyx_L1_error)
+  __pyx_tuple__2 = PyTuple_Pack(1, __pyx_kp_u_numpy_core_umath_failed_to_impor); if (unlikely(!__pyx_tuple__2)) __PYX_ERR(1, 950, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_tuple__2);
   __Pyx_GIVEREF(__pyx_tuple__2);
 
@@ -19120,10 +19227,10 @@ static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
  *     """
  *     Find the best matching candidate spectrum compared to the given query
  */
-  __pyx_tuple__22 = PyTuple_Pack(21, __pyx_n_s_query, __pyx_n_s_candidates, __pyx_n_s_fragment_mz_tolerance, __pyx_n_s_allow_shift, __pyx_n_s_fragment_mz_tolerance_c, __pyx_n_s_allow_shift_c, __pyx_n_s_candidates_vec, __pyx_n_s_mz, __pyx_n_s_intensity, __pyx_n_s_charge, __pyx_n_s_candidate_index, __pyx_n_s_score, __pyx_n_s_peak_matches, __pyx_n_s_candidate, __pyx_n_s_index, __pyx_n_s_annotation, __pyx_n_s_query_spec, __pyx_n_s_query_matcher, __pyx_n_s_result, __pyx_n_s_i, __pyx_n_s_i); if (unlikely(!__pyx_tuple__22)) __PYX_ERR(0, 28, __pyx_L1_error)
+  __pyx_tuple__22 = PyTuple_Pack(25, __pyx_n_s_query, __pyx_n_s_candidates, __pyx_n_s_fragment_mz_tolerance, __pyx_n_s_allow_shift, __pyx_n_s_fragment_mz_tolerance_c, __pyx_n_s_allow_shift_c, __pyx_n_s_candidates_vec, __pyx_n_s_mz, __pyx_n_s_intensity, __pyx_n_s_charge, __pyx_n_s_charge_ptr, __pyx_n_s_candidate_index, __pyx_n_s_score, __pyx_n_s_peak_matches, __pyx_n_s_candidate, __pyx_n_s_candidate_charge, __pyx_n_s_index, __pyx_n_s_annotation, __pyx_n_s_query_mz, __pyx_n_s_query_intensity, __pyx_n_s_query_spec, __pyx_n_s_query_matcher, __pyx_n_s_result, __pyx_n_s_i, __pyx_n_s_i); if (unlikely(!__pyx_tuple__22)) __PYX_ERR(0, 28, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_tuple__22);
   __Pyx_GIVEREF(__pyx_tuple__22);
-  __pyx_codeobj__23 = (PyObject*)__Pyx_PyCode_New(4, 0, 21, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__22, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_ann_solo_spectrum_match_pyx, __pyx_n_s_get_best_match, 28, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__23)) __PYX_ERR(0, 28, __pyx_L1_error)
+  __pyx_codeobj__23 = (PyObject*)__Pyx_PyCode_New(4, 0, 25, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__22, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_ann_solo_spectrum_match_pyx, __pyx_n_s_get_best_match, 28, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__23)) __PYX_ERR(0, 28, __pyx_L1_error)
 
   /* "View.MemoryView":287
  *         return self.name
@@ -19330,38 +19437,38 @@ static int __Pyx_modinit_type_import_code(void) {
   __Pyx_ImportType_CheckSize_Warn);
    if (!__pyx_ptype_7cpython_4type_type) __PYX_ERR(3, 9, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_t_1 = PyImport_ImportModule("numpy"); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 200, __pyx_L1_error)
+  __pyx_t_1 = PyImport_ImportModule("numpy"); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 199, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_ptype_5numpy_dtype = __Pyx_ImportType(__pyx_t_1, "numpy", "dtype", sizeof(PyArray_Descr), __Pyx_ImportType_CheckSize_Ignore);
-   if (!__pyx_ptype_5numpy_dtype) __PYX_ERR(1, 200, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_dtype) __PYX_ERR(1, 199, __pyx_L1_error)
   __pyx_ptype_5numpy_flatiter = __Pyx_ImportType(__pyx_t_1, "numpy", "flatiter", sizeof(PyArrayIterObject), __Pyx_ImportType_CheckSize_Ignore);
-   if (!__pyx_ptype_5numpy_flatiter) __PYX_ERR(1, 223, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_flatiter) __PYX_ERR(1, 222, __pyx_L1_error)
   __pyx_ptype_5numpy_broadcast = __Pyx_ImportType(__pyx_t_1, "numpy", "broadcast", sizeof(PyArrayMultiIterObject), __Pyx_ImportType_CheckSize_Ignore);
-   if (!__pyx_ptype_5numpy_broadcast) __PYX_ERR(1, 227, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_broadcast) __PYX_ERR(1, 226, __pyx_L1_error)
   __pyx_ptype_5numpy_ndarray = __Pyx_ImportType(__pyx_t_1, "numpy", "ndarray", sizeof(PyArrayObject), __Pyx_ImportType_CheckSize_Ignore);
-   if (!__pyx_ptype_5numpy_ndarray) __PYX_ERR(1, 239, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_ndarray) __PYX_ERR(1, 238, __pyx_L1_error)
   __pyx_ptype_5numpy_generic = __Pyx_ImportType(__pyx_t_1, "numpy", "generic", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_generic) __PYX_ERR(1, 771, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_generic) __PYX_ERR(1, 770, __pyx_L1_error)
   __pyx_ptype_5numpy_number = __Pyx_ImportType(__pyx_t_1, "numpy", "number", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_number) __PYX_ERR(1, 773, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_number) __PYX_ERR(1, 772, __pyx_L1_error)
   __pyx_ptype_5numpy_integer = __Pyx_ImportType(__pyx_t_1, "numpy", "integer", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_integer) __PYX_ERR(1, 775, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_integer) __PYX_ERR(1, 774, __pyx_L1_error)
   __pyx_ptype_5numpy_signedinteger = __Pyx_ImportType(__pyx_t_1, "numpy", "signedinteger", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_signedinteger) __PYX_ERR(1, 777, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_signedinteger) __PYX_ERR(1, 776, __pyx_L1_error)
   __pyx_ptype_5numpy_unsignedinteger = __Pyx_ImportType(__pyx_t_1, "numpy", "unsignedinteger", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_unsignedinteger) __PYX_ERR(1, 779, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_unsignedinteger) __PYX_ERR(1, 778, __pyx_L1_error)
   __pyx_ptype_5numpy_inexact = __Pyx_ImportType(__pyx_t_1, "numpy", "inexact", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_inexact) __PYX_ERR(1, 781, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_inexact) __PYX_ERR(1, 780, __pyx_L1_error)
   __pyx_ptype_5numpy_floating = __Pyx_ImportType(__pyx_t_1, "numpy", "floating", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_floating) __PYX_ERR(1, 783, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_floating) __PYX_ERR(1, 782, __pyx_L1_error)
   __pyx_ptype_5numpy_complexfloating = __Pyx_ImportType(__pyx_t_1, "numpy", "complexfloating", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_complexfloating) __PYX_ERR(1, 785, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_complexfloating) __PYX_ERR(1, 784, __pyx_L1_error)
   __pyx_ptype_5numpy_flexible = __Pyx_ImportType(__pyx_t_1, "numpy", "flexible", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_flexible) __PYX_ERR(1, 787, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_flexible) __PYX_ERR(1, 786, __pyx_L1_error)
   __pyx_ptype_5numpy_character = __Pyx_ImportType(__pyx_t_1, "numpy", "character", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_character) __PYX_ERR(1, 789, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_character) __PYX_ERR(1, 788, __pyx_L1_error)
   __pyx_ptype_5numpy_ufunc = __Pyx_ImportType(__pyx_t_1, "numpy", "ufunc", sizeof(PyUFuncObject), __Pyx_ImportType_CheckSize_Ignore);
-   if (!__pyx_ptype_5numpy_ufunc) __PYX_ERR(1, 827, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_ufunc) __PYX_ERR(1, 826, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_RefNannyFinishContext();
   return 0;
@@ -20099,20 +20206,6 @@ static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg
 }
 #endif
 
-/* PyObjectSetAttrStr */
-#if CYTHON_USE_TYPE_SLOTS
-static CYTHON_INLINE int __Pyx_PyObject_SetAttrStr(PyObject* obj, PyObject* attr_name, PyObject* value) {
-    PyTypeObject* tp = Py_TYPE(obj);
-    if (likely(tp->tp_setattro))
-        return tp->tp_setattro(obj, attr_name, value);
-#if PY_MAJOR_VERSION < 3
-    if (likely(tp->tp_setattr))
-        return tp->tp_setattr(obj, PyString_AS_STRING(attr_name), value);
-#endif
-    return PyObject_SetAttr(obj, attr_name, value);
-}
-#endif
-
 /* PyIntBinop */
 #if !CYTHON_COMPILING_IN_PYPY
 static PyObject* __Pyx_PyInt_AddObjC(PyObject *op1, PyObject *op2, CYTHON_UNUSED long intval, int inplace, int zerodivision_check) {
@@ -20223,19 +20316,165 @@ static PyObject* __Pyx_PyInt_AddObjC(PyObject *op1, PyObject *op2, CYTHON_UNUSED
         
         
     }
-    #endif
-    if (PyFloat_CheckExact(op1)) {
-        const long b = intval;
-        double a = PyFloat_AS_DOUBLE(op1);
-            double result;
-            PyFPE_START_PROTECT("add", return NULL)
-            result = ((double)a) + (double)b;
-            PyFPE_END_PROTECT(result)
-            return PyFloat_FromDouble(result);
+    #endif
+    if (PyFloat_CheckExact(op1)) {
+        const long b = intval;
+        double a = PyFloat_AS_DOUBLE(op1);
+            double result;
+            PyFPE_START_PROTECT("add", return NULL)
+            result = ((double)a) + (double)b;
+            PyFPE_END_PROTECT(result)
+            return PyFloat_FromDouble(result);
+    }
+    return (inplace ? PyNumber_InPlaceAdd : PyNumber_Add)(op1, op2);
+}
+#endif
+
+/* PyObjectSetAttrStr */
+#if CYTHON_USE_TYPE_SLOTS
+static CYTHON_INLINE int __Pyx_PyObject_SetAttrStr(PyObject* obj, PyObject* attr_name, PyObject* value) {
+    PyTypeObject* tp = Py_TYPE(obj);
+    if (likely(tp->tp_setattro))
+        return tp->tp_setattro(obj, attr_name, value);
+#if PY_MAJOR_VERSION < 3
+    if (likely(tp->tp_setattr))
+        return tp->tp_setattr(obj, PyString_AS_STRING(attr_name), value);
+#endif
+    return PyObject_SetAttr(obj, attr_name, value);
+}
+#endif
+
+/* MemviewSliceInit */
+static int
+__Pyx_init_memviewslice(struct __pyx_memoryview_obj *memview,
+                        int ndim,
+                        __Pyx_memviewslice *memviewslice,
+                        int memview_is_new_reference)
+{
+    __Pyx_RefNannyDeclarations
+    int i, retval=-1;
+    Py_buffer *buf = &memview->view;
+    __Pyx_RefNannySetupContext("init_memviewslice", 0);
+    if (unlikely(memviewslice->memview || memviewslice->data)) {
+        PyErr_SetString(PyExc_ValueError,
+            "memviewslice is already initialized!");
+        goto fail;
+    }
+    if (buf->strides) {
+        for (i = 0; i < ndim; i++) {
+            memviewslice->strides[i] = buf->strides[i];
+        }
+    } else {
+        Py_ssize_t stride = buf->itemsize;
+        for (i = ndim - 1; i >= 0; i--) {
+            memviewslice->strides[i] = stride;
+            stride *= buf->shape[i];
+        }
+    }
+    for (i = 0; i < ndim; i++) {
+        memviewslice->shape[i]   = buf->shape[i];
+        if (buf->suboffsets) {
+            memviewslice->suboffsets[i] = buf->suboffsets[i];
+        } else {
+            memviewslice->suboffsets[i] = -1;
+        }
+    }
+    memviewslice->memview = memview;
+    memviewslice->data = (char *)buf->buf;
+    if (__pyx_add_acquisition_count(memview) == 0 && !memview_is_new_reference) {
+        Py_INCREF(memview);
+    }
+    retval = 0;
+    goto no_fail;
+fail:
+    memviewslice->memview = 0;
+    memviewslice->data = 0;
+    retval = -1;
+no_fail:
+    __Pyx_RefNannyFinishContext();
+    return retval;
+}
+#ifndef Py_NO_RETURN
+#define Py_NO_RETURN
+#endif
+static void __pyx_fatalerror(const char *fmt, ...) Py_NO_RETURN {
+    va_list vargs;
+    char msg[200];
+#if PY_VERSION_HEX >= 0x030A0000 || defined(HAVE_STDARG_PROTOTYPES)
+    va_start(vargs, fmt);
+#else
+    va_start(vargs);
+#endif
+    vsnprintf(msg, 200, fmt, vargs);
+    va_end(vargs);
+    Py_FatalError(msg);
+}
+static CYTHON_INLINE int
+__pyx_add_acquisition_count_locked(__pyx_atomic_int *acquisition_count,
+                                   PyThread_type_lock lock)
+{
+    int result;
+    PyThread_acquire_lock(lock, 1);
+    result = (*acquisition_count)++;
+    PyThread_release_lock(lock);
+    return result;
+}
+static CYTHON_INLINE int
+__pyx_sub_acquisition_count_locked(__pyx_atomic_int *acquisition_count,
+                                   PyThread_type_lock lock)
+{
+    int result;
+    PyThread_acquire_lock(lock, 1);
+    result = (*acquisition_count)--;
+    PyThread_release_lock(lock);
+    return result;
+}
+static CYTHON_INLINE void
+__Pyx_INC_MEMVIEW(__Pyx_memviewslice *memslice, int have_gil, int lineno)
+{
+    int first_time;
+    struct __pyx_memoryview_obj *memview = memslice->memview;
+    if (unlikely(!memview || (PyObject *) memview == Py_None))
+        return;
+    if (unlikely(__pyx_get_slice_count(memview) < 0))
+        __pyx_fatalerror("Acquisition count is %d (line %d)",
+                         __pyx_get_slice_count(memview), lineno);
+    first_time = __pyx_add_acquisition_count(memview) == 0;
+    if (unlikely(first_time)) {
+        if (have_gil) {
+            Py_INCREF((PyObject *) memview);
+        } else {
+            PyGILState_STATE _gilstate = PyGILState_Ensure();
+            Py_INCREF((PyObject *) memview);
+            PyGILState_Release(_gilstate);
+        }
+    }
+}
+static CYTHON_INLINE void __Pyx_XDEC_MEMVIEW(__Pyx_memviewslice *memslice,
+                                             int have_gil, int lineno) {
+    int last_time;
+    struct __pyx_memoryview_obj *memview = memslice->memview;
+    if (unlikely(!memview || (PyObject *) memview == Py_None)) {
+        memslice->memview = NULL;
+        return;
+    }
+    if (unlikely(__pyx_get_slice_count(memview) <= 0))
+        __pyx_fatalerror("Acquisition count is %d (line %d)",
+                         __pyx_get_slice_count(memview), lineno);
+    last_time = __pyx_sub_acquisition_count(memview) == 1;
+    memslice->data = NULL;
+    if (unlikely(last_time)) {
+        if (have_gil) {
+            Py_CLEAR(memslice->memview);
+        } else {
+            PyGILState_STATE _gilstate = PyGILState_Ensure();
+            Py_CLEAR(memslice->memview);
+            PyGILState_Release(_gilstate);
+        }
+    } else {
+        memslice->memview = NULL;
     }
-    return (inplace ? PyNumber_InPlaceAdd : PyNumber_Add)(op1, op2);
 }
-#endif
 
 /* PyCFunctionFastCall */
 #if CYTHON_FAST_PYCCALL
@@ -20468,138 +20707,6 @@ static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObjec
 }
 #endif
 
-/* MemviewSliceInit */
-static int
-__Pyx_init_memviewslice(struct __pyx_memoryview_obj *memview,
-                        int ndim,
-                        __Pyx_memviewslice *memviewslice,
-                        int memview_is_new_reference)
-{
-    __Pyx_RefNannyDeclarations
-    int i, retval=-1;
-    Py_buffer *buf = &memview->view;
-    __Pyx_RefNannySetupContext("init_memviewslice", 0);
-    if (unlikely(memviewslice->memview || memviewslice->data)) {
-        PyErr_SetString(PyExc_ValueError,
-            "memviewslice is already initialized!");
-        goto fail;
-    }
-    if (buf->strides) {
-        for (i = 0; i < ndim; i++) {
-            memviewslice->strides[i] = buf->strides[i];
-        }
-    } else {
-        Py_ssize_t stride = buf->itemsize;
-        for (i = ndim - 1; i >= 0; i--) {
-            memviewslice->strides[i] = stride;
-            stride *= buf->shape[i];
-        }
-    }
-    for (i = 0; i < ndim; i++) {
-        memviewslice->shape[i]   = buf->shape[i];
-        if (buf->suboffsets) {
-            memviewslice->suboffsets[i] = buf->suboffsets[i];
-        } else {
-            memviewslice->suboffsets[i] = -1;
-        }
-    }
-    memviewslice->memview = memview;
-    memviewslice->data = (char *)buf->buf;
-    if (__pyx_add_acquisition_count(memview) == 0 && !memview_is_new_reference) {
-        Py_INCREF(memview);
-    }
-    retval = 0;
-    goto no_fail;
-fail:
-    memviewslice->memview = 0;
-    memviewslice->data = 0;
-    retval = -1;
-no_fail:
-    __Pyx_RefNannyFinishContext();
-    return retval;
-}
-#ifndef Py_NO_RETURN
-#define Py_NO_RETURN
-#endif
-static void __pyx_fatalerror(const char *fmt, ...) Py_NO_RETURN {
-    va_list vargs;
-    char msg[200];
-#if PY_VERSION_HEX >= 0x030A0000 || defined(HAVE_STDARG_PROTOTYPES)
-    va_start(vargs, fmt);
-#else
-    va_start(vargs);
-#endif
-    vsnprintf(msg, 200, fmt, vargs);
-    va_end(vargs);
-    Py_FatalError(msg);
-}
-static CYTHON_INLINE int
-__pyx_add_acquisition_count_locked(__pyx_atomic_int *acquisition_count,
-                                   PyThread_type_lock lock)
-{
-    int result;
-    PyThread_acquire_lock(lock, 1);
-    result = (*acquisition_count)++;
-    PyThread_release_lock(lock);
-    return result;
-}
-static CYTHON_INLINE int
-__pyx_sub_acquisition_count_locked(__pyx_atomic_int *acquisition_count,
-                                   PyThread_type_lock lock)
-{
-    int result;
-    PyThread_acquire_lock(lock, 1);
-    result = (*acquisition_count)--;
-    PyThread_release_lock(lock);
-    return result;
-}
-static CYTHON_INLINE void
-__Pyx_INC_MEMVIEW(__Pyx_memviewslice *memslice, int have_gil, int lineno)
-{
-    int first_time;
-    struct __pyx_memoryview_obj *memview = memslice->memview;
-    if (unlikely(!memview || (PyObject *) memview == Py_None))
-        return;
-    if (unlikely(__pyx_get_slice_count(memview) < 0))
-        __pyx_fatalerror("Acquisition count is %d (line %d)",
-                         __pyx_get_slice_count(memview), lineno);
-    first_time = __pyx_add_acquisition_count(memview) == 0;
-    if (unlikely(first_time)) {
-        if (have_gil) {
-            Py_INCREF((PyObject *) memview);
-        } else {
-            PyGILState_STATE _gilstate = PyGILState_Ensure();
-            Py_INCREF((PyObject *) memview);
-            PyGILState_Release(_gilstate);
-        }
-    }
-}
-static CYTHON_INLINE void __Pyx_XDEC_MEMVIEW(__Pyx_memviewslice *memslice,
-                                             int have_gil, int lineno) {
-    int last_time;
-    struct __pyx_memoryview_obj *memview = memslice->memview;
-    if (unlikely(!memview || (PyObject *) memview == Py_None)) {
-        memslice->memview = NULL;
-        return;
-    }
-    if (unlikely(__pyx_get_slice_count(memview) <= 0))
-        __pyx_fatalerror("Acquisition count is %d (line %d)",
-                         __pyx_get_slice_count(memview), lineno);
-    last_time = __pyx_sub_acquisition_count(memview) == 1;
-    memslice->data = NULL;
-    if (unlikely(last_time)) {
-        if (have_gil) {
-            Py_CLEAR(memslice->memview);
-        } else {
-            PyGILState_STATE _gilstate = PyGILState_Ensure();
-            Py_CLEAR(memslice->memview);
-            PyGILState_Release(_gilstate);
-        }
-    } else {
-        memslice->memview = NULL;
-    }
-}
-
 /* GetItemInt */
 static PyObject *__Pyx_GetItemInt_Generic(PyObject *o, PyObject* j) {
     PyObject *r;
@@ -22851,7 +22958,7 @@ no_fail:
 }
 
 /* ObjectToMemviewSlice */
-  static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_float32_t(PyObject *obj, int writable_flag) {
+  static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_uint8_t(PyObject *obj, int writable_flag) {
     __Pyx_memviewslice result = { 0, 0, { 0 }, { 0 }, { 0 } };
     __Pyx_BufFmt_StackElem stack[1];
     int axes_specs[] = { (__Pyx_MEMVIEW_DIRECT | __Pyx_MEMVIEW_STRIDED) };
@@ -22862,7 +22969,7 @@ no_fail:
     }
     retcode = __Pyx_ValidateAndInit_memviewslice(axes_specs, 0,
                                                  PyBUF_RECORDS_RO | writable_flag, 1,
-                                                 &__Pyx_TypeInfo_nn___pyx_t_5numpy_float32_t, stack,
+                                                 &__Pyx_TypeInfo_nn___pyx_t_5numpy_uint8_t, stack,
                                                  &result, obj);
     if (unlikely(retcode == -1))
         goto __pyx_fail;
@@ -22874,7 +22981,7 @@ __pyx_fail:
 }
 
 /* ObjectToMemviewSlice */
-  static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_uint8_t(PyObject *obj, int writable_flag) {
+  static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_ds_nn___pyx_t_5numpy_float32_t(PyObject *obj, int writable_flag) {
     __Pyx_memviewslice result = { 0, 0, { 0 }, { 0 }, { 0 } };
     __Pyx_BufFmt_StackElem stack[1];
     int axes_specs[] = { (__Pyx_MEMVIEW_DIRECT | __Pyx_MEMVIEW_STRIDED) };
@@ -22885,7 +22992,7 @@ __pyx_fail:
     }
     retcode = __Pyx_ValidateAndInit_memviewslice(axes_specs, 0,
                                                  PyBUF_RECORDS_RO | writable_flag, 1,
-                                                 &__Pyx_TypeInfo_nn___pyx_t_5numpy_uint8_t, stack,
+                                                 &__Pyx_TypeInfo_nn___pyx_t_5numpy_float32_t, stack,
                                                  &result, obj);
     if (unlikely(retcode == -1))
         goto __pyx_fail;
@@ -23489,44 +23596,6 @@ raise_neg_overflow:
     return (unsigned int) -1;
 }
 
-/* CIntToPy */
-  static CYTHON_INLINE PyObject* __Pyx_PyInt_From_unsigned_int(unsigned int value) {
-#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
-#pragma GCC diagnostic push
-#pragma GCC diagnostic ignored "-Wconversion"
-#endif
-    const unsigned int neg_one = (unsigned int) -1, const_zero = (unsigned int) 0;
-#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
-#pragma GCC diagnostic pop
-#endif
-    const int is_unsigned = neg_one > const_zero;
-    if (is_unsigned) {
-        if (sizeof(unsigned int) < sizeof(long)) {
-            return PyInt_FromLong((long) value);
-        } else if (sizeof(unsigned int) <= sizeof(unsigned long)) {
-            return PyLong_FromUnsignedLong((unsigned long) value);
-#ifdef HAVE_LONG_LONG
-        } else if (sizeof(unsigned int) <= sizeof(unsigned PY_LONG_LONG)) {
-            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
-#endif
-        }
-    } else {
-        if (sizeof(unsigned int) <= sizeof(long)) {
-            return PyInt_FromLong((long) value);
-#ifdef HAVE_LONG_LONG
-        } else if (sizeof(unsigned int) <= sizeof(PY_LONG_LONG)) {
-            return PyLong_FromLongLong((PY_LONG_LONG) value);
-#endif
-        }
-    }
-    {
-        int one = 1; int little = (int)*(unsigned char *)&one;
-        unsigned char *bytes = (unsigned char *)&value;
-        return _PyLong_FromByteArray(bytes, sizeof(unsigned int),
-                                     little, !is_unsigned);
-    }
-}
-
 /* CIntFromPy */
   static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *x) {
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
@@ -23723,6 +23792,44 @@ raise_neg_overflow:
     return (size_t) -1;
 }
 
+/* CIntToPy */
+  static CYTHON_INLINE PyObject* __Pyx_PyInt_From_unsigned_int(unsigned int value) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const unsigned int neg_one = (unsigned int) -1, const_zero = (unsigned int) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
+    const int is_unsigned = neg_one > const_zero;
+    if (is_unsigned) {
+        if (sizeof(unsigned int) < sizeof(long)) {
+            return PyInt_FromLong((long) value);
+        } else if (sizeof(unsigned int) <= sizeof(unsigned long)) {
+            return PyLong_FromUnsignedLong((unsigned long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(unsigned int) <= sizeof(unsigned PY_LONG_LONG)) {
+            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
+#endif
+        }
+    } else {
+        if (sizeof(unsigned int) <= sizeof(long)) {
+            return PyInt_FromLong((long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(unsigned int) <= sizeof(PY_LONG_LONG)) {
+            return PyLong_FromLongLong((PY_LONG_LONG) value);
+#endif
+        }
+    }
+    {
+        int one = 1; int little = (int)*(unsigned char *)&one;
+        unsigned char *bytes = (unsigned char *)&value;
+        return _PyLong_FromByteArray(bytes, sizeof(unsigned int),
+                                     little, !is_unsigned);
+    }
+}
+
 /* CIntFromPy */
   static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *x) {
 #ifdef __Pyx_HAS_GCC_DIAGNOSTIC
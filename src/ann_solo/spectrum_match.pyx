@@ -64,6 +64,7 @@ def get_best_match(query, candidates, fragment_mz_tolerance, allow_shift):
     cdef vector[Spectrum*] candidates_vec
     cdef np.float32_t[:] mz, intensity
     cdef np.uint8_t[:] charge
+    cdef np.uint8_t* charge_ptr
     cdef unsigned int candidate_index
     cdef double score
     cdef vector[pair[uint, uint]] peak_matches
@@ -71,25 +72,43 @@ def get_best_match(query, candidates, fragment_mz_tolerance, allow_shift):
     try:
         # Convert the candidates.
         for candidate in candidates:
-            if not hasattr(candidate, 'charge'):
-                candidate.charge = np.zeros_like(
-                    candidate.annotation, dtype=np.uint8)
-                for index, annotation in enumerate(candidate.annotation):
-                    if annotation is not None:
-                        candidate.charge[index] = annotation.charge
-            mz = candidate.mz.astype(np.float32)
-            intensity = candidate.intensity.astype(np.float32)
-            charge = candidate.charge
+            # Library spectra can be matched against multiple queries
+            # concurrently, so their cached attributes are only assigned when
+            # they are complete.
+            # The peak charges are only used for shifted peak matching.
+            charge_ptr = NULL
+            if allow_shift_c:
+                if not hasattr(candidate, 'charge'):
+                    candidate_charge = np.zeros_like(
+                        candidate.annotation, dtype=np.uint8)
+                    for index, annotation in enumerate(candidate.annotation):
+                        if annotation is not None:
+                            candidate_charge[index] = annotation.charge
+                    candidate.charge = candidate_charge
+                charge = candidate.charge
+                charge_ptr = &charge[0]
+            # Library spectra are matched against many queries, so their
+            # single-precision peaks are converted only once. This also keeps
+            # the peak arrays alive while they are referenced by the C++
+            # spectra.
+            if not hasattr(candidate, 'mz_float32'):
+                candidate.intensity_float32 = candidate.intensity.astype(
+                    np.float32, copy=False)
+                candidate.mz_float32 = candidate.mz.astype(np.float32)
+            mz = candidate.mz_float32
+            intensity = candidate.intensity_float32
             candidates_vec.push_back(new Spectrum(
                 candidate.precursor_mz, candidate.precursor_charge,
-                len(candidate.mz), &mz[0], &intensity[0], &charge[0]))
-        mz = query.mz.astype(np.float32)
-        intensity = query.intensity.astype(np.float32)
-        query.charge = np.zeros_like(query.mz, dtype=np.uint8)
-        charge = query.charge
+                len(candidate.mz), &mz[0], &intensity[0], charge_ptr))
+        query_mz = query.mz.astype(np.float32)
+        query_intensity = query.intensity.astype(np.float32, copy=False)
+        mz = query_mz
+        intensity = query_intensity
+        # Only the candidate peaks are shifted, so the query peak charges are
+        # never used.
         query_spec = new Spectrum(
             query.precursor_mz, query.precursor_charge, len(query.mz),
-            &mz[0], &intensity[0], &charge[0])
+            &mz[0], &intensity[0], NULL)
         with nogil:
             query_matcher = new SpectrumMatcher()
             result = query_matcher.dot(query_spec, candidates_vec,
@@ -1,15 +1,41 @@
+import functools
 import math
-import warnings
-from typing import Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 
+import numba as nb
 import numpy as np
-import scipy.spatial.distance
-import scipy.special
-import scipy.stats
+from spectrum_utils.spectrum import MsmsSpectrum
 
 from ann_solo import spectrum
 
 
+_EPS = float(np.finfo(float).eps)
+_INV_PI = 1.0 / math.pi
+
+
+class _MatchedStats(NamedTuple):
+    abs_diff_sum: float
+    sq_diff_sum: float
+    max_abs_diff: float
+    min_int_sum: float
+    max_int_sum: float
+    canberra_sum: float
+    abs_int_sum: float
+    int_query_sum: float
+    int_library_sum: float
+    int_query_sq_sum: float
+    int_library_sq_sum: float
+    dot: float
+
+
+class _UnmatchedStats(NamedTuple):
+    n_peaks: int
+    int_sum: float
+    int_sq_sum: float
+    int_max: float
+    n_nonzero: int
+
+
 class SpectrumSimilarityCalculator:
     def __init__(
         self, ssm: spectrum.SpectrumSpectrumMatch, top: Optional[int] = None
@@ -26,33 +52,28 @@ class SpectrumSimilarityCalculator:
             The number of library peaks with highest intensity to consider. If
             `None`, all peaks are used.
         """
+        self._ssm = ssm
         self.mz_query = ssm.query_spectrum.mz
         self.int_query = ssm.query_spectrum.intensity
         self.mz_library = ssm.library_spectrum.mz
         self.int_library = ssm.library_spectrum.intensity
         self._top = top
         self._recalculate_norm = False
+        self._library_top = None
         if len(ssm.peak_matches) > 0:
-            self.matched_mz_query = self.mz_query[ssm.peak_matches[:, 0]]
-            self.matched_int_query = self.int_query[ssm.peak_matches[:, 0]]
-            self.matched_mz_library = self.mz_library[ssm.peak_matches[:, 1]]
-            self.matched_int_library = self.int_library[ssm.peak_matches[:, 1]]
-            self.unmatched_int_query = self.int_query[
-                np.setdiff1d(
-                    range(len(self.int_query)), ssm.peak_matches[:, 0], True
-                )
-            ]
-            library_unmatched_i = np.setdiff1d(
-                range(len(self.int_library)), ssm.peak_matches[:, 1], True
-            )
-            self.unmatched_int_library = self.int_library[library_unmatched_i]
+            self.matched_mz_query = ssm.query_matched_mz
+            self.matched_int_query = ssm.query_matched_intensity
+            self.matched_mz_library = ssm.library_matched_mz
+            self.matched_int_library = ssm.library_matched_intensity
             # Filter the peak matches by the `top` highest intensity peaks in
             # the library spectrum.
             if self._top is not None:
+                # Boolean lookup table of the `top` library peaks, shared by
+                # the matched and unmatched peak filtering.
                 library_top_i = np.argpartition(self.int_library, -top)[-top:]
-                mask = np.isin(
-                    ssm.peak_matches[:, 1], library_top_i, assume_unique=True
-                )
+                library_top = np.zeros(len(self.int_library), dtype=bool)
+                library_top[library_top_i] = True
+                mask = library_top[ssm.peak_matches_library]
                 # No matches remaining that include any of the `top` highest
                 # intensity peaks.
                 if not mask.any():
@@ -67,16 +88,140 @@ class SpectrumSimilarityCalculator:
                     self.matched_int_library = self.matched_int_library[mask]
                 # Also restrict the unmatched library peaks to the `top`
                 # highest intensity peaks.
-                mask_unmatched = np.isin(
-                    library_unmatched_i, library_top_i, assume_unique=True
-                )
-                self.unmatched_int_library = self.unmatched_int_library[
-                    mask_unmatched
-                ]
+                self._library_top = library_top
                 self._recalculate_norm = True
         else:
             self.matched_mz_query, self.matched_int_query = None, None
             self.matched_mz_library, self.matched_int_library = None, None
+        self.n_matches = (
+            len(self.matched_int_query)
+            if self.matched_int_query is not None
+            else 0
+        )
+        self.n_matches_pow4 = self.n_matches**4
+
+    # The intermediate values that are shared between multiple similarity
+    # measures are computed on first use. They are only valid if there are
+    # peak matches.
+
+    # Boolean masks of the unmatched peaks in both spectra. The masks without
+    # `top` filtering are shared with other calculators for the same SSM.
+
+    @property
+    def _query_unmatched(self) -> np.ndarray:
+        return self._ssm.query_unmatched
+
+    @functools.cached_property
+    def _library_unmatched(self) -> np.ndarray:
+        if self._library_top is not None:
+            return self._ssm.library_unmatched & self._library_top
+        return self._ssm.library_unmatched
+
+    @functools.cached_property
+    def unmatched_int_query(self) -> np.ndarray:
+        return self.int_query[self._query_unmatched]
+
+    @functools.cached_property
+    def unmatched_int_library(self) -> np.ndarray:
+        return self.int_library[self._library_unmatched]
+
+    # Accumulate the intensity sums in double precision.
+
+    @functools.cached_property
+    def int_query_sum(self) -> float:
+        return spectrum.get_intensity_sum(self._ssm.query_spectrum)
+
+    @functools.cached_property
+    def int_library_sum(self) -> float:
+        return spectrum.get_intensity_sum(self._ssm.library_spectrum)
+
+    @property
+    def matched_int_query_sum(self) -> float:
+        return self._intensity_stats.int_query_sum
+
+    @property
+    def matched_int_library_sum(self) -> float:
+        return self._intensity_stats.int_library_sum
+
+    # Summary statistics of the unmatched peaks are computed directly from the
+    # unmatched masks, without gathering the unmatched peaks.
+
+    @functools.cached_property
+    def _unmatched_query_stats(self) -> _UnmatchedStats:
+        return _UnmatchedStats(
+            *_unmatched_intensity_stats(self.int_query, self._query_unmatched)
+        )
+
+    @functools.cached_property
+    def _unmatched_library_stats(self) -> _UnmatchedStats:
+        return _UnmatchedStats(
+            *_unmatched_intensity_stats(
+                self.int_library, self._library_unmatched
+            )
+        )
+
+    # Without `top` filtering, the unmatched intensity sums follow from the
+    # total and matched intensity sums, without requiring the unmatched masks.
+
+    @property
+    def unmatched_int_query_sum(self) -> float:
+        if self._top is None:
+            return self.int_query_sum - self.matched_int_query_sum
+        return self._unmatched_query_stats.int_sum
+
+    @property
+    def unmatched_int_library_sum(self) -> float:
+        if self._top is None:
+            return self.int_library_sum - self.matched_int_library_sum
+        return self._unmatched_library_stats.int_sum
+
+    @functools.cached_property
+    def _intensity_stats(self) -> _MatchedStats:
+        return _MatchedStats(
+            *_matched_intensity_stats(
+                self.matched_int_query, self.matched_int_library
+            )
+        )
+
+    @property
+    def abs_diff_sum(self) -> float:
+        return self._intensity_stats.abs_diff_sum
+
+    @property
+    def sq_diff_sum(self) -> float:
+        return self._intensity_stats.sq_diff_sum
+
+    @property
+    def max_abs_diff(self) -> float:
+        return self._intensity_stats.max_abs_diff
+
+    @property
+    def min_int_sum(self) -> float:
+        return self._intensity_stats.min_int_sum
+
+    @property
+    def max_int_sum(self) -> float:
+        return self._intensity_stats.max_int_sum
+
+    @property
+    def canberra_sum(self) -> float:
+        return self._intensity_stats.canberra_sum
+
+    @property
+    def abs_int_sum(self) -> float:
+        return self._intensity_stats.abs_int_sum
+
+    @functools.cached_property
+    def _mz_diff_sums(self) -> Tuple[float, float]:
+        return _diff_sums(self.matched_mz_query, self.matched_mz_library)
+
+    @property
+    def mz_abs_diff_sum(self) -> float:
+        return self._mz_diff_sums[0]
+
+    @property
+    def mz_sq_diff_sum(self) -> float:
+        return self._mz_diff_sums[1]
 
     def cosine(self) -> float:
         """
@@ -94,14 +239,16 @@ class SpectrumSimilarityCalculator:
         """
         if self.matched_int_query is not None:
             if self._recalculate_norm:
-                norm = np.linalg.norm(self.matched_int_query) * np.linalg.norm(
-                    self.matched_int_library
+                norm = math.sqrt(
+                    self._intensity_stats.int_query_sq_sum
+                    * self._intensity_stats.int_library_sq_sum
                 )
+                # Undefined if all retained matched intensities are zero.
+                if norm == 0.0:
+                    return math.nan
             else:
                 norm = 1.0
-            return (
-                np.dot(self.matched_int_query, self.matched_int_library) / norm
-            )
+            return self._intensity_stats.dot / norm
         else:
             return 0.0
 
@@ -114,10 +261,7 @@ class SpectrumSimilarityCalculator:
         int
             The number of matching peaks between the two spectra.
         """
-        if self.matched_mz_query is not None:
-            return len(self.matched_mz_query)
-        else:
-            return 0
+        return self.n_matches
 
     def frac_n_peaks_query(self) -> float:
         """
@@ -135,7 +279,7 @@ class SpectrumSimilarityCalculator:
                 "filtering by the top intensity library peaks"
             )
         elif self.matched_mz_query is not None:
-            return len(self.matched_mz_query) / len(self.mz_query)
+            return self.n_matches / len(self.mz_query)
         else:
             return 0.0
 
@@ -153,10 +297,10 @@ class SpectrumSimilarityCalculator:
             if self._top is None:
                 n_peaks = len(self.mz_library)
             else:
-                n_peaks = len(self.matched_int_library) + len(
-                    self.unmatched_int_library
+                n_peaks = (
+                    self.n_matches + self._unmatched_library_stats.n_peaks
                 )
-            return len(self.matched_int_library) / n_peaks
+            return self.n_matches / n_peaks
         else:
             return 0.0
 
@@ -175,7 +319,7 @@ class SpectrumSimilarityCalculator:
                 " filtering by the top intensity library peaks"
             )
         elif self.matched_int_query is not None:
-            return self.matched_int_query.sum() / self.int_query.sum()
+            return self.matched_int_query_sum / self.int_query_sum
         else:
             return 0.0
 
@@ -190,13 +334,13 @@ class SpectrumSimilarityCalculator:
         """
         if self.matched_int_library is not None:
             if self._top is None:
-                total_int = self.int_library.sum()
+                total_int = self.int_library_sum
             else:
                 total_int = (
-                    self.matched_int_library.sum()
-                    + self.unmatched_int_library.sum()
+                    self.matched_int_library_sum
+                    + self.unmatched_int_library_sum
                 )
-            return self.matched_int_library.sum() / total_int
+            return self.matched_int_library_sum / total_int
         else:
             return 0.0
 
@@ -221,14 +365,13 @@ class SpectrumSimilarityCalculator:
         ValueError
             If the specified axis is not "mz" or "intensity".
         """
-        if axis == "mz":
-            arr1, arr2 = self.matched_mz_query, self.matched_mz_library
-        elif axis == "intensity":
-            arr1, arr2 = self.matched_int_query, self.matched_int_library
-        else:
+        if axis not in ("mz", "intensity"):
             raise ValueError("Unknown axis specified")
-        if arr1 is not None and arr2 is not None:
-            return ((arr1 - arr2) ** 2).sum() / len(arr1)
+        elif self.matched_int_query is not None:
+            sq_diff_sum = (
+                self.mz_sq_diff_sum if axis == "mz" else self.sq_diff_sum
+            )
+            return sq_diff_sum / self.n_matches
         else:
             return np.inf
 
@@ -246,7 +389,8 @@ class SpectrumSimilarityCalculator:
         float
             The spectral contrast angle between the two spectra.
         """
-        return 1.0 - 2 * np.arccos(np.clip(self.cosine(), 0.0, 1.0)) / np.pi
+        cosine = min(max(self.cosine(), 0.0), 1.0)
+        return 1.0 - 2 * math.acos(cosine) * _INV_PI
 
     def hypergeometric_score(
         self, min_mz: float, max_mz: float, fragment_mz_tol: float
@@ -280,30 +424,34 @@ class SpectrumSimilarityCalculator:
         """
         if self._top is not None:
             if self.matched_int_library is not None:
-                n_library_peaks = len(self.matched_int_library) + len(
-                    self.unmatched_int_library
+                n_library_peaks = (
+                    self.n_matches + self._unmatched_library_stats.n_peaks
                 )
             else:
                 n_library_peaks = self._top
         else:
             n_library_peaks = len(self.int_library)
-        n_matched_peaks = (
-            len(self.matched_mz_library)
-            if self.matched_mz_library is not None
-            else 0
-        )
         n_peak_bins, _, _ = spectrum.get_dim(min_mz, max_mz, fragment_mz_tol)
-        with np.errstate(divide="ignore"):
-            hgt_prob = 0
-            for i in range(n_matched_peaks + 1, n_library_peaks + 1):
-                hgt_prob += (
-                    scipy.special.comb(n_library_peaks, i)
-                    * scipy.special.comb(
-                        n_peak_bins - n_library_peaks, n_library_peaks - i
-                    )
-                ) / scipy.special.comb(n_peak_bins, n_library_peaks)
-            # Guard against infinity for identical spectra.
-            return min(-np.log(hgt_prob), 100.0)
+        # The first term of the hypergeometric tail that can be non-zero.
+        i_start = max(
+            self.n_matches + 1, 2 * n_library_peaks - n_peak_bins
+        )
+        # Guard against infinity for identical spectra.
+        if i_start > n_library_peaks:
+            return 100.0
+        # Log-probability of the first tail term, the subsequent terms are
+        # derived from their ratio to the previous term.
+        log_term_start = (
+            _log_comb(n_library_peaks, i_start)
+            + _log_comb(
+                n_peak_bins - n_library_peaks, n_library_peaks - i_start
+            )
+            - _log_comb(n_peak_bins, n_library_peaks)
+        )
+        hgt_tail = _hypergeometric_tail(
+            n_peak_bins, n_library_peaks, i_start
+        )
+        return min(-(log_term_start + math.log(hgt_tail)), 100.0)
 
     def kendalltau(self) -> float:
         """
@@ -323,9 +471,11 @@ class SpectrumSimilarityCalculator:
             The negative logarithm of the Kendall-Tau p-value of peak matches
             between the two spectra.
         """
-        pvalue = scipy.stats.kendalltau(
+        if self.matched_int_query is None:
+            return 0.0
+        pvalue = _kendalltau_pvalue(
             self.matched_int_query, self.matched_int_library
-        )[1]
+        )
         # The Kendall Tau correlation is undefined for constant input
         # arrays (in the degenerate case consisting of only 0 or 1 elements).
         return -np.log(pvalue) if not np.isnan(pvalue) else 0.0
@@ -353,17 +503,11 @@ class SpectrumSimilarityCalculator:
                 n_peaks_query = n_peaks_library = self._top
             # Guard against extreme values for identical spectra.
             return min(
-                len(self.matched_int_query) ** 4
+                self.n_matches_pow4
                 / (
                     n_peaks_query
                     * n_peaks_library
-                    * max(
-                        np.abs(
-                            self.matched_int_query - self.matched_int_library
-                        ).sum(),
-                        np.finfo(float).eps,
-                    )
-                    ** 0.25
+                    * _fourth_root(max(self.abs_diff_sum, _EPS))
                 ),
                 1000.0,
             )
@@ -392,15 +536,13 @@ class SpectrumSimilarityCalculator:
                 " by the top intensity library peaks"
             )
         elif self.matched_int_query is not None:
+            int_sum = self.int_query_sum + 2 * self.int_library_sum
             return (
-                len(self.matched_int_query) ** 4
-                * (self.int_query.sum() + 2 * self.int_library.sum()) ** 1.25
+                self.n_matches_pow4 * int_sum * _fourth_root(int_sum)
             ) / (
                 (len(self.mz_query) + 2 * len(self.mz_library)) ** 2
-                + np.abs(
-                    self.matched_int_query - self.matched_int_library
-                ).sum()
-                + np.abs(self.matched_mz_query - self.matched_mz_library).sum()
+                + self.abs_diff_sum
+                + self.mz_abs_diff_sum
             )
         else:
             return 0.0
@@ -423,9 +565,9 @@ class SpectrumSimilarityCalculator:
         # unmatched intensities in the query and library spectrum.
         elif self.matched_int_query is not None:
             return (
-                np.abs(self.matched_int_query - self.matched_int_library).sum()
-                + self.unmatched_int_query.sum()
-                + self.unmatched_int_library.sum()
+                self.abs_diff_sum
+                + self.unmatched_int_query_sum
+                + self.unmatched_int_library_sum
             )
         else:
             return np.inf
@@ -447,12 +589,10 @@ class SpectrumSimilarityCalculator:
         # Distance between the intensities of matching peaks, as well as the
         # unmatched intensities in the query and library spectrum.
         elif self.matched_int_query is not None:
-            return np.sqrt(
-                (
-                    (self.matched_int_query - self.matched_int_library) ** 2
-                ).sum()
-                + (self.unmatched_int_query**2).sum()
-                + (self.unmatched_int_library**2).sum()
+            return math.sqrt(
+                self.sq_diff_sum
+                + self._unmatched_query_stats.int_sq_sum
+                + self._unmatched_library_stats.int_sq_sum
             )
         else:
             return np.inf
@@ -475,15 +615,9 @@ class SpectrumSimilarityCalculator:
         # unmatched intensities in the query and library spectrum.
         elif self.matched_int_query is not None:
             return max(
-                np.abs(
-                    self.matched_int_query - self.matched_int_library
-                ).max(),
-                self.unmatched_int_query.max()
-                if len(self.unmatched_int_query) > 0
-                else 0.0,
-                self.unmatched_int_library.max()
-                if len(self.unmatched_int_library) > 0
-                else 0.0,
+                self.max_abs_diff,
+                self._unmatched_query_stats.int_max,
+                self._unmatched_library_stats.int_max,
             )
         else:
             return np.inf
@@ -498,19 +632,12 @@ class SpectrumSimilarityCalculator:
             The Pearson correlation of peak matches between the two spectra.
         """
         if self.matched_int_query is not None:
-            int_query = [
-                *self.matched_int_query,
-                *np.zeros_like(self.unmatched_int_library),
-            ]
-            int_library = [
-                *self.matched_int_library,
-                *self.unmatched_int_library,
-            ]
-            with warnings.catch_warnings():
-                warnings.simplefilter(
-                    "ignore", scipy.stats.PearsonRConstantInputWarning
-                )
-                corr = scipy.stats.pearsonr(int_query, int_library)[0]
+            corr = _matched_pearson(
+                self.matched_int_query,
+                self.matched_int_library,
+                self.int_library,
+                self._library_unmatched,
+            )
             return corr if not np.isnan(corr) else 0.0
         else:
             return 0.0
@@ -525,19 +652,12 @@ class SpectrumSimilarityCalculator:
             The Spearman correlation of peak matches between the two spectra.
         """
         if self.matched_int_query is not None:
-            int_query = [
-                *self.matched_int_query,
-                *np.zeros_like(self.unmatched_int_library),
-            ]
-            int_library = [
-                *self.matched_int_library,
-                *self.unmatched_int_library,
-            ]
-            with warnings.catch_warnings():
-                warnings.simplefilter(
-                    "ignore", scipy.stats.SpearmanRConstantInputWarning
-                )
-                corr = scipy.stats.spearmanr(int_query, int_library)[0]
+            corr = _matched_spearman(
+                self.matched_int_query,
+                self.matched_int_library,
+                self.int_library,
+                self._library_unmatched,
+            )
             return corr if not np.isnan(corr) else 0.0
         else:
             return 0.0
@@ -557,16 +677,11 @@ class SpectrumSimilarityCalculator:
                 "the top intensity library peaks"
             )
         elif self.matched_int_query is not None:
-            unmatched_int_query_sum = self.unmatched_int_query.sum()
-            unmatched_int_library_sum = self.unmatched_int_library.sum()
-            return (
-                np.abs(self.matched_int_query - self.matched_int_library).sum()
-                + unmatched_int_query_sum
-                + unmatched_int_library_sum
-            ) / (
-                np.abs(self.matched_int_query + self.matched_int_library).sum()
-                + unmatched_int_query_sum
-                + unmatched_int_library_sum
+            unmatched_sum = (
+                self.unmatched_int_query_sum + self.unmatched_int_library_sum
+            )
+            return (self.abs_diff_sum + unmatched_sum) / (
+                self.abs_int_sum + unmatched_sum
             )
         else:
             return 1.0
@@ -587,13 +702,9 @@ class SpectrumSimilarityCalculator:
             )
         elif self.matched_int_query is not None:
             return (
-                np.nan_to_num(
-                    np.abs(self.matched_int_query - self.matched_int_library)
-                    / (self.matched_int_query + self.matched_int_library),
-                    copy=False,
-                ).sum()
-                + np.count_nonzero(self.unmatched_int_query)
-                + np.count_nonzero(self.unmatched_int_library)
+                self.canberra_sum
+                + self._unmatched_query_stats.n_nonzero
+                + self._unmatched_library_stats.n_nonzero
             )
         else:
             return np.inf
@@ -613,14 +724,10 @@ class SpectrumSimilarityCalculator:
                 "top intensity library peaks"
             )
         elif self.matched_int_query is not None:
-            return np.sum(
-                np.minimum(self.matched_int_query, self.matched_int_library)
-            ) / (
-                np.maximum(
-                    self.matched_int_query, self.matched_int_library
-                ).sum()
-                + self.unmatched_int_query.sum()
-                + self.unmatched_int_library.sum()
+            return self.min_int_sum / (
+                self.max_int_sum
+                + self.unmatched_int_query_sum
+                + self.unmatched_int_library_sum
             )
         else:
             return 0.0
@@ -640,11 +747,11 @@ class SpectrumSimilarityCalculator:
         """
         if self.matched_int_query is not None:
             denominator = (
-                (self.matched_int_query - self.matched_int_library) ** 2
-            ).sum() + (self.unmatched_int_library**2).sum()
+                self.sq_diff_sum + self._unmatched_library_stats.int_sq_sum
+            )
             # Guard against divide by zero for identical spectra.
             if not math.isclose(denominator, 0.0):
-                return np.log(1 / denominator)
+                return -math.log(denominator)
             else:
                 return 10.0
         else:
@@ -674,32 +781,276 @@ class SpectrumSimilarityCalculator:
                 "The spectral entropy is not defined when filtering by the "
                 "top intensity library peaks"
             )
+        elif self.matched_int_query is not None and not weighted:
+            return _unweighted_entropy_similarity(
+                *_get_entropy_sums(self._ssm.query_spectrum),
+                *_get_entropy_sums(self._ssm.library_spectrum),
+                self.matched_int_query,
+                self.matched_int_library,
+            )
         elif self.matched_int_query is not None:
             # Entropy of the individual spectra.
-            query_entropy = _spectrum_entropy(self.int_query, weighted)
-            library_entropy = _spectrum_entropy(self.int_library, weighted)
+            query_entropy = _get_weighted_entropy(self._ssm.query_spectrum)
+            library_entropy = _get_weighted_entropy(
+                self._ssm.library_spectrum
+            )
             # Entropy of the merged spectrum.
-            int_merged = (
-                np.hstack(
-                    [
-                        # Element-wise summed intensities of the matched peaks.
-                        self.matched_int_query + self.matched_int_library,
-                        # Intensities of the unmatched query and library peaks.
-                        self.unmatched_int_query,
-                        self.unmatched_int_library,
-                    ]
-                )
-                / 2
+            merged_entropy = _merged_spectrum_entropy(
+                self.int_query,
+                self.int_library,
+                self.matched_int_query,
+                self.matched_int_library,
+                self._query_unmatched,
+                self._library_unmatched,
+                weighted,
             )
-            merged_entropy = _spectrum_entropy(int_merged, weighted)
 
             return 1 - (
                 2 * merged_entropy - query_entropy - library_entropy
-            ) / np.log(4)
+            ) / math.log(4)
         else:
             return 0.0
 
 
+def batch_scores(
+    ssms: Sequence[spectrum.SpectrumSpectrumMatch], metrics: Iterable[str]
+) -> Dict[str, np.ndarray]:
+    """
+    Compute spectrum similarities for multiple SSMs at once.
+
+    The peak intensities of all SSMs are concatenated into flat arrays with
+    CSR-style offsets, so that each similarity is computed using a single
+    vectorized segmented reduction over all SSMs instead of instantiating a
+    `SpectrumSimilarityCalculator` per SSM.
+
+    Parameters
+    ----------
+    ssms : Sequence[spectrum.SpectrumSpectrumMatch]
+        The SSMs for which to compute the similarities.
+    metrics : Iterable[str]
+        The similarities to compute. Supported similarities are "cosine",
+        "manhattan", "euclidean", "chebyshev", "braycurtis", "ruzicka",
+        "entropy_unweighted", and "entropy_weighted".
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        A dictionary with as keys the requested similarities and as values
+        arrays with the similarity for each SSM. The values are identical to
+        the corresponding `SpectrumSimilarityCalculator` methods (without
+        `top` filtering).
+
+    Raises
+    ------
+    ValueError
+        If an unknown similarity is specified.
+    """
+    metrics = list(metrics)
+    for metric in metrics:
+        if metric not in _BATCH_METRICS:
+            raise ValueError(f"Unknown similarity specified: {metric}")
+    # SSMs without peak matches get the default similarity values, and their
+    # spectra are excluded from the concatenated arrays entirely.
+    has_matches = np.fromiter(
+        (len(ssm.peak_matches) > 0 for ssm in ssms), bool, len(ssms)
+    )
+    ssms = [ssm for ssm, matches in zip(ssms, has_matches) if matches]
+    n_matches = np.fromiter(
+        (len(ssm.peak_matches) for ssm in ssms), np.int64, len(ssms)
+    )
+    n_peaks_query = np.fromiter(
+        (len(ssm.query_spectrum.intensity) for ssm in ssms),
+        np.int64,
+        len(ssms),
+    )
+    n_peaks_library = np.fromiter(
+        (len(ssm.library_spectrum.intensity) for ssm in ssms),
+        np.int64,
+        len(ssms),
+    )
+    query_offsets = _offsets(n_peaks_query)
+    library_offsets = _offsets(n_peaks_library)
+    match_offsets = _offsets(n_matches)
+    int_query = _concatenate(
+        [ssm.query_spectrum.intensity for ssm in ssms], np.float64
+    )
+    int_library = _concatenate(
+        [ssm.library_spectrum.intensity for ssm in ssms], np.float64
+    )
+    matched_int_query = _concatenate(
+        [ssm.query_matched_intensity for ssm in ssms], np.float64
+    )
+    matched_int_library = _concatenate(
+        [ssm.library_matched_intensity for ssm in ssms], np.float64
+    )
+    matched_query_sum = _segment_sum(matched_int_query, n_matches)
+    matched_library_sum = _segment_sum(matched_int_library, n_matches)
+    unmatched_sum = (
+        _segment_sum(int_query, n_peaks_query)
+        - matched_query_sum
+        + _segment_sum(int_library, n_peaks_library)
+        - matched_library_sum
+    )
+    diff = matched_int_query - matched_int_library
+    abs_diff_sum = _segment_sum(np.abs(diff), n_matches)
+    if "euclidean" in metrics or "chebyshev" in metrics:
+        # The intensities of the unmatched peaks, with 0 for matched peaks.
+        unmatched_int_query = int_query * _concatenate(
+            [ssm.query_unmatched for ssm in ssms], bool
+        )
+        unmatched_int_library = int_library * _concatenate(
+            [ssm.library_unmatched for ssm in ssms], bool
+        )
+
+    scores = {}
+    for metric in metrics:
+        if metric == "cosine":
+            score = _segment_dot(
+                matched_int_query, matched_int_library, match_offsets
+            )
+            default = 0.0
+        elif metric == "manhattan":
+            score = abs_diff_sum + unmatched_sum
+            default = np.inf
+        elif metric == "euclidean":
+            score = np.sqrt(
+                _segment_dot(diff, diff, match_offsets)
+                + _segment_dot(
+                    unmatched_int_query, unmatched_int_query, query_offsets
+                )
+                + _segment_dot(
+                    unmatched_int_library,
+                    unmatched_int_library,
+                    library_offsets,
+                )
+            )
+            default = np.inf
+        elif metric == "chebyshev":
+            # Independent maximum reductions over the matched intensity
+            # differences and the unmatched intensities, with 0 as the
+            # maximum of empty segments.
+            score = np.maximum.reduce(
+                [
+                    _segment_max(np.abs(diff), n_matches),
+                    _segment_max(unmatched_int_query, n_peaks_query),
+                    _segment_max(unmatched_int_library, n_peaks_library),
+                ]
+            )
+            default = np.inf
+        elif metric == "braycurtis":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                score = (abs_diff_sum + unmatched_sum) / (
+                    matched_query_sum + matched_library_sum + unmatched_sum
+                )
+            default = 1.0
+        elif metric == "ruzicka":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                score = _segment_sum(
+                    np.minimum(matched_int_query, matched_int_library),
+                    n_matches,
+                ) / (
+                    _segment_sum(
+                        np.maximum(matched_int_query, matched_int_library),
+                        n_matches,
+                    )
+                    + unmatched_sum
+                )
+            default = 0.0
+        else:
+            score = _batch_entropy(
+                int_query,
+                query_offsets,
+                int_library,
+                library_offsets,
+                _concatenate(
+                    [ssm.peak_matches_query for ssm in ssms], np.int32
+                ),
+                _concatenate(
+                    [ssm.peak_matches_library for ssm in ssms], np.int32
+                ),
+                match_offsets,
+                metric == "entropy_weighted",
+            )
+            default = 0.0
+        scores[metric] = np.full(len(has_matches), default)
+        scores[metric][has_matches] = score
+    return scores
+
+
+_BATCH_METRICS = (
+    "cosine",
+    "manhattan",
+    "euclidean",
+    "chebyshev",
+    "braycurtis",
+    "ruzicka",
+    "entropy_unweighted",
+    "entropy_weighted",
+)
+
+
+def _get_weighted_entropy(spec: MsmsSpectrum) -> float:
+    """
+    Get the weighted entropy of a spectrum, cached if it is processed.
+
+    Parameters
+    ----------
+    spec : MsmsSpectrum
+        The spectrum whose weighted entropy is computed.
+
+    Returns
+    -------
+    float
+        The weighted entropy of the spectrum.
+    """
+    return spectrum.get_processed_cached(
+        spec,
+        "weighted_entropy",
+        lambda s: _spectrum_entropy(s.intensity, True),
+    )
+
+
+def _get_entropy_sums(spec: MsmsSpectrum) -> Tuple[float, float]:
+    """
+    Get the sums from which the unweighted entropy of a spectrum is computed,
+    cached if it is processed.
+
+    Parameters
+    ----------
+    spec : MsmsSpectrum
+        The spectrum whose entropy sums are computed.
+
+    Returns
+    -------
+    Tuple[float, float]
+        The sum of the peak intensities and the sum of x * log(x) of the peak
+        intensities x.
+    """
+    return spectrum.get_processed_cached(
+        spec, "entropy_sums", lambda s: _entropy_sums(s.intensity, 1.0)
+    )
+
+
+def _fourth_root(x: float) -> float:
+    """
+    Compute the fourth root of a non-negative number.
+
+    Two square roots are considerably cheaper than `x ** 0.25`.
+
+    Parameters
+    ----------
+    x : float
+        The non-negative number.
+
+    Returns
+    -------
+    float
+        The fourth root of the number.
+    """
+    return math.sqrt(math.sqrt(x))
+
+
+@nb.njit(cache=True, nogil=True)
 def _spectrum_entropy(
     spectrum_intensity: np.ndarray, weighted: bool = False
 ) -> float:
@@ -718,13 +1069,1064 @@ def _spectrum_entropy(
     float
         The entropy of the given spectrum.
     """
-    weight_start, entropy_cutoff = 0.25, 3
-    weight_slope = (1 - weight_start) / entropy_cutoff
-    spec_entropy = scipy.stats.entropy(spectrum_intensity)
-    if not weighted or spec_entropy > entropy_cutoff:
+    spec_entropy = _weighted_entropy(spectrum_intensity, 1.0)
+    if not weighted:
         return spec_entropy
+    weight = _entropy_weight(spec_entropy)
+    if weight == 1.0:
+        return spec_entropy
+    return _weighted_entropy(spectrum_intensity, weight)
+
+
+@nb.njit(cache=True, nogil=True)
+def _merged_spectrum_entropy(
+    int_query: np.ndarray,
+    int_library: np.ndarray,
+    matched_int_query: np.ndarray,
+    matched_int_library: np.ndarray,
+    query_unmatched: np.ndarray,
+    library_unmatched: np.ndarray,
+    weighted: bool = False,
+) -> float:
+    """
+    Compute the entropy of the merged spectrum of two spectra.
+
+    The merged spectrum consists of the summed intensities of the matched
+    peaks and the intensities of the unmatched peaks. As the entropy is scale
+    invariant, this is equivalent to averaging the two spectra. The entropy is
+    computed directly from the separate peak segments, with the unmatched
+    peaks selected by their masks, without materializing the merged spectrum
+    or gathering the unmatched peaks.
+
+    Parameters
+    ----------
+    int_query : np.ndarray
+        The intensities of the query spectrum peaks.
+    int_library : np.ndarray
+        The intensities of the library spectrum peaks.
+    matched_int_query : np.ndarray
+        The intensities of the matched query peaks.
+    matched_int_library : np.ndarray
+        The intensities of the matched library peaks.
+    query_unmatched : np.ndarray
+        Boolean mask of the unmatched query peaks.
+    library_unmatched : np.ndarray
+        Boolean mask of the unmatched library peaks.
+    weighted : bool
+        Whether to use the unweighted or weighted version of entropy.
+
+    Returns
+    -------
+    float
+        The entropy of the merged spectrum.
+    """
+    spec_entropy = _weighted_merged_entropy(
+        int_query,
+        int_library,
+        matched_int_query,
+        matched_int_library,
+        query_unmatched,
+        library_unmatched,
+        1.0,
+    )
+    if not weighted:
+        return spec_entropy
+    weight = _entropy_weight(spec_entropy)
+    if weight == 1.0:
+        return spec_entropy
+    return _weighted_merged_entropy(
+        int_query,
+        int_library,
+        matched_int_query,
+        matched_int_library,
+        query_unmatched,
+        library_unmatched,
+        weight,
+    )
+
+
+@nb.njit(cache=True, nogil=True)
+def _unweighted_entropy_similarity(
+    query_sum: float,
+    query_log_sum: float,
+    library_sum: float,
+    library_log_sum: float,
+    matched_int_query: np.ndarray,
+    matched_int_library: np.ndarray,
+) -> float:
+    """
+    Compute the unweighted spectral entropy similarity from the entropy sums
+    of both spectra.
+
+    The entropy sums of the merged spectrum are derived from the entropy sums
+    of the individual spectra by replacing the terms of the matched peaks,
+    so that only the matched peaks need to be visited.
+
+    Parameters
+    ----------
+    query_sum : float
+        The sum of the query spectrum peak intensities.
+    query_log_sum : float
+        The sum of x * log(x) of the query spectrum peak intensities x.
+    library_sum : float
+        The sum of the library spectrum peak intensities.
+    library_log_sum : float
+        The sum of x * log(x) of the library spectrum peak intensities x.
+    matched_int_query : np.ndarray
+        The intensities of the matched query peaks.
+    matched_int_library : np.ndarray
+        The intensities of the matched library peaks.
+
+    Returns
+    -------
+    float
+        The unweighted spectral entropy similarity between the two spectra.
+    """
+    merged_log_sum = query_log_sum + library_log_sum
+    for i in range(len(matched_int_query)):
+        int_q, int_l = matched_int_query[i], matched_int_library[i]
+        if int_q > 0:
+            merged_log_sum -= int_q * math.log(int_q)
+        if int_l > 0:
+            merged_log_sum -= int_l * math.log(int_l)
+        if int_q + int_l > 0:
+            merged_log_sum += (int_q + int_l) * math.log(int_q + int_l)
+    query_entropy = _entropy_from_sums(query_sum, query_log_sum)
+    library_entropy = _entropy_from_sums(library_sum, library_log_sum)
+    merged_entropy = _entropy_from_sums(
+        query_sum + library_sum, merged_log_sum
+    )
+    return 1 - (
+        2 * merged_entropy - query_entropy - library_entropy
+    ) / math.log(4)
+
+
+@nb.njit(cache=True, nogil=True)
+def _entropy_weight(spec_entropy: float) -> float:
+    """
+    Get the intensity weight for the weighted spectral entropy.
+
+    Parameters
+    ----------
+    spec_entropy : float
+        The unweighted entropy of the spectrum.
+
+    Returns
+    -------
+    float
+        The exponent with which the peak intensities are weighted, or 1 if
+        the entropy exceeds the cutoff and no weighting is applied.
+    """
+    weight_start, entropy_cutoff = 0.25, 3
+    if spec_entropy > entropy_cutoff:
+        return 1.0
+    return weight_start + (1 - weight_start) / entropy_cutoff * spec_entropy
+
+
+@nb.njit(cache=True, nogil=True)
+def _weighted_entropy(spectrum_intensity: np.ndarray, weight: float) -> float:
+    """
+    Compute the entropy of weighted spectrum peak intensities.
+
+    Parameters
+    ----------
+    spectrum_intensity : np.ndarray
+        The intensities of the spectrum peaks.
+    weight : float
+        The exponent with which the peak intensities are weighted.
+
+    Returns
+    -------
+    float
+        The entropy of the weighted peak intensities.
+    """
+    return _entropy_from_sums(*_entropy_sums(spectrum_intensity, weight))
+
+
+@nb.njit(cache=True, nogil=True)
+def _entropy_sums(
+    spectrum_intensity: np.ndarray, weight: float
+) -> Tuple[float, float]:
+    """
+    Compute the sums from which the entropy of weighted spectrum peak
+    intensities is computed.
+
+    Parameters
+    ----------
+    spectrum_intensity : np.ndarray
+        The intensities of the spectrum peaks.
+    weight : float
+        The exponent with which the peak intensities are weighted.
+
+    Returns
+    -------
+    Tuple[float, float]
+        The sum of the weighted intensities and the sum of x * log(x) of the
+        weighted intensities x.
+    """
+    int_sum, int_log_sum = 0.0, 0.0
+    for intensity in spectrum_intensity:
+        int_sum, int_log_sum = _accumulate_entropy(
+            intensity, weight, int_sum, int_log_sum
+        )
+    return int_sum, int_log_sum
+
+
+@nb.njit(cache=True, nogil=True)
+def _weighted_merged_entropy(
+    int_query: np.ndarray,
+    int_library: np.ndarray,
+    matched_int_query: np.ndarray,
+    matched_int_library: np.ndarray,
+    query_unmatched: np.ndarray,
+    library_unmatched: np.ndarray,
+    weight: float,
+) -> float:
+    """
+    Compute the entropy of the weighted merged spectrum peak intensities.
+
+    Parameters
+    ----------
+    int_query : np.ndarray
+        The intensities of the query spectrum peaks.
+    int_library : np.ndarray
+        The intensities of the library spectrum peaks.
+    matched_int_query : np.ndarray
+        The intensities of the matched query peaks.
+    matched_int_library : np.ndarray
+        The intensities of the matched library peaks.
+    query_unmatched : np.ndarray
+        Boolean mask of the unmatched query peaks.
+    library_unmatched : np.ndarray
+        Boolean mask of the unmatched library peaks.
+    weight : float
+        The exponent with which the peak intensities are weighted.
+
+    Returns
+    -------
+    float
+        The entropy of the weighted merged peak intensities.
+    """
+    int_sum, int_log_sum = 0.0, 0.0
+    for i in range(len(matched_int_query)):
+        int_sum, int_log_sum = _accumulate_entropy(
+            matched_int_query[i] + matched_int_library[i],
+            weight,
+            int_sum,
+            int_log_sum,
+        )
+    for i in range(len(int_query)):
+        if query_unmatched[i]:
+            int_sum, int_log_sum = _accumulate_entropy(
+                int_query[i], weight, int_sum, int_log_sum
+            )
+    for i in range(len(int_library)):
+        if library_unmatched[i]:
+            int_sum, int_log_sum = _accumulate_entropy(
+                int_library[i], weight, int_sum, int_log_sum
+            )
+    return _entropy_from_sums(int_sum, int_log_sum)
+
+
+@nb.njit(cache=True, nogil=True)
+def _accumulate_entropy(
+    intensity: float, weight: float, int_sum: float, int_log_sum: float
+) -> Tuple[float, float]:
+    """
+    Add a peak to the running sums from which the entropy is computed.
+
+    Parameters
+    ----------
+    intensity : float
+        The peak intensity.
+    weight : float
+        The exponent with which the peak intensity is weighted.
+    int_sum : float
+        The running sum of the weighted intensities.
+    int_log_sum : float
+        The running sum of x * log(x) of the weighted intensities x.
+
+    Returns
+    -------
+    Tuple[float, float]
+        The updated running sums. Non-positive intensities are skipped.
+    """
+    if intensity > 0:
+        log_intensity = math.log(intensity)
+        if weight != 1.0:
+            log_intensity *= weight
+            intensity = math.exp(log_intensity)
+        int_sum += intensity
+        int_log_sum += intensity * log_intensity
+    return int_sum, int_log_sum
+
+
+@nb.njit(cache=True, nogil=True)
+def _entropy_from_sums(int_sum: float, int_log_sum: float) -> float:
+    """
+    Compute the entropy of peak intensities from their running sums.
+
+    The intensities are normalized implicitly, using
+    H = log(S) - sum(x * log(x)) / S with S the total intensity, so that no
+    intermediate probability arrays need to be allocated.
+
+    Parameters
+    ----------
+    int_sum : float
+        The sum of the intensities.
+    int_log_sum : float
+        The sum of x * log(x) of the intensities x.
+
+    Returns
+    -------
+    float
+        The entropy, or NaN if the total intensity is zero.
+    """
+    if int_sum <= 0:
+        return np.nan
+    return math.log(int_sum) - int_log_sum / int_sum
+
+
+@nb.njit(cache=True, fastmath=True, nogil=True)
+def _matched_intensity_stats(
+    matched_int_query: np.ndarray, matched_int_library: np.ndarray
+) -> Tuple[float, ...]:
+    """
+    Compute summary statistics of the matched peak intensities in a single
+    pass.
+
+    Parameters
+    ----------
+    matched_int_query : np.ndarray
+        The intensities of the matched query peaks.
+    matched_int_library : np.ndarray
+        The intensities of the matched library peaks, in the same order as the
+        matched query peaks.
+
+    Returns
+    -------
+    Tuple[float, ...]
+        A tuple with (i) the sum of absolute intensity differences, (ii) the
+        sum of squared intensity differences, (iii) the maximum absolute
+        intensity difference, (iv) the sum of the element-wise minimum
+        intensities, (v) the sum of the element-wise maximum intensities,
+        (vi) the sum of the Canberra terms of the matched peaks, (vii) the
+        sum of absolute intensity sums, (viii) the sum of the query
+        intensities, (ix) the sum of the library intensities, (x) the sum of
+        the squared query intensities, (xi) the sum of the squared library
+        intensities, (xii) the dot product of the query and library
+        intensities.
+    """
+    abs_diff_sum, sq_diff_sum, max_abs_diff = 0.0, 0.0, 0.0
+    min_int_sum, max_int_sum, canberra_sum = 0.0, 0.0, 0.0
+    abs_int_sum, int_query_sum, int_library_sum = 0.0, 0.0, 0.0
+    int_query_sq_sum, int_library_sq_sum, dot = 0.0, 0.0, 0.0
+    for i in range(len(matched_int_query)):
+        # Compute in double precision, also for single precision intensities.
+        int_query = np.float64(matched_int_query[i])
+        int_library = np.float64(matched_int_library[i])
+        diff = int_query - int_library
+        abs_diff = abs(diff)
+        abs_diff_sum += abs_diff
+        sq_diff_sum += diff * diff
+        max_abs_diff = max(max_abs_diff, abs_diff)
+        min_int_sum += min(int_query, int_library)
+        max_int_sum += max(int_query, int_library)
+        int_sum = int_query + int_library
+        abs_int_sum += abs(int_sum)
+        if int_sum != 0:
+            canberra_sum += abs_diff / int_sum
+        int_query_sum += int_query
+        int_library_sum += int_library
+        int_query_sq_sum += int_query * int_query
+        int_library_sq_sum += int_library * int_library
+        dot += int_query * int_library
+    return (
+        abs_diff_sum,
+        sq_diff_sum,
+        max_abs_diff,
+        min_int_sum,
+        max_int_sum,
+        canberra_sum,
+        abs_int_sum,
+        int_query_sum,
+        int_library_sum,
+        int_query_sq_sum,
+        int_library_sq_sum,
+        dot,
+    )
+
+
+@nb.njit(cache=True, fastmath=True, nogil=True)
+def _unmatched_intensity_stats(
+    intensity: np.ndarray, unmatched: np.ndarray
+) -> Tuple[int, float, float, float, int]:
+    """
+    Compute summary statistics of the unmatched peak intensities in a single
+    pass, without gathering the unmatched peaks.
+
+    Parameters
+    ----------
+    intensity : np.ndarray
+        The intensities of all spectrum peaks.
+    unmatched : np.ndarray
+        Boolean mask of the unmatched peaks.
+
+    Returns
+    -------
+    Tuple[int, float, float, float, int]
+        A tuple with (i) the number of unmatched peaks, (ii) the sum of the
+        unmatched intensities, (iii) the sum of the squared unmatched
+        intensities, (iv) the maximum unmatched intensity (0 if there are no
+        unmatched peaks), (v) the number of non-zero unmatched intensities.
+    """
+    n_peaks, n_nonzero = 0, 0
+    int_sum, int_sq_sum, int_max = 0.0, 0.0, 0.0
+    for i in range(len(intensity)):
+        if unmatched[i]:
+            n_peaks += 1
+            int_sum += intensity[i]
+            int_sq_sum += intensity[i] * intensity[i]
+            int_max = max(int_max, intensity[i])
+            if intensity[i] != 0:
+                n_nonzero += 1
+    return n_peaks, int_sum, int_sq_sum, int_max, n_nonzero
+
+
+@nb.njit(cache=True, fastmath=True, nogil=True)
+def _diff_sums(arr1: np.ndarray, arr2: np.ndarray) -> Tuple[float, float]:
+    """
+    Compute the sum of absolute and squared element-wise differences in a
+    single pass.
+
+    The reductions are reassociated (`fastmath`) so that the loop can be
+    unrolled and vectorized for any number of elements.
+
+    Parameters
+    ----------
+    arr1 : np.ndarray
+        The first array.
+    arr2 : np.ndarray
+        The second array, of the same length as `arr1`.
+
+    Returns
+    -------
+    Tuple[float, float]
+        The sum of absolute differences and the sum of squared differences.
+    """
+    abs_diff_sum, sq_diff_sum = 0.0, 0.0
+    for i in range(len(arr1)):
+        diff = arr1[i] - arr2[i]
+        abs_diff_sum += abs(diff)
+        sq_diff_sum += diff * diff
+    return abs_diff_sum, sq_diff_sum
+
+
+@functools.lru_cache(maxsize=None)
+def _log_comb(n: int, k: int) -> float:
+    """
+    Compute the natural logarithm of the binomial coefficient.
+
+    The number of peak bins and library peaks only take on a limited number of
+    values during a search, so the results are cached.
+
+    Parameters
+    ----------
+    n : int
+        The number of elements.
+    k : int
+        The number of elements that are chosen.
+
+    Returns
+    -------
+    float
+        The logarithm of the number of ways to choose `k` out of `n` elements.
+    """
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+@nb.njit(cache=True, nogil=True)
+def _hypergeometric_tail(
+    n_peak_bins: int, n_library_peaks: int, i_start: int
+) -> float:
+    """
+    Compute the tail of the hypergeometric distribution of peak matches
+    relative to its first term.
+
+    Consecutive terms are computed using the recurrence relation between the
+    hypergeometric probabilities instead of by evaluating binomial
+    coefficients.
+
+    Parameters
+    ----------
+    n_peak_bins : int
+        The number of possible peak positions.
+    n_library_peaks : int
+        The number of library peaks.
+    i_start : int
+        The number of peak matches of the first term in the tail.
+
+    Returns
+    -------
+    float
+        The sum of the hypergeometric probabilities for `i_start` up to
+        `n_library_peaks` peak matches, divided by the probability of
+        `i_start` peak matches.
+    """
+    hgt_tail, term = 1.0, 1.0
+    for i in range(i_start, n_library_peaks):
+        term *= ((n_library_peaks - i) * (n_library_peaks - i)) / (
+            (i + 1) * (n_peak_bins - 2 * n_library_peaks + i + 1)
+        )
+        hgt_tail += term
+    return hgt_tail
+
+
+@nb.njit(cache=True, nogil=True)
+def _count_inversions(arr: np.ndarray) -> int:
+    """
+    Count the number of inversions in an array using a bottom-up merge sort.
+
+    Parameters
+    ----------
+    arr : np.ndarray
+        The array in which inversions are counted. The array is used as
+        scratch space and its contents are undefined afterwards.
+
+    Returns
+    -------
+    int
+        The number of index pairs `i < j` for which `arr[i] > arr[j]`.
+    """
+    n = len(arr)
+    # Alternate between the two buffers instead of copying the merged runs
+    # back after every pass.
+    src, dst = arr, np.empty_like(arr)
+    n_inversions, width = 0, 1
+    while width < n:
+        for start in range(0, n, 2 * width):
+            mid, end = min(start + width, n), min(start + 2 * width, n)
+            i, j, k = start, mid, start
+            while i < mid and j < end:
+                if src[j] < src[i]:
+                    dst[k] = src[j]
+                    n_inversions += mid - i
+                    j += 1
+                else:
+                    dst[k] = src[i]
+                    i += 1
+                k += 1
+            while i < mid:
+                dst[k] = src[i]
+                i += 1
+                k += 1
+            while j < end:
+                dst[k] = src[j]
+                j += 1
+                k += 1
+        src, dst = dst, src
+        width *= 2
+    return n_inversions
+
+
+@nb.njit(cache=True, nogil=True)
+def _count_rank_ties(ranks: np.ndarray) -> Tuple[int, float, float]:
+    """
+    Compute tie statistics of dense ranks for the Kendall-Tau variance.
+
+    Parameters
+    ----------
+    ranks : np.ndarray
+        The dense ranks.
+
+    Returns
+    -------
+    Tuple[int, float, float]
+        The number of tied pairs and the two tie correction terms of the
+        Kendall-Tau variance.
+    """
+    n_ties, tie_corr_0, tie_corr_1 = 0, 0.0, 0.0
+    for count in np.bincount(ranks):
+        if count > 1:
+            n_ties += count * (count - 1) // 2
+            tie_corr_0 += count * (count - 1.0) * (count - 2)
+            tie_corr_1 += count * (count - 1.0) * (2 * count + 5)
+    return n_ties, tie_corr_0, tie_corr_1
+
+
+@nb.njit(cache=True, nogil=True)
+def _kendalltau_pvalue(x: np.ndarray, y: np.ndarray) -> float:
+    """
+    Compute the two-sided p-value of the Kendall-Tau (tau-b) correlation.
+
+    Discordant pairs are counted in O(n log n) using Knight's merge sort
+    algorithm. The p-value is computed identically to `scipy.stats.kendalltau`
+    (with `method="auto"`): exactly in absence of ties for small inputs and
+    using the normal approximation otherwise.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        The first array of observations.
+    y : np.ndarray
+        The second array of observations, of the same length as `x`.
+
+    Returns
+    -------
+    float
+        The two-sided p-value, or NaN if the correlation is undefined.
+    """
+    n = len(x)
+    # Convert y to dense ranks.
+    perm = np.argsort(y)
+    x, y = x[perm], y[perm]
+    y_rank = np.empty(n, np.int64)
+    for i in range(n):
+        y_rank[i] = 1 if i == 0 else y_rank[i - 1] + (y[i] != y[i - 1])
+    # Stable sort on x and convert x to dense ranks.
+    perm = np.argsort(x, kind="mergesort")
+    x, y_rank = x[perm], y_rank[perm]
+    x_rank = np.empty(n, np.int64)
+    for i in range(n):
+        x_rank[i] = 1 if i == 0 else x_rank[i - 1] + (x[i] != x[i - 1])
+    # Joint ties.
+    n_ties_joint, run = 0, 1
+    for i in range(1, n + 1):
+        if (
+            i < n
+            and x_rank[i] == x_rank[i - 1]
+            and y_rank[i] == y_rank[i - 1]
+        ):
+            run += 1
+        else:
+            n_ties_joint += run * (run - 1) // 2
+            run = 1
+    x_ties, x_corr_0, x_corr_1 = _count_rank_ties(x_rank)
+    y_ties, y_corr_0, y_corr_1 = _count_rank_ties(y_rank)
+    n_total = n * (n - 1) // 2
+    if x_ties == n_total or y_ties == n_total:
+        return np.nan
+    # Discordant pairs.
+    n_dis = _count_inversions(y_rank)
+    con_minus_dis = n_total - x_ties - y_ties + n_ties_joint - 2 * n_dis
+    if x_ties == 0 and y_ties == 0 and (
+        n <= 33 or min(n_dis, n_total - n_dis) <= 1
+    ):
+        # Exact p-value, see Maurice G. Kendall, "Rank Correlation Methods"
+        # (4th Edition), Charles Griffin & Co., 1970.
+        c = min(n_dis, n_total - n_dis)
+        if n <= 2 or 4 * c == n * (n - 1):
+            return 1.0
+        # Scaled number of permutations with up to c inversions, updated
+        # in-place.
+        counts = np.zeros(c + 1)
+        counts[0:2] = 1.0
+        for j in range(3, n + 1):
+            cumsum = 0.0
+            for k in range(c + 1):
+                cumsum += counts[k]
+                counts[k] = cumsum / j
+            # Iterate backwards so that the subtracted counts are not yet
+            # updated.
+            for k in range(c, j - 1, -1):
+                counts[k] -= counts[k - j]
+        return min(max(np.sum(counts), 0.0), 1.0)
     else:
-        weight = weight_start + weight_slope * spec_entropy
-        weighted_intensity = spectrum_intensity**weight
-        weighted_intensity /= weighted_intensity.sum()
-        return scipy.stats.entropy(weighted_intensity)
+        # con_minus_dis is approximately normally distributed.
+        m = n * (n - 1.0)
+        var = (
+            (m * (2 * n + 5) - x_corr_1 - y_corr_1) / 18
+            + (2 * x_ties * y_ties) / m
+            + x_corr_0 * y_corr_0 / (9 * m * (n - 2))
+        )
+        z = con_minus_dis / math.sqrt(var)
+        return math.erfc(abs(z) / math.sqrt(2))
+
+
+def _concatenate(arrays: List[np.ndarray], dtype: np.dtype) -> np.ndarray:
+    """
+    Concatenate arrays into a single flat array.
+
+    Parameters
+    ----------
+    arrays : List[np.ndarray]
+        The 1D arrays to concatenate.
+    dtype : np.dtype
+        The data type of the concatenated array.
+
+    Returns
+    -------
+    np.ndarray
+        The concatenated array, which is empty if no arrays are given.
+    """
+    if len(arrays) == 0:
+        return np.zeros(0, dtype)
+    return np.concatenate(arrays).astype(dtype, copy=False)
+
+
+def _offsets(lengths: np.ndarray) -> np.ndarray:
+    """
+    Convert segment lengths to CSR-style offsets.
+
+    Parameters
+    ----------
+    lengths : np.ndarray
+        The length of each segment.
+
+    Returns
+    -------
+    np.ndarray
+        An array with one element more than the number of segments, with the
+        start of each segment followed by the end of the last segment.
+    """
+    offsets = np.zeros(len(lengths) + 1, np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _segment_sum(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Sum the consecutive segments of a flat array.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The concatenated values of all segments.
+    lengths : np.ndarray
+        The length of each segment.
+
+    Returns
+    -------
+    np.ndarray
+        The sum of each segment, with 0 for empty segments.
+    """
+    sums = np.zeros(len(lengths), np.float64)
+    non_empty = lengths > 0
+    if non_empty.any():
+        # `np.add.reduceat` doesn't support empty segments, but those don't
+        # contain any values to skip over.
+        sums[non_empty] = np.add.reduceat(
+            values, _offsets(lengths)[:-1][non_empty]
+        )
+    return sums
+
+
+@nb.njit(cache=True, fastmath=True, nogil=True, parallel=True)
+def _segment_dot(
+    x: np.ndarray, y: np.ndarray, offsets: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the dot product of the consecutive segments of two flat arrays.
+
+    The element-wise products are accumulated directly, without allocating a
+    temporary array of the products, and the segments are processed in
+    parallel. Each segment reduction is reassociated (`fastmath`) so that it
+    can be vectorized.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        The concatenated values of all segments of the first array.
+    y : np.ndarray
+        The concatenated values of all segments of the second array.
+    offsets : np.ndarray
+        The CSR-style offsets of the segments.
+
+    Returns
+    -------
+    np.ndarray
+        The dot product of each segment, with 0 for empty segments.
+    """
+    dots = np.zeros(len(offsets) - 1, np.float64)
+    for i in nb.prange(len(offsets) - 1):
+        dot = 0.0
+        for j in range(offsets[i], offsets[i + 1]):
+            dot += x[j] * y[j]
+        dots[i] = dot
+    return dots
+
+
+def _segment_max(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Compute the maximum of the consecutive segments of a flat array of
+    non-negative values.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The concatenated non-negative values of all segments.
+    lengths : np.ndarray
+        The length of each segment.
+
+    Returns
+    -------
+    np.ndarray
+        The maximum of each segment, with 0 for empty segments.
+    """
+    maxima = np.zeros(len(lengths), np.float64)
+    non_empty = lengths > 0
+    if non_empty.any():
+        maxima[non_empty] = np.maximum.reduceat(
+            values, _offsets(lengths)[:-1][non_empty]
+        )
+    return maxima
+
+
+@nb.njit(cache=True, nogil=True, parallel=True)
+def _batch_entropy(
+    int_query: np.ndarray,
+    query_offsets: np.ndarray,
+    int_library: np.ndarray,
+    library_offsets: np.ndarray,
+    match_query: np.ndarray,
+    match_library: np.ndarray,
+    match_offsets: np.ndarray,
+    weighted: bool,
+) -> np.ndarray:
+    """
+    Compute the spectral entropy similarity for multiple SSMs in parallel.
+
+    Parameters
+    ----------
+    int_query : np.ndarray
+        The concatenated query spectrum intensities of all SSMs.
+    query_offsets : np.ndarray
+        The CSR-style offsets of the query spectra in `int_query`.
+    int_library : np.ndarray
+        The concatenated library spectrum intensities of all SSMs.
+    library_offsets : np.ndarray
+        The CSR-style offsets of the library spectra in `int_library`.
+    match_query : np.ndarray
+        The concatenated query peak indexes of the peak matches of all SSMs.
+    match_library : np.ndarray
+        The concatenated library peak indexes of the peak matches of all SSMs.
+    match_offsets : np.ndarray
+        The CSR-style offsets of the peak matches of each SSM.
+    weighted : bool
+        Whether to use the unweighted or weighted version of entropy.
+
+    Returns
+    -------
+    np.ndarray
+        The spectral entropy similarity for each SSM, or 0 if the SSM has no
+        peak matches.
+    """
+    n_ssms = len(match_offsets) - 1
+    entropy = np.zeros(n_ssms, np.float64)
+    for i in nb.prange(n_ssms):
+        match_start, match_stop = match_offsets[i], match_offsets[i + 1]
+        if match_start == match_stop:
+            continue
+        query_i = match_query[match_start:match_stop]
+        library_i = match_library[match_start:match_stop]
+        spec_query = int_query[query_offsets[i] : query_offsets[i + 1]]
+        spec_library = int_library[library_offsets[i] : library_offsets[i + 1]]
+        matched_int_query = spec_query[query_i]
+        matched_int_library = spec_library[library_i]
+        if not weighted:
+            entropy[i] = _unweighted_entropy_similarity(
+                *_entropy_sums(spec_query, 1.0),
+                *_entropy_sums(spec_library, 1.0),
+                matched_int_query,
+                matched_int_library,
+            )
+        else:
+            query_unmatched = np.ones(len(spec_query), np.bool_)
+            query_unmatched[query_i] = False
+            library_unmatched = np.ones(len(spec_library), np.bool_)
+            library_unmatched[library_i] = False
+            entropy[i] = 1 - (
+                2
+                * _merged_spectrum_entropy(
+                    spec_query,
+                    spec_library,
+                    matched_int_query,
+                    matched_int_library,
+                    query_unmatched,
+                    library_unmatched,
+                    True,
+                )
+                - _spectrum_entropy(spec_query, True)
+                - _spectrum_entropy(spec_library, True)
+            ) / math.log(4)
+    return entropy
+
+
+@nb.njit(cache=True, nogil=True)
+def _pearson(x: np.ndarray, y: np.ndarray) -> float:
+    """
+    Compute the Pearson correlation coefficient between two arrays.
+
+    Unlike `scipy.stats.pearsonr`, no p-value is computed.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        The first array.
+    y : np.ndarray
+        The second array, with the same length as the first array.
+
+    Returns
+    -------
+    float
+        The Pearson correlation coefficient, or NaN if it is undefined because
+        there are fewer than two elements or either array is constant.
+    """
+    n = len(x)
+    if n < 2:
+        return np.nan
+    x_mean, y_mean = 0.0, 0.0
+    for i in range(n):
+        x_mean += x[i]
+        y_mean += y[i]
+    x_mean /= n
+    y_mean /= n
+    sxx, syy, sxy = 0.0, 0.0, 0.0
+    for i in range(n):
+        dx, dy = x[i] - x_mean, y[i] - y_mean
+        sxx += dx * dx
+        syy += dy * dy
+        sxy += dx * dy
+    if sxx == 0 or syy == 0:
+        return np.nan
+    # Clip to counter rounding errors, as in `scipy.stats.pearsonr`.
+    return max(min(sxy / math.sqrt(sxx * syy), 1.0), -1.0)
+
+
+@nb.njit(cache=True, nogil=True)
+def _matched_pearson(
+    matched_int_query: np.ndarray,
+    matched_int_library: np.ndarray,
+    int_library: np.ndarray,
+    library_unmatched: np.ndarray,
+) -> float:
+    """
+    Compute the Pearson correlation coefficient between the peak matches,
+    with the unmatched library peaks paired with zero query intensities.
+
+    This is equivalent to `_pearson` on the concatenated matched and
+    unmatched intensities, without materializing the concatenated arrays.
+
+    Parameters
+    ----------
+    matched_int_query : np.ndarray
+        The intensities of the matched query peaks.
+    matched_int_library : np.ndarray
+        The intensities of the matched library peaks.
+    int_library : np.ndarray
+        The intensities of all library peaks.
+    library_unmatched : np.ndarray
+        Boolean mask of the unmatched library peaks to include.
+
+    Returns
+    -------
+    float
+        The Pearson correlation coefficient, or NaN if it is undefined because
+        there are fewer than two elements or either array is constant.
+    """
+    n = len(matched_int_query)
+    x_mean, y_mean = 0.0, 0.0
+    for i in range(len(matched_int_query)):
+        x_mean += matched_int_query[i]
+        y_mean += matched_int_library[i]
+    for i in range(len(int_library)):
+        if library_unmatched[i]:
+            y_mean += int_library[i]
+            n += 1
+    if n < 2:
+        return np.nan
+    x_mean /= n
+    y_mean /= n
+    sxx, syy, sxy = 0.0, 0.0, 0.0
+    for i in range(len(matched_int_query)):
+        dx = matched_int_query[i] - x_mean
+        dy = matched_int_library[i] - y_mean
+        sxx += dx * dx
+        syy += dy * dy
+        sxy += dx * dy
+    for i in range(len(int_library)):
+        if library_unmatched[i]:
+            dy = int_library[i] - y_mean
+            sxx += x_mean * x_mean
+            syy += dy * dy
+            sxy -= x_mean * dy
+    if sxx == 0 or syy == 0:
+        return np.nan
+    # Clip to counter rounding errors, as in `scipy.stats.pearsonr`.
+    return max(min(sxy / math.sqrt(sxx * syy), 1.0), -1.0)
+
+
+@nb.njit(cache=True, nogil=True)
+def _matched_spearman(
+    matched_int_query: np.ndarray,
+    matched_int_library: np.ndarray,
+    int_library: np.ndarray,
+    library_unmatched: np.ndarray,
+) -> float:
+    """
+    Compute the Spearman correlation coefficient between the peak matches,
+    with the unmatched library peaks paired with zero query intensities.
+
+    The intensities are written into a single preallocated buffer per
+    spectrum, with the unmatched library peaks selected by their mask.
+
+    Parameters
+    ----------
+    matched_int_query : np.ndarray
+        The intensities of the matched query peaks.
+    matched_int_library : np.ndarray
+        The intensities of the matched library peaks.
+    int_library : np.ndarray
+        The intensities of all library peaks.
+    library_unmatched : np.ndarray
+        Boolean mask of the unmatched library peaks to include.
+
+    Returns
+    -------
+    float
+        The Spearman correlation coefficient, or NaN if it is undefined.
+    """
+    n_matches = len(matched_int_query)
+    n = n_matches + np.count_nonzero(library_unmatched)
+    int_query = np.zeros(n, np.float64)
+    int_query[:n_matches] = matched_int_query
+    int_library_all = np.empty(n, np.float64)
+    int_library_all[:n_matches] = matched_int_library
+    j = n_matches
+    for i in range(len(int_library)):
+        if library_unmatched[i]:
+            int_library_all[j] = int_library[i]
+            j += 1
+    return _pearson(_rank(int_query), _rank(int_library_all))
+
+
+@nb.njit(cache=True, nogil=True)
+def _rank(x: np.ndarray) -> np.ndarray:
+    """
+    Rank the elements of an array, assigning the average rank to ties.
+
+    Equivalent to `scipy.stats.rankdata` with method "average".
+
+    Parameters
+    ----------
+    x : np.ndarray
+        The array to rank.
+
+    Returns
+    -------
+    np.ndarray
+        The 1-based ranks of the array elements.
+    """
+    order = np.argsort(x, kind="mergesort")
+    ranks = np.empty(len(x), np.float64)
+    i = 0
+    while i < len(x):
+        j = i + 1
+        while j < len(x) and x[order[j]] == x[order[i]]:
+            j += 1
+        # Elements i..j-1 (0-based) are tied and share the average rank.
+        avg_rank = (i + j + 1) / 2
+        for k in range(i, j):
+            ranks[order[k]] = avg_rank
+        i = j
+    return ranks
@@ -340,9 +340,14 @@ def _compute_ssm_features(
         "ruzicka": [],
         "is_target": [],
     }
+    ssms = list(ssms)
+    matched_ssms = []
+    # The search settings are constant for all SSMs.
+    min_mz, max_mz, bin_size = config.min_mz, config.max_mz, config.bin_size
     for i, ssm in enumerate(ssms):
         if len(ssm.peak_matches) == 0:
             continue
+        matched_ssms.append(ssm)
 
         sim_calc = sim.SpectrumSimilarityCalculator(ssm)
         sim_calc_top = sim.SpectrumSimilarityCalculator(ssm, 5)
@@ -350,61 +355,37 @@ def _compute_ssm_features(
         features["index"].append(i)
         features["sequence"].append(ssm.sequence)
         features["sequence_len"].append(len(ssm.sequence))
-        if ssm.query_spectrum.precursor_charge <= 2:
+        precursor_charge = ssm.query_spectrum.precursor_charge
+        if precursor_charge <= 2:
             features["precursor_charge_2"].append(1)
             features["precursor_charge_3"].append(0)
             features["precursor_charge_4"].append(0)
             features["precursor_charge_5"].append(0)
-        elif ssm.query_spectrum.precursor_charge == 3:
+        elif precursor_charge == 3:
             features["precursor_charge_2"].append(0)
             features["precursor_charge_3"].append(1)
             features["precursor_charge_4"].append(0)
             features["precursor_charge_5"].append(0)
-        elif ssm.query_spectrum.precursor_charge == 4:
+        elif precursor_charge == 4:
             features["precursor_charge_2"].append(0)
             features["precursor_charge_3"].append(0)
             features["precursor_charge_4"].append(1)
             features["precursor_charge_5"].append(0)
-        elif ssm.query_spectrum.precursor_charge >= 5:
+        elif precursor_charge >= 5:
             features["precursor_charge_2"].append(0)
             features["precursor_charge_3"].append(0)
             features["precursor_charge_4"].append(0)
             features["precursor_charge_5"].append(1)
-        features["query_prec_mz"].append(ssm.query_spectrum.precursor_mz)
-        features["lib_prec_mz"].append(ssm.library_spectrum.precursor_mz)
-        features["mz_diff_ppm"].append(
-            mass_diff(
-                ssm.query_spectrum.precursor_mz,
-                ssm.library_spectrum.precursor_mz,
-                False,
-            )
-        )
-        features["abs_mz_diff_ppm"].append(
-            abs(
-                mass_diff(
-                    ssm.query_spectrum.precursor_mz,
-                    ssm.library_spectrum.precursor_mz,
-                    False,
-                )
-            )
-        )
-        features["mz_diff_da"].append(
-            mass_diff(
-                ssm.query_spectrum.precursor_mz,
-                ssm.library_spectrum.precursor_mz,
-                True,
-            )
-        )
-        features["abs_mz_diff_da"].append(
-            abs(
-                mass_diff(
-                    ssm.query_spectrum.precursor_mz,
-                    ssm.library_spectrum.precursor_mz,
-                    True,
-                )
-            )
-        )
-        features["cosine"].append(sim_calc.cosine())
+        query_prec_mz = ssm.query_spectrum.precursor_mz
+        lib_prec_mz = ssm.library_spectrum.precursor_mz
+        mz_diff_ppm = mass_diff(query_prec_mz, lib_prec_mz, False)
+        mz_diff_da = mass_diff(query_prec_mz, lib_prec_mz, True)
+        features["query_prec_mz"].append(query_prec_mz)
+        features["lib_prec_mz"].append(lib_prec_mz)
+        features["mz_diff_ppm"].append(mz_diff_ppm)
+        features["abs_mz_diff_ppm"].append(abs(mz_diff_ppm))
+        features["mz_diff_da"].append(mz_diff_da)
+        features["abs_mz_diff_da"].append(abs(mz_diff_da))
         features["cosine_top5"].append(sim_calc_top.cosine())
         features["n_matched_peaks"].append(sim_calc.n_matched_peaks())
         features["frac_n_peaks_query"].append(sim_calc.frac_n_peaks_query())
@@ -429,29 +410,38 @@ def _compute_ssm_features(
         )
         features["hypergeometric_score"].append(
             sim_calc.hypergeometric_score(
-                min_mz=config.min_mz,
-                max_mz=config.max_mz,
-                fragment_mz_tol=config.bin_size,
+                min_mz=min_mz, max_mz=max_mz, fragment_mz_tol=bin_size
             )
         )
         features["kendalltau"].append(sim_calc.kendalltau())
         features["ms_for_id_v1"].append(sim_calc.ms_for_id_v1())
         features["ms_for_id_v2"].append(sim_calc.ms_for_id_v2())
-        features["entropy_unweighted"].append(sim_calc.entropy(False))
-        features["entropy_weighted"].append(sim_calc.entropy(True))
         features["scribe_fragment_acc"].append(sim_calc.scribe_fragment_acc())
         features["scribe_fragment_acc_top5"].append(
             sim_calc_top.scribe_fragment_acc()
         )
-        features["manhattan"].append(sim_calc.manhattan())
-        features["euclidean"].append(sim_calc.euclidean())
-        features["chebyshev"].append(sim_calc.chebyshev())
         features["pearsonr"].append(sim_calc.pearsonr())
         features["pearsonr_top5"].append(sim_calc_top.pearsonr())
         features["spearmanr"].append(sim_calc.spearmanr())
         features["spearmanr_top5"].append(sim_calc_top.spearmanr())
-        features["braycurtis"].append(sim_calc.braycurtis())
         features["canberra"].append(sim_calc.canberra())
-        features["ruzicka"].append(sim_calc.ruzicka())
         features["is_target"].append(not ssm.is_decoy)
+    # Similarities that don't require `top` filtering are computed for all
+    # SSMs at once.
+    for metric, scores in sim.batch_scores(
+        matched_ssms, _BATCH_FEATURES
+    ).items():
+        features[metric] = scores
     return features
+
+
+_BATCH_FEATURES = (
+    "cosine",
+    "entropy_unweighted",
+    "entropy_weighted",
+    "manhattan",
+    "euclidean",
+    "chebyshev",
+    "braycurtis",
+    "ruzicka",
+)
@@ -102,7 +102,6 @@ setuptools.setup(
         'mmh3',
         'mokapot>=v0.8.3',
         'numba>=0.41',
-        'numexpr',
         'numpy',
         'pandas',
         'pyteomics',
@@ -1,6 +1,7 @@
 import pytest
 
 import numpy as np
+import scipy.stats
 import spectrum_utils.spectrum as sus
 
 from ann_solo import spectrum
@@ -444,6 +445,24 @@ def test_cosine(
     assert partial_match_top.cosine() == pytest.approx(0.85880862)
 
 
+def test_cosine_top_zero_intensity():
+    # All matched query peaks within the top library peaks have zero
+    # intensity, so the recalculated norm is zero.
+    mz = np.asarray([138.066, 235.119, 398.182, 511.266, 640.309, 755.336])
+    intensity = np.asarray([0.4, 0.3, 0.2, 0.1, 0.05, 0.01])
+    spec1 = sus.MsmsSpectrum(
+        "HPYLEDR", 465.227, 2, mz, np.zeros_like(intensity)
+    )
+    spec2 = sus.MsmsSpectrum(
+        "HPYLEDR", 465.227, 2, np.copy(mz), np.copy(intensity)
+    )
+    peak_matches = np.asarray([(i, i) for i in range(len(mz))])
+    ssm = spectrum.SpectrumSpectrumMatch(spec1, spec2, peak_matches)
+    sim_calc = sim.SpectrumSimilarityCalculator(ssm, 5)
+    assert np.isnan(sim_calc.cosine())
+    assert np.isnan(sim_calc.spectral_contrast_angle())
+
+
 def test_n_matched_peaks(
     all_match,
     all_match_top,
@@ -580,6 +599,26 @@ def test_spectral_contrast_angle(
     )
 
 
+def test_identical_top_exact(all_match_top):
+    # Identical spectra should be exactly similar, also with top filtering.
+    # The spectral contrast angle is very sensitive to rounding errors of the
+    # cosine similarity near 1.
+    assert all_match_top.cosine() == 1.0
+    assert all_match_top.spectral_contrast_angle() == 1.0
+    for i in range(10):
+        mz = np.sort(np.random.uniform(100, 1500, 50))
+        intensity = np.random.exponential(1, 50).astype(np.float32)
+        spec1 = sus.MsmsSpectrum(str(i), 500.0, 2, mz, intensity)
+        spec2 = sus.MsmsSpectrum(
+            str(i), 500.0, 2, np.copy(mz), np.copy(intensity)
+        )
+        peak_matches = np.asarray([(j, j) for j in range(len(mz))])
+        ssm = spectrum.SpectrumSpectrumMatch(spec1, spec2, peak_matches)
+        sim_calc = sim.SpectrumSimilarityCalculator(ssm, 5)
+        assert sim_calc.cosine() == 1.0
+        assert sim_calc.spectral_contrast_angle() == 1.0
+
+
 def test_hypergeometric_score(
     all_match,
     all_match_top,
@@ -603,6 +642,24 @@ def test_hypergeometric_score(
     )
 
 
+def test_hypergeometric_score_sf(no_match, partial_match):
+    # The hypergeometric score is the negative log of the survival function
+    # of the number of matched peaks.
+    n_peak_bins, _, _ = spectrum.get_dim(101, 1500, 0.1)
+    for sim_calc in (no_match, partial_match):
+        n_library_peaks = len(sim_calc.int_library)
+        assert sim_calc.hypergeometric_score(
+            min_mz=101, max_mz=1500, fragment_mz_tol=0.1
+        ) == pytest.approx(
+            -scipy.stats.hypergeom.logsf(
+                sim_calc.n_matched_peaks(),
+                n_peak_bins,
+                n_library_peaks,
+                n_library_peaks,
+            )
+        )
+
+
 def test_kendalltau(
     all_match,
     all_match_top,
@@ -844,3 +901,63 @@ def test_entropy(
     assert partial_match.entropy(True) == pytest.approx(0.59836031)
     with pytest.raises(NotImplementedError):
         partial_match_top.entropy(True)
+
+
+def test_batch_scores():
+    ssms = []
+    for n_peaks_query, n_peaks_library, n_matches in [
+        (12, 12, 12),
+        (20, 15, 0),
+        (25, 30, 7),
+        (5, 40, 3),
+    ]:
+        intensity1 = np.random.uniform(0, 1, n_peaks_query)
+        intensity2 = np.random.uniform(0, 1, n_peaks_library)
+        spec1 = sus.MsmsSpectrum(
+            "HPYLEDR",
+            465.227,
+            2,
+            np.sort(np.random.uniform(100, 1000, n_peaks_query)),
+            intensity1 / np.linalg.norm(intensity1),
+        )
+        spec2 = sus.MsmsSpectrum(
+            "HPYLEDR",
+            465.227,
+            2,
+            np.sort(np.random.uniform(100, 1000, n_peaks_library)),
+            intensity2 / np.linalg.norm(intensity2),
+        )
+        peak_matches = np.column_stack(
+            (
+                np.random.choice(n_peaks_query, n_matches, replace=False),
+                np.random.choice(n_peaks_library, n_matches, replace=False),
+            )
+        )
+        ssms.append(spectrum.SpectrumSpectrumMatch(spec1, spec2, peak_matches))
+    metrics = [
+        "cosine",
+        "manhattan",
+        "euclidean",
+        "chebyshev",
+        "braycurtis",
+        "ruzicka",
+        "entropy_unweighted",
+        "entropy_weighted",
+    ]
+    scores = sim.batch_scores(ssms, metrics)
+    for i, ssm in enumerate(ssms):
+        sim_calc = sim.SpectrumSimilarityCalculator(ssm)
+        assert scores["cosine"][i] == pytest.approx(sim_calc.cosine())
+        assert scores["manhattan"][i] == pytest.approx(sim_calc.manhattan())
+        assert scores["euclidean"][i] == pytest.approx(sim_calc.euclidean())
+        assert scores["chebyshev"][i] == pytest.approx(sim_calc.chebyshev())
+        assert scores["braycurtis"][i] == pytest.approx(sim_calc.braycurtis())
+        assert scores["ruzicka"][i] == pytest.approx(sim_calc.ruzicka())
+        assert scores["entropy_unweighted"][i] == pytest.approx(
+            sim_calc.entropy(False)
+        )
+        assert scores["entropy_weighted"][i] == pytest.approx(
+            sim_calc.entropy(True)
+        )
+    with pytest.raises(ValueError):
+        sim.batch_scores(ssms, ["unknown"])
@@ -0,0 +1,188 @@
+import math
+
+import numpy as np
+import pytest
+import spectrum_utils.spectrum as sus
+
+from ann_solo import spectrum
+
+
+MIN_MZ, MAX_MZ, BIN_SIZE, HASH_LEN = 101, 1500, 0.04, 800
+
+
+@pytest.fixture(autouse=True)
+def set_random_seed():
+    np.random.seed(1)
+
+
+def _spectrum_to_vector_loop(spec, min_mz, max_mz, bin_size, hash_len):
+    # Reference implementation that bins and hashes each peak individually.
+    vec_len, min_bound, _ = spectrum.get_dim(min_mz, max_mz, bin_size)
+    vector = np.zeros(
+        (hash_len if hash_len is not None else vec_len,), np.float32
+    )
+    for mz, intensity in zip(spec.mz, spec.intensity):
+        bin_idx = math.floor((mz - min_bound) // bin_size)
+        if hash_len is not None:
+            bin_idx = spectrum.hash_idx(bin_idx, hash_len)
+        vector[bin_idx] += intensity
+    return vector / np.linalg.norm(vector)
+
+
+def _random_spectrum(identifier, num_peaks, extra_mz=()):
+    mz = np.sort(
+        np.concatenate(
+            [np.random.uniform(MIN_MZ, MAX_MZ, num_peaks), extra_mz]
+        )
+    )
+    intensity = np.random.exponential(1, len(mz)).astype(np.float32)
+    return sus.MsmsSpectrum(str(identifier), 500.0, 2, mz, intensity)
+
+
+def _edge_spectrum():
+    # Peaks at the m/z range limits and at exact mass bin boundaries.
+    _, min_bound, _ = spectrum.get_dim(MIN_MZ, MAX_MZ, BIN_SIZE)
+    edge_mz = [
+        MIN_MZ,
+        MAX_MZ,
+        min_bound + 10 * BIN_SIZE,
+        min_bound + 1000 * BIN_SIZE,
+        np.nextafter(MAX_MZ, 0),
+    ]
+    return _random_spectrum("edge", 50, edge_mz)
+
+
+@pytest.mark.parametrize("hash_len", [HASH_LEN, None])
+def test_spectrum_to_vector(hash_len):
+    for spec in [_edge_spectrum(), _random_spectrum(0, 1)] + [
+        _random_spectrum(i, 100) for i in range(1, 10)
+    ]:
+        np.testing.assert_allclose(
+            spectrum.spectrum_to_vector(
+                spec, MIN_MZ, MAX_MZ, BIN_SIZE, hash_len
+            ),
+            _spectrum_to_vector_loop(
+                spec, MIN_MZ, MAX_MZ, BIN_SIZE, hash_len
+            ),
+            rtol=1e-5,
+            atol=1e-7,
+        )
+
+
+def test_spectrum_to_vector_reuse():
+    vector = np.full(HASH_LEN, 10, np.float32)
+    for spec in [_random_spectrum(i, 100) for i in range(5)]:
+        spectrum.spectrum_to_vector(
+            spec, MIN_MZ, MAX_MZ, BIN_SIZE, HASH_LEN, True, vector
+        )
+        np.testing.assert_allclose(
+            vector,
+            _spectrum_to_vector_loop(
+                spec, MIN_MZ, MAX_MZ, BIN_SIZE, HASH_LEN
+            ),
+            rtol=1e-5,
+            atol=1e-7,
+        )
+    with pytest.raises(ValueError):
+        spectrum.spectrum_to_vector(
+            spec, MIN_MZ, MAX_MZ, BIN_SIZE, HASH_LEN, True, vector[:-1]
+        )
+
+
+def test_spectrum_to_vector_out_of_range():
+    spec = _random_spectrum(0, 100)
+    spec_out_of_range = sus.MsmsSpectrum(
+        "out_of_range",
+        spec.precursor_mz,
+        spec.precursor_charge,
+        np.concatenate([[MIN_MZ - 50], spec.mz, [MAX_MZ + 50]]),
+        np.concatenate([[1.0], spec.intensity, [1.0]]).astype(np.float32),
+    )
+    for hash_len in (HASH_LEN, None):
+        np.testing.assert_allclose(
+            spectrum.spectrum_to_vector(
+                spec_out_of_range, MIN_MZ, MAX_MZ, BIN_SIZE, hash_len
+            ),
+            spectrum.spectrum_to_vector(
+                spec, MIN_MZ, MAX_MZ, BIN_SIZE, hash_len
+            ),
+        )
+
+
+@pytest.mark.parametrize("hash_len", [HASH_LEN, None])
+def test_spectra_to_vectors(hash_len):
+    spectra = [_edge_spectrum(), _random_spectrum(0, 1)] + [
+        _random_spectrum(i, np.random.randint(1, 200)) for i in range(1, 20)
+    ]
+    vectors = spectrum.spectra_to_vectors(
+        spectra, MIN_MZ, MAX_MZ, BIN_SIZE, hash_len
+    )
+    num_bins, _, _ = spectrum.get_dim(MIN_MZ, MAX_MZ, BIN_SIZE)
+    assert vectors.shape == (
+        len(spectra),
+        hash_len if hash_len is not None else num_bins,
+    )
+    for spec, vector in zip(spectra, vectors):
+        np.testing.assert_allclose(
+            vector,
+            spectrum.spectrum_to_vector(
+                spec, MIN_MZ, MAX_MZ, BIN_SIZE, hash_len
+            ),
+            rtol=1e-5,
+            atol=1e-7,
+        )
+
+
+def test_spectra_to_vectors_batches():
+    # Vectors filled batch by batch into consecutive rows of a single
+    # pre-allocated matrix, with a final partial batch.
+    spectra = [_edge_spectrum()] + [
+        _random_spectrum(i, np.random.randint(1, 200)) for i in range(10)
+    ]
+    vectors = np.full((len(spectra), HASH_LEN), 10, np.float32)
+    batch_size = 4
+    for start in range(0, len(spectra), batch_size):
+        batch = spectra[start:start + batch_size]
+        spectrum.spectra_to_vectors(
+            batch,
+            MIN_MZ,
+            MAX_MZ,
+            BIN_SIZE,
+            HASH_LEN,
+            True,
+            vectors[start:start + len(batch)],
+        )
+    np.testing.assert_allclose(
+        vectors,
+        spectrum.spectra_to_vectors(
+            spectra, MIN_MZ, MAX_MZ, BIN_SIZE, HASH_LEN
+        ),
+        rtol=1e-6,
+    )
+    for spec, vector in zip(spectra, vectors):
+        np.testing.assert_allclose(
+            vector,
+            _spectrum_to_vector_loop(
+                spec, MIN_MZ, MAX_MZ, BIN_SIZE, HASH_LEN
+            ),
+            rtol=1e-5,
+            atol=1e-7,
+        )
+    assert spectrum.spectra_to_vectors(
+        [], MIN_MZ, MAX_MZ, BIN_SIZE, HASH_LEN
+    ).shape == (0, HASH_LEN)
+
+
+def test_spectra_to_vectors_out_of_range():
+    spec = _random_spectrum(0, 100)
+    spec_out_of_range = sus.MsmsSpectrum(
+        "out_of_range",
+        spec.precursor_mz,
+        spec.precursor_charge,
+        np.concatenate([[MIN_MZ - 50], spec.mz, [MAX_MZ + 50]]),
+        np.concatenate([[1.0], spec.intensity, [1.0]]).astype(np.float32),
+    )
+    vectors = spectrum.spectra_to_vectors(
+        [spec_out_of_range, spec], MIN_MZ, MAX_MZ, BIN_SIZE, HASH_LEN
+    )
+    np.testing.assert_allclose(vectors[0], vectors[1])